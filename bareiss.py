@@ -0,0 +1,81 @@
+from fractions import Fraction
+from math import lcm
+
+
+# Fraction-free (Bareiss) elimination over Python ints. Each row of the
+# augmented matrix [A | b] is first scaled by the lcm of its denominators so
+# every entry is an integer; after that every intermediate entry is a minor of
+# that integer matrix, so the exact divisions below never leave the integers
+# and entry sizes grow only linearly with the number of steps (instead of
+# exponentially, as they would w/ naive integer elimination).
+
+def integer_matrix(rows, constants):
+    # rows/constants can hold anything Fraction accepts exactly - ints,
+    # Decimals, Fractions, or strings like '1.25'
+    matrix = []
+    for row, constant in zip(rows, constants):
+        entries = [Fraction(x) for x in row] + [Fraction(constant)]
+        scale = lcm(*[x.denominator for x in entries])
+        matrix.append([x.numerator * (scale // x.denominator) for x in entries])
+    return matrix
+
+
+def echelon(matrix, num_variables):
+    # reduces the augmented integer matrix in place to fraction-free row
+    # echelon form, and returns the pivot column of each pivot row - so the
+    # rank is the number of pivots, and rows from there on have all-zero
+    # coefficients
+    num_equations = len(matrix)
+    num_columns = num_variables + 1
+    previous_pivot = 1
+    pivots = []
+
+    i = 0
+    for j in range(num_variables):
+        if i >= num_equations:
+            break
+
+        pivot_row = None
+        for k in range(i, num_equations):
+            if matrix[k][j] != 0:
+                pivot_row = k
+                break
+        if pivot_row is None:
+            continue
+
+        if pivot_row != i:
+            matrix[i], matrix[pivot_row] = matrix[pivot_row], matrix[i]
+
+        pivot = matrix[i]
+        pivot_value = pivot[j]
+        for k in range(i+1, num_equations):
+            row = matrix[k]
+            factor = row[j]
+            for m in range(j+1, num_columns):
+                row[m] = (pivot_value * row[m] - factor * pivot[m]) // previous_pivot
+            row[j] = 0
+
+        previous_pivot = pivot_value
+        pivots.append(j)
+        i += 1
+
+    return pivots
+
+
+def is_consistent(matrix, pivots):
+    return all(row[-1] == 0 for row in matrix[len(pivots):])
+
+
+def back_substitute(matrix, pivots, num_variables):
+    # only meaningful when there's a pivot in every column; returns the exact
+    # solution as Fractions
+    solution = [Fraction(0)] * num_variables
+    for i in reversed(range(len(pivots))):
+        j = pivots[i]
+        row = matrix[i]
+        total = Fraction(row[-1])
+        for m in range(j+1, num_variables):
+            if row[m]:
+                total -= row[m] * solution[m]
+        solution[j] = total / row[j]
+    return solution
@@ -0,0 +1,58 @@
+import unittest
+from fractions import Fraction
+
+import bareiss
+
+class IntegerMatrixTest(unittest.TestCase):
+
+    def test_rows_are_scaled_to_integers(self):
+        matrix = bareiss.integer_matrix([['0.5', Fraction(1,3)]], ['1.25'])
+
+        self.assertEqual(matrix, [[6, 4, 15]])
+
+
+class EchelonTest(unittest.TestCase):
+
+    def test_entries_stay_integral_and_bounded(self):
+        # every entry of the fraction-free form is a minor of the input, so
+        # the last pivot is the determinant
+        matrix = [[2, 3, 1, 1],
+                  [4, 7, 5, 2],
+                  [6, 18, 22, 3]]
+        pivots = bareiss.echelon(matrix, 3)
+
+        self.assertEqual(pivots, [0, 1, 2])
+        self.assertEqual(matrix[2][2], -16)
+        self.assertTrue(all(isinstance(x, int) for row in matrix for x in row))
+
+    def test_rank_deficient_matrix_skips_columns(self):
+        matrix = [[1, 2, 3, 1],
+                  [2, 4, 7, 2],
+                  [3, 6, 10, 3]]
+        pivots = bareiss.echelon(matrix, 3)
+
+        self.assertEqual(pivots, [0, 2])
+        self.assertTrue(bareiss.is_consistent(matrix, pivots))
+
+    def test_inconsistent_rows_are_detected(self):
+        matrix = [[1, 1, 1],
+                  [2, 2, 3]]
+        pivots = bareiss.echelon(matrix, 2)
+
+        self.assertEqual(pivots, [0])
+        self.assertFalse(bareiss.is_consistent(matrix, pivots))
+
+
+class BackSubstitutionTest(unittest.TestCase):
+
+    def test_exact_solution(self):
+        matrix = bareiss.integer_matrix([[0,1,1], [1,-1,1], [1,2,-5]], [1,2,3])
+        pivots = bareiss.echelon(matrix, 3)
+
+        self.assertEqual(bareiss.back_substitute(matrix, pivots, 3),
+                         [Fraction(23,9), Fraction(7,9), Fraction(2,9)])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
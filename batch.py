@@ -0,0 +1,68 @@
+import os
+from collections import deque, namedtuple
+from itertools import islice
+from multiprocessing import Pool
+
+from precision import precision_context, current_precision
+
+
+# Solving many independent systems at once. Each result is tagged w/ the
+# position of its system in the input, and failures - including the usual
+# NO_SOLUTIONS_MSG/INF_SOLUTIONS_MSG - are reported in the result's error
+# field instead of stopping the batch:
+#
+#   for result in solve_all(systems, processes=4):
+#       if result.error: ...
+#       else: use(result.solution)
+
+BatchResult = namedtuple('BatchResult', ['index', 'solution', 'error'])
+
+
+def solve_all(systems, processes=None, chunksize=64, exact=False):
+    # a generator, yielding results in input order. systems can be any
+    # iterable and is sent to the workers in chunks of chunksize systems, to
+    # amortize the cost of pickling and IPC; processes defaults to the number
+    # of CPUs, and processes=1 solves in this process. Systems w/o their own
+    # precision are solved at the caller's precision.
+    #
+    # systems is consumed lazily: at most 2 chunks per process are sent out
+    # ahead of the result being yielded, so a long (or endless) input - or a
+    # slow consumer - doesn't pile up in memory.
+    precision = current_precision()
+    tagged = ((i, system, exact, precision) for (i, system) in enumerate(systems))
+
+    if processes == 1:
+        for item in tagged:
+            yield _solve_one(item)
+        return
+
+    processes = processes or os.cpu_count() or 1
+    with Pool(processes) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * processes:
+                chunk = list(islice(tagged, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_solve_chunk, (chunk,)))
+            if not pending:
+                return
+            for result in pending.popleft().get():
+                yield result
+
+
+def _solve_chunk(chunk):
+    return [_solve_one(item) for item in chunk]
+
+
+def _solve_one(item):
+    index, system, exact, precision = item
+    try:
+        with precision_context(precision):
+            if exact:
+                solution = system.compute_exact_solution()
+            else:
+                solution = system.compute_solution()
+        return BatchResult(index, solution, None)
+    except Exception as e:
+        return BatchResult(index, None, str(e))
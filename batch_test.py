@@ -0,0 +1,62 @@
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from batch import solve_all, BatchResult
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+def make_systems():
+    unique = LinearSystem([Plane(Vector(['0','1','1']), '1'),
+                           Plane(Vector(['1','-1','1']), '2'),
+                           Plane(Vector(['1','2','-5']), '3')])
+    none = LinearSystem([Plane(Vector(['1','1','1']), '1'),
+                         Plane(Vector(['1','1','1']), '2')])
+    infinite = LinearSystem([Plane(Vector(['1','1','1']), '1')])
+    return [unique, none, infinite, unique]
+
+
+class SolveAllTest(unittest.TestCase):
+
+    def check_results(self, results):
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+
+        self.assertIsNone(results[0].error)
+        self.assertAlmostEqual(results[0].solution[0], Decimal(23)/9)
+        self.assertEqual(results[1], BatchResult(1, None, LinearSystem.NO_SOLUTIONS_MSG))
+        self.assertEqual(results[2], BatchResult(2, None, LinearSystem.INF_SOLUTIONS_MSG))
+        self.assertEqual(results[3].solution, results[0].solution)
+
+    def test_in_process(self):
+        self.check_results(list(solve_all(make_systems(), processes=1)))
+
+    def test_process_pool(self):
+        self.check_results(list(solve_all(iter(make_systems()), processes=2, chunksize=2)))
+
+    def test_input_is_consumed_in_bounded_windows(self):
+        consumed = [0]
+        def systems():
+            system = make_systems()[0]
+            for _ in range(200):
+                consumed[0] += 1
+                yield system
+
+        results = solve_all(systems(), processes=2, chunksize=3)
+        self.assertEqual(next(results).index, 0)
+        # 2 chunks per process
+        self.assertEqual(consumed[0], 12)
+
+        self.assertEqual([r.index for r in results], list(range(1, 200)))
+        self.assertEqual(consumed[0], 200)
+
+    def test_exact(self):
+        results = list(solve_all(make_systems(), processes=1, exact=True))
+
+        self.assertEqual(results[0].solution, (Fraction(23,9), Fraction(7,9), Fraction(2,9)))
+        self.assertEqual(results[1].error, LinearSystem.NO_SOLUTIONS_MSG)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+from vector import Vector, FloatVector
+from line import Line, all_intersections
+from hyperplane import Hyperplane
+from linsys import LinearSystem
+
+
+# Benchmarks for the hot paths, each swept over a range of sizes (vector
+# dimension, number of equations/lines) so we get scaling curves rather than
+# single numbers. Results are saved as JSON so a later run can be compared
+# against them:
+#
+#   python benchmark.py --save baseline.json
+#   ... make changes ...
+#   python benchmark.py --compare baseline.json
+#
+# which reports (and exits w/ status 1 on) any case that's slowed down by
+# more than the threshold. --quick runs the smallest size of each case only.
+#
+# Each case is a function that takes the size and does its setup, returning
+# the zero-argument callable that's actually timed. Vector caches its
+# magnitude and normalized form, so cases that measure those build a fresh
+# vector inside the timed call.
+
+VECTOR_DIMENSIONS = [3, 10, 100]
+SYSTEM_SIZES = [3, 10, 30]
+LINE_COUNTS = [10, 40]
+
+
+def _random_coordinates(rng, dimension):
+    return tuple([Decimal(rng.randint(-1000, 1000)) / 100 for _ in range(dimension)])
+
+
+def _random_system(rng, size):
+    # diagonally dominant, so it always has a unique solution
+    planes = []
+    for i in range(size):
+        coordinates = list(_random_coordinates(rng, size))
+        coordinates[i] = Decimal(size * 20)
+        planes.append(Hyperplane(Vector(coordinates), rng.randint(-100, 100)))
+    return planes
+
+
+def vector_add(dimension):
+    rng = random.Random(dimension)
+    v, w = Vector(_random_coordinates(rng, dimension)), Vector(_random_coordinates(rng, dimension))
+    return lambda: v + w
+
+def vector_dot(dimension):
+    rng = random.Random(dimension)
+    v, w = Vector(_random_coordinates(rng, dimension)), Vector(_random_coordinates(rng, dimension))
+    return lambda: v.dot(w)
+
+def vector_magnitude(dimension):
+    coordinates = _random_coordinates(random.Random(dimension), dimension)
+    return lambda: Vector._from_decimals(coordinates).magnitude()
+
+def vector_angle_between(dimension):
+    rng = random.Random(dimension)
+    c1, c2 = _random_coordinates(rng, dimension), _random_coordinates(rng, dimension)
+    return lambda: Vector._from_decimals(c1).angleBetween(Vector._from_decimals(c2))
+
+def vector_cross(dimension):
+    rng = random.Random(dimension)
+    v, w = Vector(_random_coordinates(rng, 3)), Vector(_random_coordinates(rng, 3))
+    return lambda: v.cross(w)
+
+def float_vector_dot(dimension):
+    rng = random.Random(dimension)
+    v, w = FloatVector(_random_coordinates(rng, dimension)), FloatVector(_random_coordinates(rng, dimension))
+    return lambda: v.dot(w)
+
+def line_intersection(count):
+    rng = random.Random(count)
+    l1 = Line(Vector(_random_coordinates(rng, 2)), rng.randint(-100, 100))
+    l2 = Line(Vector(_random_coordinates(rng, 2)), rng.randint(-100, 100))
+    return lambda: l1.intersectionWith(l2)
+
+def line_all_intersections(count):
+    rng = random.Random(count)
+    lines = [Line(Vector(_random_coordinates(rng, 2)), rng.randint(-100, 100)) for _ in range(count)]
+    return lambda: sum(1 for _ in all_intersections(lines))
+
+def hyperplane_coincident(dimension):
+    rng = random.Random(dimension)
+    coordinates = _random_coordinates(rng, dimension)
+    h1 = Hyperplane(Vector(coordinates), 3)
+    h2 = h1.scaledBy(-2)
+    return lambda: Hyperplane(Vector._from_decimals(coordinates), 3).coincidentTo(h2)
+
+def hyperplane_scaled_by(dimension):
+    h = Hyperplane(Vector(_random_coordinates(random.Random(dimension), dimension)), 3)
+    return lambda: h.scaledBy(Decimal('1.5'))
+
+def hyperplane_add(dimension):
+    rng = random.Random(dimension)
+    h1 = Hyperplane(Vector(_random_coordinates(rng, dimension)), 3)
+    h2 = Hyperplane(Vector(_random_coordinates(rng, dimension)), 4)
+    return lambda: h1.add(h2)
+
+def linsys_row_operations(size):
+    # a new system each time (the row operations don't change the planes
+    # themselves, just which ones the system holds), so every call starts
+    # from the same coefficients instead of growing them w/o bound
+    planes = _random_system(random.Random(size), size)
+    def run():
+        s = LinearSystem(planes)
+        s.swap_rows(0, size-1)
+        s.multiply_coefficient_and_row(Decimal('1.5'), 0)
+        s.add_multiple_times_row_to_row(Decimal('-0.5'), 0, size-1)
+    return run
+
+def linsys_triangular_form(size):
+    s = LinearSystem(_random_system(random.Random(size), size))
+    return s.compute_triangular_form
+
+def linsys_rref(size):
+    s = LinearSystem(_random_system(random.Random(size), size))
+    return s.compute_rref
+
+def linsys_solution(size):
+    # a new system each time, so the cached factorization isn't reused
+    planes = _random_system(random.Random(size), size)
+    return lambda: LinearSystem(planes).compute_solution()
+
+def linsys_repeated_solution(size):
+    s = LinearSystem(_random_system(random.Random(size), size))
+    return s.compute_solution
+
+def linsys_refined_solution(size):
+    planes = _random_system(random.Random(size), size)
+    return lambda: LinearSystem(planes).compute_refined_solution()
+
+def linsys_iterative_solution(size):
+    s = LinearSystem(_random_system(random.Random(size), size))
+    return lambda: s.compute_iterative_solution('gauss_seidel')
+
+
+CASES = [
+    (vector_add, VECTOR_DIMENSIONS),
+    (vector_dot, VECTOR_DIMENSIONS),
+    (vector_magnitude, VECTOR_DIMENSIONS),
+    (vector_angle_between, VECTOR_DIMENSIONS),
+    (vector_cross, [3]),
+    (float_vector_dot, VECTOR_DIMENSIONS),
+    (line_intersection, [2]),
+    (line_all_intersections, LINE_COUNTS),
+    (hyperplane_coincident, VECTOR_DIMENSIONS),
+    (hyperplane_scaled_by, VECTOR_DIMENSIONS),
+    (hyperplane_add, VECTOR_DIMENSIONS),
+    (linsys_row_operations, SYSTEM_SIZES),
+    (linsys_triangular_form, SYSTEM_SIZES),
+    (linsys_rref, SYSTEM_SIZES),
+    (linsys_solution, SYSTEM_SIZES),
+    (linsys_repeated_solution, SYSTEM_SIZES),
+    (linsys_refined_solution, SYSTEM_SIZES),
+    (linsys_iterative_solution, SYSTEM_SIZES),
+]
+
+
+def time_call(fn, min_time=0.2, repeat=3):
+    # seconds per call: enough calls per measurement to take at least
+    # min_time, best of repeat measurements
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1000000:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed * 1.2) + 1))
+    best = min([elapsed] + timer.repeat(repeat - 1, number))
+    return best / number
+
+
+def run_benchmarks(name_filter=None, quick=False, min_time=0.2, repeat=3, report=None):
+    results = []
+    for case, sizes in CASES:
+        if name_filter and name_filter not in case.__name__:
+            continue
+        for size in (sizes[:1] if quick else sizes):
+            seconds = time_call(case(size), min_time=min_time, repeat=repeat)
+            result = {'name': case.__name__, 'size': size, 'seconds': seconds}
+            results.append(result)
+            if report:
+                report(result)
+    return results
+
+
+def compare(results, baseline, threshold=0.25):
+    # returns (name, size, baseline seconds, current seconds) for every case
+    # that's more than threshold (as a fraction) slower than the baseline
+    previous = {(r['name'], r['size']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for r in results:
+        before = previous.get((r['name'], r['size']))
+        if before and r['seconds'] > before * (1 + threshold):
+            regressions.append((r['name'], r['size'], before, r['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the vector/line/plane/linear system hot paths.')
+    parser.add_argument('--quick', action='store_true', help='only the smallest size of each case')
+    parser.add_argument('--filter', help='only cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds per measurement (default 0.2)')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare against results saved w/ --save')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='slowdown that counts as a regression (default 0.25, i.e. 25%%)')
+    args = parser.parse_args(argv)
+
+    def report(result):
+        print('{:<28} {:>6} {:>14.3f} us'.format(result['name'], result['size'], result['seconds'] * 1e6))
+
+    results = run_benchmarks(args.filter, args.quick, args.min_time, report=report)
+    output = {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(output, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, size, before, after in regressions:
+            print('REGRESSION {} [{}]: {:.3f} us -> {:.3f} us ({:+.0%})'.format(
+                name, size, before * 1e6, after * 1e6, after / before - 1))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
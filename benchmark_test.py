@@ -0,0 +1,34 @@
+import unittest
+
+import benchmark
+
+class RunBenchmarksTest(unittest.TestCase):
+
+    def test_every_case_runs(self):
+        for case, sizes in benchmark.CASES:
+            case(sizes[0])()
+
+    def test_results_are_machine_readable(self):
+        results = benchmark.run_benchmarks('vector_add', quick=True, min_time=0.001, repeat=1)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['name'], 'vector_add')
+        self.assertEqual(results[0]['size'], benchmark.VECTOR_DIMENSIONS[0])
+        self.assertTrue(results[0]['seconds'] > 0)
+
+
+class CompareTest(unittest.TestCase):
+
+    def test_regressions_over_threshold_are_reported(self):
+        baseline = {'results': [{'name': 'a', 'size': 3, 'seconds': 1.0},
+                                {'name': 'b', 'size': 3, 'seconds': 1.0}]}
+        results = [{'name': 'a', 'size': 3, 'seconds': 1.2},
+                   {'name': 'b', 'size': 3, 'seconds': 1.5},
+                   {'name': 'c', 'size': 3, 'seconds': 9.0}]
+
+        self.assertEqual(benchmark.compare(results, baseline, threshold=0.25), [('b', 3, 1.0, 1.5)])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
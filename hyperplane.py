@@ -0,0 +1,210 @@
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+
+from vector import Vector
+from precision import uses_precision
+
+
+# Hyperplane is the general form of Line (2 dimensions) and Plane (3
+# dimensions): the set of points x w/ normal_vector . x = constant_term, in
+# any number of dimensions. The dimension comes from the normal vector, or
+# from the dimension argument (or the subclass's DIMENSION) when there's no
+# normal vector, in which case the normal vector is all zeros. A subclass w/
+# a DIMENSION only takes normal vectors of that dimension. precision is
+# the number of significant digits to do its math w/ (None means the caller's
+# precision; see precision.py).
+class Hyperplane(object):
+
+    NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
+    EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG = 'Either the dimension of the hyperplane or the normal vector must be provided'
+    WRONG_DIMENSION_MSG = 'The normal vector must have the same dimension as the hyperplane'
+
+    DIMENSION = None
+
+    def __init__(self, normal_vector=None, constant_term=None, dimension=None, precision=None):
+        if not normal_vector:
+            dimension = dimension or self.DIMENSION
+            if not dimension:
+                raise Exception(self.EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG)
+            all_zeros = ['0']*dimension
+            normal_vector = Vector(all_zeros)
+        if self.DIMENSION and normal_vector.dimension != self.DIMENSION:
+            raise Exception(self.WRONG_DIMENSION_MSG)
+        self.dimension = normal_vector.dimension
+        self.normal_vector = normal_vector
+
+        if not constant_term:
+            constant_term = Decimal('0')
+        self.constant_term = Decimal(constant_term)
+        self.precision = precision
+
+        self.set_basepoint()
+
+
+    @uses_precision
+    def set_basepoint(self):
+        n = self.normal_vector
+        c = self.constant_term
+        basepoint_coords = ['0']*self.dimension
+
+        initial_index = Hyperplane.leading_index(n)
+        if initial_index < 0:
+            self.basepoint = None
+            return
+        initial_coefficient = n[initial_index]
+
+        basepoint_coords[initial_index] = c/initial_coefficient
+        self.basepoint = Vector(basepoint_coords, self.precision)
+
+
+    def __str__(self):
+
+        num_decimal_places = 3
+
+        def write_coefficient(coefficient, is_initial_term=False):
+            coefficient = round(coefficient, num_decimal_places)
+            if coefficient % 1 == 0:
+                coefficient = int(coefficient)
+
+            output = ''
+
+            if coefficient < 0:
+                output += '-'
+            if coefficient > 0 and not is_initial_term:
+                output += '+'
+
+            if not is_initial_term:
+                output += ' '
+
+            if abs(coefficient) != 1:
+                output += '{}'.format(abs(coefficient))
+
+            return output
+
+        n = self.normal_vector
+
+        initial_index = Hyperplane.leading_index(n)
+        if initial_index < 0:
+            output = '0'
+        else:
+            terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
+                     for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
+            output = ' '.join(terms)
+
+        constant = round(self.constant_term, num_decimal_places)
+        if constant % 1 == 0:
+            constant = int(constant)
+        output += ' = {}'.format(constant)
+
+        return output
+
+    @uses_precision
+    def parallelTo(self, h):
+        return self.normal_vector.parallelTo(h.normal_vector)
+
+    @uses_precision
+    def coincidentTo(self, h):
+        # a hyperplane w/ a zero normal vector is the equation 0 = k - it's
+        # only 'coincident' w/ another such equation w/ the same constant term
+        # (these show up as the all-zero rows left over after elimination)
+        if self.normal_vector.isZero():
+            if not h.normal_vector.isZero():
+                return False
+            return MyDecimal(self.constant_term - h.constant_term).is_near_zero()
+        elif h.normal_vector.isZero():
+            return False
+
+        # first, coincident hyperplanes - equal hyperplanes - have to be parallel
+        if not self.parallelTo(h):
+            return False
+
+        # then, a vector connecting a point on one to a point on the other
+        # must be orthogonal to their normal vectors
+        v_joining = self.basepoint - h.basepoint
+
+        return (v_joining.orthogonalTo(self.normal_vector.normalized()))
+
+    def __eq__(self, h):
+        return self.coincidentTo(h)
+
+    # Canonical form: the normal vector and constant term scaled so the first
+    # nonzero coefficient is 1, each quantized to CANONICAL_PLACES. The same
+    # hyperplane written w/ different scalings has the same canonical form,
+    # which makes likely duplicates findable w/ a dict or set instead of
+    # comparing every pair - but so can different equations whose terms
+    # differ by less than the rounding, so a match is only a candidate. It
+    # isn't __eq__ either, which is coincidentTo and can disagree w/ it both
+    # ways (and since no hash agrees w/ that, hyperplanes aren't hashable).
+    @uses_precision
+    def canonical_form(self):
+        n = self.normal_vector
+        initial_index = Hyperplane.leading_index(n)
+        initial_coefficient = n[initial_index] if initial_index >= 0 else Decimal('1')
+
+        terms = [x / initial_coefficient for x in n.coordinates]
+        terms.append(self.constant_term / initial_coefficient)
+        return tuple([_quantize(x) for x in terms])
+
+    # the same thing w/o any rounding: the terms as Fractions, divided by the
+    # first nonzero coefficient, so only exactly proportional equations match
+    def exact_canonical_form(self):
+        terms = [Fraction(x) for x in self.normal_vector.coordinates]
+        terms.append(Fraction(self.constant_term))
+        leading = next((x for x in terms[:-1] if x != 0), Fraction(1))
+        return tuple([x / leading for x in terms])
+
+    __hash__ = None
+
+    # these return the same type as self, so scaling a Plane gives a Plane
+    @uses_precision
+    def scaledBy(self, coefficient):
+        new_normal_vector = self.normal_vector * coefficient
+        new_constant_term = self.constant_term * coefficient
+        return type(self)(new_normal_vector, new_constant_term, precision=self.precision)
+
+    @uses_precision
+    def add(self, h):
+        new_normal_vector = self.normal_vector + h.normal_vector
+        new_constant_term = self.constant_term + h.constant_term
+        return type(self)(new_normal_vector, new_constant_term, precision=self.precision)
+
+
+    @staticmethod
+    def first_nonzero_index(iterable):
+        k = Hyperplane.leading_index(iterable)
+        if k < 0:
+            raise Exception(Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
+        return k
+
+    # like first_nonzero_index, but returns -1 for all zeros instead of
+    # raising, and compares directly instead of building a MyDecimal per
+    # item - this is the one to use on hot paths
+    @staticmethod
+    def leading_index(iterable, eps=1e-10):
+        for k, item in enumerate(iterable):
+            if abs(item) >= eps:
+                return k
+        return -1
+
+
+CANONICAL_PLACES = Decimal('1e-9')
+
+def _quantize(x):
+    try:
+        return x.quantize(CANONICAL_PLACES)
+    except InvalidOperation:
+        # too large to hold that many places at the current precision, so
+        # just round it to the precision
+        return +x
+
+
+# the tolerance for treating a coefficient or constant as zero, shared by
+# everything that eliminates or checks rows (linsys, sparse, incremental,
+# parametrization) so they all agree on what zero is
+def is_near_zero(x, eps=1e-10):
+    return abs(x) < eps
+
+
+class MyDecimal(Decimal):
+    def is_near_zero(self, eps=1e-10):
+        return is_near_zero(self, eps)
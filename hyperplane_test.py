@@ -0,0 +1,117 @@
+import unittest
+
+from hyperplane import Hyperplane
+from line import Line
+from plane import Plane
+from linsys import LinearSystem
+from vector import Vector
+
+class ConstructionTest(unittest.TestCase):
+
+    def test_dimension_comes_from_normal_vector(self):
+        h = Hyperplane(Vector([0,2,0,0,1]), 4)
+
+        self.assertEqual(h.dimension, 5)
+        self.assertEqual(h.basepoint, Vector([0,2,0,0,0]))
+        self.assertEqual(str(h), '2x_2 + x_5 = 4')
+
+    def test_zero_hyperplane_needs_a_dimension(self):
+        self.assertEqual(Hyperplane(dimension=4).normal_vector, Vector([0,0,0,0]))
+        self.assertIsNone(Hyperplane(dimension=4).basepoint)
+        self.assertEqual(str(Hyperplane(constant_term=3, dimension=4)), '0 = 3')
+
+        with self.assertRaises(Exception) as context:
+            Hyperplane()
+        self.assertEqual(str(context.exception), Hyperplane.EITHER_DIM_OR_NORMAL_VEC_MUST_BE_PROVIDED_MSG)
+
+    def test_lines_and_planes_are_specializations(self):
+        self.assertEqual(Line().dimension, 2)
+        self.assertEqual(Plane().dimension, 3)
+        self.assertTrue(isinstance(Plane(Vector([1,1,1]), 1).scaledBy(2), Plane))
+        self.assertTrue(isinstance(Line(Vector([1,1]), 1).add(Line(Vector([1,0]), 1)), Line))
+
+    def test_lines_and_planes_reject_other_dimensions(self):
+        for make in [lambda: Line(Vector([1,2,3]), 1),
+                     lambda: Plane(Vector([1,2]), 1),
+                     lambda: Plane(dimension=4)]:
+            with self.assertRaises(Exception) as context:
+                make()
+            self.assertEqual(str(context.exception), Hyperplane.WRONG_DIMENSION_MSG)
+
+
+class ComparisonTest(unittest.TestCase):
+
+    def test_coincident_hyperplanes(self):
+        h1 = Hyperplane(Vector([1,2,3,4]), 5)
+        h2 = Hyperplane(Vector([-2,-4,-6,-8]), -10)
+        h3 = Hyperplane(Vector([1,2,3,4]), 6)
+
+        self.assertTrue(h1 == h2)
+        self.assertTrue(h1.parallelTo(h3))
+        self.assertFalse(h1 == h3)
+
+    def test_canonical_form(self):
+        self.assertEqual(Hyperplane(Vector([0,-2,4]), 6).canonical_form(),
+                         (0, 1, -2, -3))
+        self.assertEqual(Hyperplane(constant_term=2, dimension=2).canonical_form(), (0, 0, 2))
+
+    def test_leading_index(self):
+        self.assertEqual(Hyperplane.leading_index(Vector([0,0,3,1])), 2)
+        self.assertEqual(Hyperplane.leading_index(Vector(['1e-12',0,'1e-9'])), 2)
+        self.assertEqual(Hyperplane.leading_index(Vector([0,0,0])), -1)
+        with self.assertRaises(Exception) as cm:
+            Hyperplane.first_nonzero_index(Vector([0,0,0]))
+        self.assertEqual(str(cm.exception), Hyperplane.NO_NONZERO_ELTS_FOUND_MSG)
+
+    def test_scaled_hyperplanes_share_canonical_form(self):
+        h1 = Hyperplane(Vector([1,2,3,4]), 5)
+        h2 = Hyperplane(Vector([-2,-4,-6,-8]), -10)
+        h3 = Hyperplane(Vector([1,2,3,4]), 6)
+
+        self.assertEqual(h1.canonical_form(), h2.canonical_form())
+        self.assertNotEqual(h1.canonical_form(), h3.canonical_form())
+        self.assertEqual(Line(Vector([1,1]), 1).canonical_form(), Line(Vector([-3,-3]), -3).canonical_form())
+
+    def test_exact_canonical_form(self):
+        h = Hyperplane(Vector([0,-2,4]), 6)
+        self.assertEqual(h.exact_canonical_form(), (0, 1, -2, -3))
+        self.assertEqual(h.scaledBy(-5).exact_canonical_form(), h.exact_canonical_form())
+        self.assertNotEqual(Hyperplane(Vector([0,-2,4]), '6.0000000001').exact_canonical_form(),
+                            h.exact_canonical_form())
+
+    def test_not_hashable(self):
+        # == is coincidentTo, which is tolerant, so no hash could agree w/ it
+        h1 = Hyperplane(Vector([1,0]), 1)
+        h2 = Hyperplane(Vector([1,'1e-7']), 1)
+        self.assertTrue(h1 == h2)
+        self.assertNotEqual(h1.canonical_form(), h2.canonical_form())
+        with self.assertRaises(TypeError):
+            hash(h1)
+
+
+class HigherDimensionalSystemTest(unittest.TestCase):
+
+    def test_solve_system_with_many_variables(self):
+        # x_i + x_{i+1} = 2i + 1 (and x_{n-1} = n - 1) has x_i = i
+        n = 60
+        equations = []
+        for i in range(n):
+            coordinates = [0]*n
+            coordinates[i] = 1
+            if i < n-1:
+                coordinates[i+1] = 1
+            equations.append(Hyperplane(Vector(coordinates), 2*i + 1 if i < n-1 else i))
+
+        s = LinearSystem(equations)
+        solution = s.compute_solution()
+        for i, x in enumerate(solution):
+            self.assertAlmostEqual(x, i)
+
+        rref = s.compute_rref()
+        self.assertTrue(isinstance(rref[0], Hyperplane))
+        self.assertEqual(rref[0].dimension, n)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+from decimal import Decimal
+
+from vector import Vector
+from linsys import LinearSystem
+from hyperplane import is_near_zero
+from precision import uses_precision
+
+
+# A LinearSystem that keeps itself reduced as equations are added and
+# removed, so rank, consistency and the solution are always at hand w/o
+# running elimination again over the whole system.
+#
+# Alongside the planes it keeps a reduced form E of the augmented matrix
+# [A | b] and the transform T that produced it (E = T [A | b], T square and
+# invertible). Each row of E is either a pivot row - 1 in its pivot column
+# and 0 in every other pivot row's pivot column - or a zero row, whose
+# coefficients have all been eliminated and which reads 0 = k. So rank is the
+# number of pivot rows, the system is consistent if every zero row has k = 0,
+# and w/ a pivot for every variable the solution can be read straight off E.
+# (Pivot columns are picked for size, not position, so E isn't necessarily
+# in RREF.)
+#
+# Appending an equation reduces it against the pivot rows, and if anything's
+# left makes it a pivot row and clears its pivot column from the others:
+# O(rank * (n + m)) for n variables and m equations, instead of redoing the
+# O(n^2 m) elimination. Removing equation i undoes its contribution using
+# column i of T (which rows of E it went into): if a zero row depends on it,
+# that row absorbs it - rank is unchanged, since the equation was redundant -
+# otherwise a pivot row does and is dropped. Replacing a row w/ __setitem__ is
+# a remove then an append. The row operations don't change the solution set,
+# so they leave E alone and just update the matching columns of T.
+
+class IncrementalLinearSystem(LinearSystem):
+
+    def __init__(self, planes, precision=None):
+        LinearSystem.__init__(self, planes, precision)
+        self._reduced_rows = []
+        self._reduced_constants = []
+        self._transform = []
+        self._reduced_pivots = []
+        for i, p in enumerate(self.planes):
+            self._reduce_into_state(i, p)
+
+
+    @uses_precision
+    def append(self, plane):
+        if plane.dimension != self.dimension:
+            raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+        self.planes.append(plane)
+        self._leading.append(type(plane).leading_index(plane.normal_vector))
+        self._invalidate_factorization()
+        self._reduce_into_state(len(self.planes) - 1, plane)
+
+    @uses_precision
+    def remove(self, row_index):
+        # removes and returns the equation at row_index
+        plane = self.planes.pop(row_index)
+        self._leading.pop(row_index)
+        self._invalidate_factorization()
+        self._remove_from_state(row_index)
+        return plane
+
+    def __delitem__(self, row_index):
+        self.remove(row_index)
+
+    @uses_precision
+    def __setitem__(self, i, x):
+        LinearSystem.__setitem__(self, i, x)
+        self._remove_from_state(i)
+        self._reduce_into_state(i, x)
+
+
+    # E = T M stays the same when M = [A | b] is changed by an elementary
+    # row operation R, if T becomes T R^-1 - which only touches the columns
+    # of T for the rows involved
+
+    @uses_precision
+    def swap_rows(self, row1_index, row2_index):
+        LinearSystem.swap_rows(self, row1_index, row2_index)
+        for t in self._transform:
+            t[row1_index], t[row2_index] = t[row2_index], t[row1_index]
+
+    @uses_precision
+    def multiply_coefficient_and_row(self, coefficient, row_index):
+        LinearSystem.multiply_coefficient_and_row(self, coefficient, row_index)
+        coefficient = Decimal(coefficient)
+        if is_near_zero(coefficient):
+            # the row is now all zeros, which isn't invertible
+            self._remove_from_state(row_index)
+            self._reduce_into_state(row_index, self.planes[row_index])
+        else:
+            for t in self._transform:
+                t[row_index] /= coefficient
+
+    @uses_precision
+    def add_multiple_times_row_to_row(self, coefficient, row_to_add_index, row_to_be_added_to_index):
+        LinearSystem.add_multiple_times_row_to_row(self, coefficient, row_to_add_index, row_to_be_added_to_index)
+        coefficient = Decimal(coefficient)
+        for t in self._transform:
+            t[row_to_add_index] -= coefficient * t[row_to_be_added_to_index]
+
+
+    def rank(self):
+        return len(self._reduced_pivots) - self._reduced_pivots.count(-1)
+
+    def is_consistent(self):
+        return all(is_near_zero(c) for (c, p) in zip(self._reduced_constants, self._reduced_pivots)
+                   if p < 0)
+
+    def classify(self):
+        if not self.is_consistent():
+            return self.NO_SOLUTIONS_MSG
+        if self.rank() < self.dimension:
+            return self.INF_SOLUTIONS_MSG
+        return self.UNIQUE_SOLUTION_MSG
+
+    @uses_precision
+    def compute_solution(self, cache=None):
+        if cache is not None:
+            return cache.solve(self)
+
+        classification = self.classify()
+        if classification != self.UNIQUE_SOLUTION_MSG:
+            raise Exception(classification)
+
+        solution = [Decimal('0')] * self.dimension
+        for c, p in zip(self._reduced_constants, self._reduced_pivots):
+            if p >= 0:
+                solution[p] = c
+        return Vector._from_decimals(tuple(solution), self.precision)
+
+
+    def _reduce_into_state(self, index, plane):
+        # adds the equation that's now planes[index]: a new column of T at
+        # index, and a new row of E (and T)
+        for t in self._transform:
+            t.insert(index, Decimal('0'))
+        t_new = [Decimal('0')] * len(self.planes)
+        t_new[index] = Decimal('1')
+        row = list(plane.normal_vector.coordinates)
+        constant = plane.constant_term
+
+        rows, constants, transform = self._reduced_rows, self._reduced_constants, self._transform
+
+        for k, p in enumerate(self._reduced_pivots):
+            if p < 0:
+                continue
+            f = row[p]
+            if not is_near_zero(f):
+                _subtract_multiple(row, f, rows[k])
+                _subtract_multiple(t_new, f, transform[k])
+                constant -= f * constants[k]
+            row[p] = Decimal('0')
+
+        pivot = max(range(self.dimension), key=lambda j: abs(row[j]))
+        if is_near_zero(row[pivot]):
+            pivot = -1
+            row = [Decimal('0')] * self.dimension
+        else:
+            scale = Decimal('1') / row[pivot]
+            row = [x * scale for x in row]
+            t_new = [x * scale for x in t_new]
+            constant *= scale
+            row[pivot] = Decimal('1')
+
+            for k, p in enumerate(self._reduced_pivots):
+                f = rows[k][pivot]
+                if p < 0 or is_near_zero(f):
+                    continue
+                _subtract_multiple(rows[k], f, row)
+                _subtract_multiple(transform[k], f, t_new)
+                constants[k] -= f * constant
+                rows[k][pivot] = Decimal('0')
+
+        rows.append(row)
+        constants.append(constant)
+        transform.append(t_new)
+        self._reduced_pivots.append(pivot)
+
+    def _remove_from_state(self, index):
+        # takes out the equation that was planes[index]: first makes it
+        # contribute to only one row of E - preferably a zero row - by
+        # subtracting that row from the others, then drops that row of E
+        # and column index of T
+        rows, constants, transform, pivots = (self._reduced_rows, self._reduced_constants,
+                                              self._transform, self._reduced_pivots)
+
+        candidates = [k for k in range(len(rows)) if not is_near_zero(transform[k][index])]
+        zero_rows = [k for k in candidates if pivots[k] < 0]
+        r = max(zero_rows or candidates, key=lambda k: abs(transform[k][index]))
+
+        for k in range(len(rows)):
+            if k == r:
+                continue
+            f = transform[k][index] / transform[r][index]
+            if is_near_zero(f):
+                continue
+            _subtract_multiple(rows[k], f, rows[r])
+            _subtract_multiple(transform[k], f, transform[r])
+            constants[k] -= f * constants[r]
+
+        for stored in (rows, constants, transform, pivots):
+            del stored[r]
+        for t in transform:
+            del t[index]
+
+
+def _subtract_multiple(target, f, source):
+    for j, x in enumerate(source):
+        if x:
+            target[j] -= f * x
@@ -0,0 +1,113 @@
+import random
+import unittest
+from decimal import Decimal
+
+from incremental import IncrementalLinearSystem
+from linsys import LinearSystem
+from plane import Plane
+from hyperplane import Hyperplane
+from vector import Vector
+
+def make_planes():
+    return [Plane(normal_vector=Vector(['0','1','1']), constant_term='1'),
+            Plane(normal_vector=Vector(['1','-1','1']), constant_term='2'),
+            Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')]
+
+
+class IncrementalTest(unittest.TestCase):
+
+    def assertMatchesFullSolve(self, s):
+        full = LinearSystem(list(s.planes))
+        self.assertEqual(s.rank(), full.rank())
+        self.assertEqual(s.classify(), full.classify())
+        if s.classify() == LinearSystem.UNIQUE_SOLUTION_MSG:
+            for x, y in zip(s.compute_solution(), full.compute_solution()):
+                self.assertAlmostEqual(x, y)
+
+    def test_growing_one_equation_at_a_time(self):
+        p1, p2, p3 = make_planes()
+        s = IncrementalLinearSystem([p1])
+        self.assertEqual((s.rank(), s.classify()), (1, LinearSystem.INF_SOLUTIONS_MSG))
+
+        s.append(p1.scaledBy(2))
+        self.assertEqual((s.rank(), s.classify()), (1, LinearSystem.INF_SOLUTIONS_MSG))
+
+        s.append(p2)
+        s.append(p3)
+        self.assertEqual((s.rank(), s.classify()), (3, LinearSystem.UNIQUE_SOLUTION_MSG))
+        for x, y in zip(s.compute_solution(), [23, 7, 2]):
+            self.assertAlmostEqual(x, Decimal(y) / 9)
+
+        s.append(Plane(normal_vector=Vector(['1','1','1']), constant_term='0'))
+        self.assertEqual(s.classify(), LinearSystem.NO_SOLUTIONS_MSG)
+        with self.assertRaises(Exception) as cm:
+            s.compute_solution()
+        self.assertEqual(str(cm.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+    def test_removing_equations(self):
+        p1, p2, p3 = make_planes()
+        bad = Plane(normal_vector=Vector(['1','1','1']), constant_term='0')
+        s = IncrementalLinearSystem([p1, p2, bad, p3, p1.scaledBy(3)])
+        self.assertEqual(s.classify(), LinearSystem.NO_SOLUTIONS_MSG)
+
+        # the inconsistent equation was redundant to the rank, so the rank stays
+        self.assertIs(s.remove(2), bad)
+        self.assertEqual((s.rank(), s.classify()), (3, LinearSystem.UNIQUE_SOLUTION_MSG))
+
+        # so is the duplicate of p1, and then p1 itself isn't
+        del s[3]
+        self.assertEqual(s.rank(), 3)
+        del s[0]
+        self.assertEqual((s.rank(), s.classify()), (2, LinearSystem.INF_SOLUTIONS_MSG))
+        self.assertMatchesFullSolve(s)
+
+    def test_setitem_and_row_operations_keep_state(self):
+        s = IncrementalLinearSystem(make_planes())
+        s.swap_rows(0, 2)
+        s.multiply_coefficient_and_row(Decimal('2.5'), 1)
+        s.add_multiple_times_row_to_row(Decimal('-3'), 0, 2)
+        self.assertMatchesFullSolve(s)
+
+        # removing rows afterwards only works if T was kept in step
+        s.remove(1)
+        self.assertMatchesFullSolve(s)
+        s.append(Plane(normal_vector=Vector(['0','0','1']), constant_term='4'))
+        self.assertMatchesFullSolve(s)
+
+        s[0] = Plane(normal_vector=Vector(['0','0','2']), constant_term='8')
+        self.assertEqual(s.classify(), LinearSystem.INF_SOLUTIONS_MSG)
+        s.multiply_coefficient_and_row(0, 2)
+        self.assertMatchesFullSolve(s)
+
+    def test_random_sequences_match_full_solves(self):
+        rng = random.Random(7)
+        def random_plane():
+            # small integer coefficients, so dependent rows turn up often
+            return Plane(normal_vector=Vector([rng.randint(-2, 2) for _ in range(3)]),
+                         constant_term=rng.randint(-2, 2))
+
+        s = IncrementalLinearSystem([random_plane()])
+        for _ in range(150):
+            if len(s) > 1 and rng.random() < 0.4:
+                s.remove(rng.randrange(len(s)))
+            elif rng.random() < 0.2:
+                s[rng.randrange(len(s))] = random_plane()
+            elif rng.random() < 0.2:
+                i, j = rng.randrange(len(s)), rng.randrange(len(s))
+                s.swap_rows(i, j)
+                s.multiply_coefficient_and_row(rng.choice([-2, 3]), i)
+                if i != j:
+                    s.add_multiple_times_row_to_row(rng.randint(-2, 2), i, j)
+            else:
+                s.append(random_plane())
+            self.assertMatchesFullSolve(s)
+
+    def test_dimension_check(self):
+        s = IncrementalLinearSystem(make_planes())
+        with self.assertRaises(Exception) as cm:
+            s.append(Hyperplane(Vector(['1','1']), 1))
+        self.assertEqual(str(cm.exception), LinearSystem.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import functools
+import inspect
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import vector
+import hyperplane
+import line
+import linsys
+import lu
+import bareiss
+import refinement
+
+
+# Opt-in instrumentation for working out where a solve spends its time:
+#
+#   with instrument.recording() as report:
+#       system.compute_solution()
+#   print(report)
+#
+# While recording, every hooked function is temporarily replaced w/ a wrapper
+# that counts its calls, the exceptions it raises, and the time spent in it
+# (inclusive of anything it calls). When the block ends the originals are put
+# back, so there's no overhead at all when nothing is being recorded. With
+# track_allocations=True, tracemalloc also records the memory allocated
+# during the block (this slows things down noticeably).
+#
+# The patching is process-wide, so calls made by other threads during the
+# block are counted too, and recordings can't be nested. More functions can
+# be hooked w/ register(owner, name), where owner is a class or module.
+
+_hooks = []
+_recording = False
+
+
+def register(owner, name, label=None):
+    if label is None:
+        label = '{}.{}'.format(getattr(owner, '__name__', owner), name)
+    _hooks.append((owner, name, label))
+
+
+for _name in ['__init__', '_from_decimals', '__add__', '__sub__', '__mul__', 'dot',
+              'magnitude', 'normalized', 'angleBetween', 'parallelTo', 'orthogonalTo',
+              'isZero', 'projectedOnTo', 'cross']:
+    register(vector.Vector, _name)
+
+for _name in ['__init__', 'set_basepoint', 'first_nonzero_index', 'leading_index',
+              'parallelTo',
+              'coincidentTo', 'canonical_form', 'scaledBy', 'add']:
+    register(hyperplane.Hyperplane, _name)
+
+register(line.Line, 'intersectionWith')
+
+for _name in ['swap_rows', 'multiply_coefficient_and_row', 'add_multiple_times_row_to_row',
+              'indices_of_first_nonzero_terms_in_each_row', 'compute_triangular_form',
+              'compute_rref', 'compute_solution', 'compute_exact_solution', 'factorize',
+              'solve_for', 'deduplicated', 'classify', 'rank',
+              'compute_refined_solution']:
+    register(linsys.LinearSystem, _name)
+
+for _name in ['_triangularize', '_forward_eliminate', '_reduce_triangular_to_rref']:
+    register(linsys, _name)
+
+register(lu.LUFactorization, '__init__')
+register(lu.LUFactorization, 'solve')
+register(bareiss, 'echelon')
+register(bareiss, 'back_substitute')
+register(refinement, 'refine')
+
+
+class Stats(object):
+
+    __slots__ = ('calls', 'exceptions', 'seconds')
+
+    def __init__(self):
+        self.calls = 0
+        self.exceptions = 0
+        self.seconds = 0.0
+
+
+class Report(object):
+
+    def __init__(self):
+        self.stats = {}
+        self.elapsed = 0.0
+        self.allocated_bytes = None
+        self.peak_bytes = None
+
+    def calls(self, label):
+        return self.stats[label].calls if label in self.stats else 0
+
+    def __str__(self):
+        lines = ['Recorded {:.3f} ms'.format(self.elapsed * 1000)]
+        if self.allocated_bytes is not None:
+            lines.append('Allocated {} bytes (peak {} bytes)'.format(self.allocated_bytes, self.peak_bytes))
+        lines.append('{:<60} {:>9} {:>11} {:>12}'.format('function', 'calls', 'exceptions', 'total ms'))
+        called = [(label, s) for (label, s) in self.stats.items() if s.calls]
+        for label, s in sorted(called, key=lambda item: -item[1].seconds):
+            lines.append('{:<60} {:>9} {:>11} {:>12.3f}'.format(label, s.calls, s.exceptions, s.seconds * 1000))
+        return '\n'.join(lines)
+
+
+@contextmanager
+def recording(track_allocations=False):
+    global _recording
+    if _recording:
+        raise Exception('Already recording')
+    _recording = True
+
+    report = Report()
+    originals = []
+    try:
+        for owner, name, label in _hooks:
+            original = inspect.getattr_static(owner, name)
+            stats = report.stats.setdefault(label, Stats())
+            setattr(owner, name, _wrap(original, stats))
+            originals.append((owner, name, original))
+
+        if track_allocations:
+            tracemalloc.start()
+            start_bytes = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.elapsed = time.perf_counter() - start
+            if track_allocations:
+                current_bytes, report.peak_bytes = tracemalloc.get_traced_memory()
+                report.allocated_bytes = current_bytes - start_bytes
+                tracemalloc.stop()
+    finally:
+        for owner, name, original in reversed(originals):
+            setattr(owner, name, original)
+        _recording = False
+
+
+def _wrap(original, stats):
+    # staticmethods and classmethods have to be unwrapped, and the wrapper
+    # rewrapped the same way, so they still bind correctly
+    if isinstance(original, (staticmethod, classmethod)):
+        return type(original)(_wrap(original.__func__, stats))
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        stats.calls += 1
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        except BaseException:
+            stats.exceptions += 1
+            raise
+        finally:
+            stats.seconds += time.perf_counter() - start
+    return wrapper
@@ -0,0 +1,70 @@
+import unittest
+
+import instrument
+from vector import Vector
+from plane import Plane
+from linsys import LinearSystem
+
+def make_system():
+    return LinearSystem([Plane(Vector(['0','1','1']), '1'),
+                         Plane(Vector(['1','-1','1']), '2'),
+                         Plane(Vector(['1','2','-5']), '3')])
+
+
+class RecordingTest(unittest.TestCase):
+
+    def test_counts_calls_and_exceptions(self):
+        s = make_system()
+        with instrument.recording() as report:
+            s.swap_rows(0, 1)
+            s.multiply_coefficient_and_row(2, 0)
+            s.indices_of_first_nonzero_terms_in_each_row()
+            Plane().set_basepoint()
+
+        self.assertEqual(report.calls('LinearSystem.swap_rows'), 1)
+        self.assertEqual(report.calls('LinearSystem.multiply_coefficient_and_row'), 1)
+        self.assertEqual(report.calls('Vector.__mul__'), 1)
+        self.assertTrue(report.calls('Hyperplane.set_basepoint') >= 2)
+        self.assertTrue(report.calls('Hyperplane.leading_index') >= 1)
+        self.assertEqual(report.stats['Hyperplane.set_basepoint'].exceptions, 0)
+        self.assertTrue(report.elapsed > 0)
+        self.assertTrue('LinearSystem.swap_rows' in str(report))
+
+    def test_static_and_class_methods_still_work(self):
+        with instrument.recording() as report:
+            v = Vector._from_decimals((1, 2))
+            index = Plane.first_nonzero_index(Vector([0, 1, 0]))
+
+        self.assertEqual(v, Vector([1, 2]))
+        self.assertEqual(index, 1)
+        self.assertEqual(report.calls('Vector._from_decimals'), 1)
+
+    def test_solve_report_and_allocations(self):
+        with instrument.recording(track_allocations=True) as report:
+            make_system().compute_solution()
+
+        self.assertEqual(report.calls('LinearSystem.compute_solution'), 1)
+        self.assertEqual(report.calls('LUFactorization.__init__'), 1)
+        self.assertTrue(report.peak_bytes > 0)
+
+    def test_originals_are_restored(self):
+        add = Vector.__add__
+        with instrument.recording():
+            self.assertIsNot(Vector.__add__, add)
+        self.assertIs(Vector.__add__, add)
+
+        with self.assertRaises(ValueError):
+            with instrument.recording():
+                raise ValueError
+        self.assertIs(Vector.__add__, add)
+
+    def test_recordings_cannot_be_nested(self):
+        with instrument.recording():
+            with self.assertRaises(Exception):
+                with instrument.recording():
+                    pass
+
+
+
+if __name__ == '__main__':
+    unittest.main()
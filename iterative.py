@@ -0,0 +1,176 @@
+from collections import namedtuple
+
+
+# Iterative solvers for square systems: Jacobi, Gauss-Seidel and conjugate
+# gradient. Each sweep is O(number of nonzeros), instead of the O(n^3) of
+# elimination, so for large systems that converge quickly - diagonally
+# dominant ones for Jacobi/Gauss-Seidel, symmetric positive-definite ones for
+# conjugate gradient - they're much cheaper. Passing an initial_guess close to
+# the answer (say the previous solution, when solving a slowly-changing
+# system over and over) cuts the number of sweeps further; a guess that's
+# already within tolerance returns after 0 iterations.
+#
+# Like lu.py, the arithmetic is generic: the rows can hold Decimals, Fractions
+# or floats. Rows can also be dicts of {column index: coefficient}, as in
+# SparseLinearSystem. Convergence is measured by the largest absolute entry
+# of the residual b - Ax; residuals holds that value for the initial guess and
+# after every iteration. Running out of iterations isn't an error - the result
+# just has converged=False.
+
+IterativeResult = namedtuple('IterativeResult', ['solution', 'iterations', 'converged', 'residuals'])
+
+NOT_SQUARE_MSG = 'Iterative solvers need as many equations as variables'
+ZERO_DIAGONAL_MSG = 'Every diagonal coefficient must be nonzero'
+NOT_SYMMETRIC_MSG = 'Conjugate gradient needs a symmetric coefficient matrix'
+NOT_POSITIVE_DEFINITE_MSG = 'Conjugate gradient needs a positive-definite coefficient matrix'
+UNKNOWN_METHOD_MSG = 'Unknown iterative method'
+
+
+def jacobi(rows, constants, initial_guess=None, tolerance=1e-10, max_iterations=1000):
+    entries, diagonal, x = _prepare(rows, constants, initial_guess)
+    n = len(x)
+    residuals = []
+
+    for iteration in range(max_iterations + 1):
+        # one pass gives both the residual of x and the next iterate
+        residual = 0
+        next_x = [0] * n
+        for i in range(n):
+            total = constants[i]
+            for j, a in entries[i]:
+                total -= a * x[j]
+            residual = max(residual, abs(total))
+            next_x[i] = x[i] + total / diagonal[i]
+
+        residuals.append(residual)
+        if residual <= tolerance:
+            return IterativeResult(x, iteration, True, residuals)
+        if iteration < max_iterations:
+            x = next_x
+
+    return IterativeResult(x, max_iterations, False, residuals)
+
+
+def gauss_seidel(rows, constants, initial_guess=None, tolerance=1e-10, max_iterations=1000):
+    entries, diagonal, x = _prepare(rows, constants, initial_guess)
+    n = len(x)
+    residuals = [_residual(entries, constants, x)]
+    if residuals[0] <= tolerance:
+        return IterativeResult(x, 0, True, residuals)
+
+    for iteration in range(1, max_iterations + 1):
+        # same as Jacobi, except each x[i] is used as soon as it's updated
+        for i in range(n):
+            total = constants[i]
+            for j, a in entries[i]:
+                total -= a * x[j]
+            x[i] += total / diagonal[i]
+
+        residuals.append(_residual(entries, constants, x))
+        if residuals[-1] <= tolerance:
+            return IterativeResult(x, iteration, True, residuals)
+
+    return IterativeResult(x, max_iterations, False, residuals)
+
+
+def conjugate_gradient(rows, constants, initial_guess=None, tolerance=1e-10, max_iterations=1000):
+    entries, diagonal, x = _prepare(rows, constants, initial_guess)
+    n = len(x)
+
+    coefficients = [dict(row) for row in entries]
+    for i, row in enumerate(coefficients):
+        for j, a in row.items():
+            if coefficients[j].get(i, 0) != a:
+                raise Exception(NOT_SYMMETRIC_MSG)
+
+    r = [constants[i] - _dot_row(entries[i], x) for i in range(n)]
+    residuals = [max(abs(value) for value in r)]
+    if residuals[0] <= tolerance:
+        return IterativeResult(x, 0, True, residuals)
+
+    p = list(r)
+    rr = _dot(r, r)
+    for iteration in range(1, max_iterations + 1):
+        ap = [_dot_row(entries[i], p) for i in range(n)]
+        pap = _dot(p, ap)
+        if pap <= 0:
+            raise Exception(NOT_POSITIVE_DEFINITE_MSG)
+
+        alpha = rr / pap
+        for i in range(n):
+            x[i] += alpha * p[i]
+            r[i] -= alpha * ap[i]
+
+        residuals.append(max(abs(value) for value in r))
+        if residuals[-1] <= tolerance:
+            return IterativeResult(x, iteration, True, residuals)
+
+        next_rr = _dot(r, r)
+        beta = next_rr / rr
+        rr = next_rr
+        p = [r[i] + beta * p[i] for i in range(n)]
+
+    return IterativeResult(x, max_iterations, False, residuals)
+
+
+METHODS = {
+    'jacobi': jacobi,
+    'gauss_seidel': gauss_seidel,
+    'conjugate_gradient': conjugate_gradient,
+}
+
+
+def solve(method, rows, constants, initial_guess=None, tolerance=1e-10, max_iterations=1000):
+    if method not in METHODS:
+        raise Exception(UNKNOWN_METHOD_MSG)
+    return METHODS[method](rows, constants, initial_guess, tolerance, max_iterations)
+
+
+def _prepare(rows, constants, initial_guess):
+    # the nonzero (column, coefficient) pairs of each row, the diagonal, and
+    # a copy of the starting point
+    n = len(rows)
+    if len(constants) != n:
+        raise Exception(NOT_SQUARE_MSG)
+
+    entries = []
+    for row in rows:
+        items = row.items() if isinstance(row, dict) else enumerate(row)
+        row_entries = [(j, a) for (j, a) in items if a != 0]
+        if any(j >= n for (j, a) in row_entries) or (not isinstance(row, dict) and len(row) != n):
+            raise Exception(NOT_SQUARE_MSG)
+        entries.append(row_entries)
+
+    diagonal = []
+    for i, row_entries in enumerate(entries):
+        a = dict(row_entries).get(i, 0)
+        if a == 0:
+            raise Exception(ZERO_DIAGONAL_MSG)
+        diagonal.append(a)
+
+    if initial_guess is None:
+        x = [0 * c for c in constants]
+    else:
+        x = list(initial_guess)
+        if len(x) != n:
+            raise Exception(NOT_SQUARE_MSG)
+
+    return entries, diagonal, x
+
+
+def _dot_row(row_entries, x):
+    total = 0
+    for j, a in row_entries:
+        total += a * x[j]
+    return total
+
+
+def _dot(u, v):
+    total = 0
+    for a, b in zip(u, v):
+        total += a * b
+    return total
+
+
+def _residual(entries, constants, x):
+    return max(abs(constants[i] - _dot_row(entries[i], x)) for i in range(len(x)))
@@ -0,0 +1,69 @@
+import unittest
+from decimal import Decimal
+
+import iterative
+
+# diagonally dominant and symmetric positive-definite, so all three methods
+# converge; the solution is (1, 2, 3)
+ROWS = [[4.0, 1.0, 0.0],
+        [1.0, 5.0, 2.0],
+        [0.0, 2.0, 6.0]]
+CONSTANTS = [6.0, 17.0, 22.0]
+
+
+class IterativeTest(unittest.TestCase):
+
+    def assertSolution(self, result, expected):
+        self.assertTrue(result.converged)
+        for x, e in zip(result.solution, expected):
+            self.assertAlmostEqual(x, e, places=8)
+
+    def test_all_methods_converge(self):
+        for method in iterative.METHODS:
+            result = iterative.solve(method, ROWS, CONSTANTS)
+            self.assertSolution(result, [1, 2, 3])
+            self.assertEqual(len(result.residuals), result.iterations + 1)
+            self.assertTrue(result.residuals[-1] <= 1e-10)
+
+    def test_gauss_seidel_beats_jacobi_and_cg_takes_at_most_n_steps(self):
+        jacobi = iterative.jacobi(ROWS, CONSTANTS)
+        gauss_seidel = iterative.gauss_seidel(ROWS, CONSTANTS)
+        cg = iterative.conjugate_gradient(ROWS, CONSTANTS)
+        self.assertTrue(gauss_seidel.iterations < jacobi.iterations)
+        self.assertTrue(cg.iterations <= 4)
+
+    def test_warm_start(self):
+        cold = iterative.gauss_seidel(ROWS, CONSTANTS)
+        warm = iterative.gauss_seidel(ROWS, [6.0, 17.01, 22.0], initial_guess=cold.solution)
+        self.assertTrue(warm.iterations < cold.iterations)
+
+        exact = iterative.jacobi(ROWS, CONSTANTS, initial_guess=[1, 2, 3])
+        self.assertEqual(exact.iterations, 0)
+        self.assertEqual(exact.solution, [1, 2, 3])
+
+    def test_iteration_limit(self):
+        result = iterative.jacobi(ROWS, CONSTANTS, max_iterations=3)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.iterations, 3)
+        self.assertEqual(len(result.residuals), 4)
+
+    def test_sparse_rows_and_decimals(self):
+        rows = [{0: Decimal(4), 1: Decimal(1)}, {0: Decimal(1), 1: Decimal(3)}]
+        result = iterative.conjugate_gradient(rows, [Decimal(1), Decimal(2)])
+        self.assertSolution(result, [Decimal(1)/11, Decimal(7)/11])
+        self.assertTrue(isinstance(result.solution[0], Decimal))
+
+    def test_errors(self):
+        for rows, constants, method, msg in [
+                ([[1, 2], [3, 4], [5, 6]], [1, 2, 3], 'jacobi', iterative.NOT_SQUARE_MSG),
+                ([[0, 1], [1, 0]], [1, 1], 'gauss_seidel', iterative.ZERO_DIAGONAL_MSG),
+                ([[2, 1], [0, 2]], [1, 1], 'conjugate_gradient', iterative.NOT_SYMMETRIC_MSG),
+                ([[1, 2], [2, 1]], [1, 0], 'conjugate_gradient', iterative.NOT_POSITIVE_DEFINITE_MSG),
+                ([[1]], [1], 'sor', iterative.UNKNOWN_METHOD_MSG)]:
+            with self.assertRaises(Exception) as cm:
+                iterative.solve(method, rows, constants)
+            self.assertEqual(str(cm.exception), msg)
+
+
+if __name__ == '__main__':
+    unittest.main()
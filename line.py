@@ -1,115 +1,20 @@
-from decimal import Decimal, getcontext, DivisionByZero
+from decimal import Decimal
 
 from vector import Vector
+from hyperplane import Hyperplane
+from precision import uses_precision, precision_context, current_precision
 
-getcontext().prec = 30
 
+# Line is a hyperplane in 2 dimensions; on top of what it inherits from
+# Hyperplane, it can also find the intersection of two lines.
+class Line(Hyperplane):
 
-class Line(object):
-
-    NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
     NO_INTERSECTIONS_NOT_COINCIDENT = 'No intersection - lines are parallel and not coincident'
     INFINITE_INTERSECTIONS_COINCIDENT = 'Infinite intersections - lines are coincident'
 
-    def __init__(self, normal_vector=None, constant_term=None):
-        self.dimension = 2
-
-        if not normal_vector:
-            all_zeros = ['0']*self.dimension
-            normal_vector = Vector(all_zeros)
-        self.normal_vector = normal_vector
-
-        if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
-
-        self.set_basepoint()
-
-    def set_basepoint(self):
-        try:
-            n = self.normal_vector
-            c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
-
-            initial_index = Line.first_nonzero_index(n)
-            initial_coefficient = n[initial_index]
-
-            basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
-
-        except Exception as e:
-            if str(e) == Line.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
-            else:
-                raise e
-
-    def __str__(self):
-
-        num_decimal_places = 3
-
-        def write_coefficient(coefficient, is_initial_term=False):
-            coefficient = round(coefficient, num_decimal_places)
-            if coefficient % 1 == 0:
-                coefficient = int(coefficient)
-
-            output = ''
-
-            if coefficient < 0:
-                output += '-'
-            if coefficient > 0 and not is_initial_term:
-                output += '+'
-
-            if not is_initial_term:
-                output += ' '
-
-            if abs(coefficient) != 1:
-                output += '{}'.format(abs(coefficient))
-
-            return output
-
-        n = self.normal_vector
-
-        try:
-            initial_index = Line.first_nonzero_index(n)
-            terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
-                     for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
-            output = ' '.join(terms)
-
-        except Exception as e:
-            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
-                output = '0'
-            else:
-                raise e
-
-        constant = round(self.constant_term, num_decimal_places)
-        if constant % 1 == 0:
-            constant = int(constant)
-        output += ' = {}'.format(constant)
-
-        return output
-
-    def parallelTo(self, line):
-        return self.normal_vector.parallelTo(line.normal_vector)
-
-    def coincidentTo(self, line):
-        # TODO include logic to handle when normal vector is zero - 1:40 in 'coding functions for lines - solution'
-
-        # first, coincident lines - equal lines - have to be parallel
-        if not self.parallelTo(line):
-            return False
-
-        # # then, a vector connecting one point on one line to a point on the
-        # # other line must be orthogonal to the lines' normal vectors
-        # p_on_self = self.pointOnLine()
-        # p_on_line = line.pointOnLine()
-
-        v_joining_lines = self.basepoint - line.basepoint
-
-        return (v_joining_lines.orthogonalTo(self.normal_vector.normalized()))
-
-    def __eq__(self, l):
-        return self.coincidentTo(l)
+    DIMENSION = 2
 
+    @uses_precision
     def intersectionWith(self, line):
         if self.coincidentTo(line):
             # same line, return self
@@ -128,18 +33,115 @@ class Line(object):
                      ( (-(c*k1) + (a*k2)) / denominator) )
 
 
-    @staticmethod
-    def first_nonzero_index(iterable):
-        for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
-                return k
-        raise Exception(Line.NO_NONZERO_ELTS_FOUND_MSG)
-
-
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
 
+# All-pairs intersections for a collection of lines. Rather than calling
+# intersectionWith on every pair (which works out parallel/coincident w/ a
+# couple of acos calls each time), each line's canonical form (see
+# Hyperplane.canonical_form) is computed once. Lines w/ the same canonical
+# direction are parallel, so for those pairs all that's left is coincidentTo's
+# last step - whether the vector joining their basepoints is orthogonal to the
+# normal - done on the precomputed basepoints and unit normals, w/o the acos
+# calls. Every other pair gets Cramer's rule on the precomputed
+# coefficients - unless the lines are so close to parallel that parallelTo
+# might call them parallel anyway, in which case the pair goes through
+# intersectionWith, so the answer is always the same as it would give.
+#
+# Yields (i, j, result) for every i < j, in order, where result is what
+# lines[i].intersectionWith(lines[j]) returns. With processes set, the rows
+# of pairs are spread across a process pool. The math is done at the given
+# precision, or the caller's.
+
+def all_intersections(lines, processes=None, chunksize=16, precision=None):
+    lines = list(lines)
+    precision = precision or current_precision()
+    with precision_context(precision):
+        coefficients = [_canonical_coefficients(l) for l in lines]
+
+    # (each row is worked out inside the precision context, but the context
+    # mustn't be left active across a yield, or the caller would run in it)
+    if processes:
+        from multiprocessing import Pool
+
+        with Pool(processes, initializer=_set_shared_coefficients,
+                  initargs=(coefficients, precision)) as pool:
+            rows = pool.imap(_intersections_for_row, range(len(lines)), chunksize)
+            for row in rows:
+                with precision_context(precision):
+                    items = list(_resolve(lines, row))
+                for item in items:
+                    yield item
+    else:
+        for i in range(len(lines)):
+            with precision_context(precision):
+                items = list(_resolve(lines, _intersections_for_row(i, coefficients)))
+            for item in items:
+                yield item
+
+
+# parallelTo allows angles up to 1e-5 from 0, and 1e-5 * pi from pi (and
+# gets the angle from a float acos), so anything whose sine is under this is
+# left to intersectionWith to decide
+NEAR_PARALLEL_SINE = Decimal('1e-4')
+
+def _canonical_coefficients(line):
+    a, b = line.normal_vector
+    k = line.constant_term
+    if line.normal_vector.isZero():
+        # a zero normal vector isn't a line, so leave it to intersectionWith
+        return (a, b, k, 'zero', None, None, None)
+    return (a, b, k, line.canonical_form()[:-1], line.normal_vector.magnitude(),
+            line.basepoint, line.normal_vector.normalized())
+
+
+_shared_coefficients = None
+_shared_precision = None
+
+def _set_shared_coefficients(coefficients, precision):
+    global _shared_coefficients, _shared_precision
+    _shared_coefficients = coefficients
+    _shared_precision = precision
+
+
+def _intersections_for_row(i, coefficients=None):
+    # returns (j, kind, point) for every j > i, where kind is 'point',
+    # 'parallel', 'coincident' or 'fallback' (meaning the pair has to go
+    # through intersectionWith)
+    if coefficients is None:
+        with precision_context(_shared_precision):
+            return _intersections_for_row(i, _shared_coefficients)
+
+    a, b, k1, direction, magnitude, basepoint, unit_normal = coefficients[i]
+    results = []
+    for j in range(i+1, len(coefficients)):
+        c, d, k2, other_direction, other_magnitude, other_basepoint, _ = coefficients[j]
+        if direction == 'zero' or other_direction == 'zero':
+            results.append((j, 'fallback', None))
+        elif direction == other_direction:
+            # (the same test as coincidentTo, on the same values)
+            coincident = (basepoint - other_basepoint).orthogonalTo(unit_normal)
+            results.append((j, 'coincident' if coincident else 'parallel', None))
+        else:
+            denominator = (a*d) - (b*c)
+            if abs(denominator) < NEAR_PARALLEL_SINE * magnitude * other_magnitude:
+                # nearly parallel, but quantized into different buckets
+                results.append((j, 'fallback', None))
+            else:
+                results.append((j, 'point', ( ( ((d*k1) - (b*k2)) / denominator),
+                                              ( (-(c*k1) + (a*k2)) / denominator) )))
+    return (i, results)
+
+
+def _resolve(lines, row):
+    i, results = row
+    for j, kind, point in results:
+        if kind == 'point':
+            yield (i, j, point)
+        elif kind == 'parallel':
+            yield (i, j, None)
+        elif kind == 'coincident':
+            yield (i, j, lines[i])
+        else:
+            yield (i, j, lines[i].intersectionWith(lines[j]))
 
 
 if __name__ == '__main__':
@@ -80,6 +80,67 @@ class IntersectionTest(unittest.TestCase):
         self.assertEqual(l1.intersectionWith(l2), l1)
 
 
+class AllIntersectionsTest(unittest.TestCase):
+
+    def make_lines(self):
+        return [Line(Vector([1,1]), 3),
+                Line(Vector([1,-1]), 1),
+                Line(Vector([2,2]), 6),     # coincident w/ the first
+                Line(Vector([-3,-3]), 1),   # parallel to the first
+                Line(Vector([0,4]), 2),
+                Line(Vector([4.046,2.836]), 1.21)]
+
+    def test_matches_pairwise_intersections(self):
+        lines = self.make_lines()
+        results = list(line.all_intersections(lines))
+
+        pairs = [(i, j) for i in range(len(lines)) for j in range(i+1, len(lines))]
+        self.assertEqual([(i, j) for (i, j, r) in results], pairs)
+        for i, j, result in results:
+            expected = lines[i].intersectionWith(lines[j])
+            if isinstance(expected, tuple):
+                self.assertAlmostEqual(result[0], expected[0])
+                self.assertAlmostEqual(result[1], expected[1])
+            else:
+                self.assertIs(result, expected)
+
+    def test_parallel_and_coincident_pairs_come_from_buckets(self):
+        results = {(i, j): r for (i, j, r) in line.all_intersections(self.make_lines())}
+
+        self.assertIsNone(results[(0, 3)])
+        self.assertIsNone(results[(2, 3)])
+        self.assertTrue(isinstance(results[(0, 2)], Line))
+        self.assertEqual(results[(0, 1)], (2, 1))
+
+    def test_near_parallel_pairs_agree_with_intersection_with(self):
+        lines = [Line(Vector([1,0]), 1), Line(Vector([1,'1e-6']), 1),
+                 Line(Vector([1,'1e-6']), 2), Line(Vector([-1,'3e-5']), 1),
+                 Line(Vector([1,'1e-3']), 1), Line(Vector([1,0]), '1.0000000004'),
+                 Line(Vector([1,1]), 1), Line(Vector([1,1]), '1.0000000004'),
+                 Line(Vector([2,2]), '2.00000000000002')]
+        results = {(i, j): r for (i, j, r) in line.all_intersections(lines)}
+
+        # within parallelTo's tolerance, so not the point Cramer's rule would give
+        self.assertIs(results[(0, 1)], lines[0])
+        self.assertIsNone(results[(0, 2)])
+        # same rounded canonical form, but intersectionWith calls these parallel...
+        self.assertIsNone(results[(6, 7)])
+        # ...and these, whose canonical forms differ exactly, coincident
+        self.assertIs(results[(6, 8)], lines[6])
+        for (i, j), result in results.items():
+            expected = lines[i].intersectionWith(lines[j])
+            if isinstance(expected, tuple):
+                self.assertEqual(result, expected)
+            else:
+                self.assertIs(result, expected)
+
+    def test_process_pool(self):
+        lines = self.make_lines()
+
+        self.assertEqual([(i, j) for (i, j, r) in line.all_intersections(lines, processes=2, chunksize=2)],
+                         [(i, j) for (i, j, r) in line.all_intersections(lines)])
+
+
 
 if __name__ == '__main__':
     unittest.main()
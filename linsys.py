@@ -1,10 +1,16 @@
-from decimal import Decimal, getcontext
+from decimal import Decimal
 from copy import deepcopy
 
 from vector import Vector
 from plane import Plane
-
-getcontext().prec = 30
+from hyperplane import MyDecimal, is_near_zero
+import bareiss
+import iterative
+import refinement
+from lu import LUFactorization
+from qr import QRFactorization
+from parametrization import Parametrization
+from precision import uses_precision, current_precision
 
 
 class LinearSystem(object):
@@ -12,8 +18,16 @@ class LinearSystem(object):
     ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG = 'All planes in the system should live in the same dimension'
     NO_SOLUTIONS_MSG = 'No solutions'
     INF_SOLUTIONS_MSG = 'Infinitely many solutions'
-
-    def __init__(self, planes):
+    UNIQUE_SOLUTION_MSG = 'Unique solution'
+
+    # precision is the number of significant digits used for the system's
+    # Decimal math, including the Vector and Plane operations done on its
+    # behalf; None means use the caller's precision (see precision.py)
+    def __init__(self, planes, precision=None):
+        # our own copy of the list, so the row operations don't change the
+        # caller's list and changes to the caller's list don't get past the
+        # bookkeeping below
+        planes = list(planes)
         try:
             d = planes[0].dimension
             for p in planes:
@@ -21,38 +35,293 @@ class LinearSystem(object):
 
             self.planes = planes
             self.dimension = d
+            self.precision = precision
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
 
+        # index of the first nonzero coefficient in each row (-1 if there
+        # isn't one), kept up to date by the row operations and __setitem__ so
+        # it never has to be recomputed for the whole system
+        self._leading = [Plane.leading_index(p.normal_vector) for p in planes]
+        self._invalidate_factorization()
 
+
+    @uses_precision
     def swap_rows(self, row1_index, row2_index):
         self.planes[row1_index], self.planes[row2_index] = self.planes[row2_index], self.planes[row1_index]
+        self._leading[row1_index], self._leading[row2_index] = self._leading[row2_index], self._leading[row1_index]
+        self._invalidate_factorization()
 
+    @uses_precision
     def multiply_coefficient_and_row(self, coefficient, row_index):
         self.planes[row_index] = self.planes[row_index].scaledBy(coefficient)
+        self._update_leading(row_index)
+        self._invalidate_factorization()
 
+    @uses_precision
     def add_multiple_times_row_to_row(self, coefficient, row_to_add_index, row_to_be_added_to_index):
         plane_multiplied = self.planes[row_to_add_index].scaledBy(coefficient)
         self.planes[row_to_be_added_to_index] = self.planes[row_to_be_added_to_index].add(plane_multiplied)
-
-
+        self._update_leading(row_to_be_added_to_index)
+        self._invalidate_factorization()
+
+    # scaling can push a tiny coefficient over (or under) the near-zero
+    # tolerance, so even after multiply_coefficient_and_row the row is
+    # rescanned rather than assumed unchanged
+    def _update_leading(self, row_index):
+        self._leading[row_index] = Plane.leading_index(self.planes[row_index].normal_vector)
+
+
+    # drops rows that are exactly a multiple of an earlier row, in one pass,
+    # by comparing exact canonical forms (see Hyperplane.exact_canonical_form) -
+    # so it never changes the solution set. Rows that == (coincidentTo) would
+    # call equal but aren't exact multiples stay
+    def deduplicated(self):
+        seen = set()
+        planes = []
+        for p in self.planes:
+            key = p.exact_canonical_form()
+            if key not in seen:
+                seen.add(key)
+                planes.append(p)
+        return LinearSystem(planes, self.precision)
+
+
+    # (only sees changes made through the row operations or __setitem__ -
+    # not ones made directly to self.planes)
     def indices_of_first_nonzero_terms_in_each_row(self):
-        num_equations = len(self)
-        num_variables = self.dimension
-
-        indices = [-1] * num_equations
-
-        for i,p in enumerate(self.planes):
+        return list(self._leading)
+
+
+    # What kind of solution set the system has - NO_SOLUTIONS_MSG,
+    # INF_SOLUTIONS_MSG or UNIQUE_SOLUTION_MSG - w/o computing it. This only
+    # runs forward elimination, and stops at the first row that reduces to
+    # 0 = k (a row that's 0 = k to begin with is spotted from the leading
+    # indices, before eliminating anything); RREF and back-substitution are
+    # skipped entirely.
+
+    @uses_precision
+    def classify(self):
+        for i, p in enumerate(self.planes):
+            if self._leading[i] < 0 and not is_near_zero(p.constant_term):
+                return self.NO_SOLUTIONS_MSG
+
+        rows, constants = self._to_matrix()
+        pivots, inconsistent_row = _forward_eliminate(rows, constants, stop_if_inconsistent=True)
+        if inconsistent_row is not None:
+            return self.NO_SOLUTIONS_MSG
+        if len(pivots) < self.dimension:
+            return self.INF_SOLUTIONS_MSG
+        return self.UNIQUE_SOLUTION_MSG
+
+    # the number of independent equations (pivots in the triangular form)
+    @uses_precision
+    def rank(self):
+        rows, constants = self._to_matrix()
+        return len(_triangularize(rows, constants))
+
+
+    # The elimination below works in place on a dense copy of the system - a
+    # list of coefficient rows plus a list of constant terms - rather than
+    # through the row operations above, which build new Plane and Vector
+    # objects for every step. Planes are only built again for the result.
+
+    @uses_precision
+    def compute_triangular_form(self):
+        rows, constants = self._to_matrix()
+        _triangularize(rows, constants)
+        return self._from_matrix(rows, constants)
+
+    @uses_precision
+    def compute_rref(self):
+        rows, constants = self._to_matrix()
+        pivots = _triangularize(rows, constants)
+        _reduce_triangular_to_rref(rows, constants, pivots)
+        return self._from_matrix(rows, constants)
+
+    @uses_precision
+    def compute_solution(self, cache=None):
+        # square, nonsingular systems are solved w/ the cached LU
+        # factorization (see below), so solving the same system again is
+        # only O(n^2); everything else - including working out which of
+        # NO_SOLUTIONS_MSG/INF_SOLUTIONS_MSG applies - goes through elimination.
+        # W/ a cache (see solution_cache.py), a system that's been solved
+        # before - even written differently - comes straight from it
+        if cache is not None:
+            return cache.solve(self)
+
+        if len(self) == self.dimension and not self._factorization_failed:
             try:
-                indices[i] = p.first_nonzero_index(p.normal_vector)
+                self.factorize()
             except Exception as e:
-                if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                    continue
+                if str(e) == LUFactorization.SINGULAR_MATRIX_MSG:
+                    self._factorization_failed = True
                 else:
                     raise e
-
-        return indices
+            else:
+                return self.solve_for([p.constant_term for p in self.planes])
+
+        rows, constants = self._to_matrix()
+        pivots = _triangularize(rows, constants)
+        _reduce_triangular_to_rref(rows, constants, pivots)
+
+        # any row w/o a pivot is all zeros, so it reads 0 = k - if k isn't
+        # zero there's no solution
+        for i in range(len(pivots), len(rows)):
+            if not is_near_zero(constants[i]):
+                raise Exception(self.NO_SOLUTIONS_MSG)
+
+        if len(pivots) < self.dimension:
+            raise Exception(self.INF_SOLUTIONS_MSG)
+
+        solution = [Decimal('0')] * self.dimension
+        for i, j in enumerate(pivots):
+            solution[j] = constants[i]
+        return Vector._from_decimals(tuple(solution), self.precision)
+
+    # Factor once, solve many: the LU factorization of the coefficients is
+    # computed the first time it's needed and then reused for every
+    # right-hand side until the system changes (through __setitem__ or one of
+    # the row operations). Only square, nonsingular systems can be factored.
+
+    # (a factorization is also redone if it was computed at a different
+    # precision than the one now in effect)
+
+    @uses_precision
+    def factorize(self):
+        precision = current_precision()
+        if self._factorization is None or self._factorization_precision != precision:
+            rows = [list(p.normal_vector.coordinates) for p in self.planes]
+            self._factorization = LUFactorization(rows)
+            self._factorization_precision = precision
+        return self._factorization
+
+    @uses_precision
+    def solve_for(self, constant_terms):
+        constants = [Decimal(c) for c in constant_terms]
+        return Vector._from_decimals(tuple(self.factorize().solve(constants)), self.precision)
+
+    def solve_many(self, constant_terms_iterable):
+        # a generator: pass a list to solve a batch, or any iterable to
+        # stream right-hand sides through. (Each solve gets its own precision
+        # context, since one mustn't be left active across a yield.)
+        for constant_terms in constant_terms_iterable:
+            yield self.solve_for(constant_terms)
+
+    def _invalidate_factorization(self):
+        self._factorization = None
+        self._factorization_precision = None
+        self._factorization_failed = False
+
+    # Mixed-precision solving (see refinement.py): factors and solves in
+    # floats, then corrects the solution using residuals computed in Decimal
+    # until they're within tolerance (relative; by default about 5 digits
+    # short of the precision). If that doesn't converge - or the system isn't
+    # square, or is singular - it falls back to compute_solution. Returns a
+    # RefinementResult whose path says which was used: refinement.REFINED or
+    # refinement.DECIMAL (when iterations and residual are None).
+
+    @uses_precision
+    def compute_refined_solution(self, tolerance=None, max_iterations=10):
+        if tolerance is None:
+            tolerance = Decimal(10) ** (5 - current_precision())
+        tolerance = Decimal(tolerance)
+
+        if len(self) == self.dimension:
+            rows, constants = self._to_matrix()
+            refined = refinement.refine(rows, constants, tolerance, max_iterations)
+            if refined is not None:
+                solution, iterations, residual = refined
+                return refinement.RefinementResult(Vector._from_decimals(tuple(solution), self.precision),
+                                                   refinement.REFINED, iterations, residual)
+
+        return refinement.RefinementResult(self.compute_solution(), refinement.DECIMAL, None, None)
+
+    # Iterative solving (see iterative.py): method is 'jacobi',
+    # 'gauss_seidel' or 'conjugate_gradient'. Returns an IterativeResult whose
+    # solution is a Vector - pass the solution from a previous solve as
+    # initial_guess to warm-start from it.
+
+    @uses_precision
+    def compute_iterative_solution(self, method='gauss_seidel', initial_guess=None,
+                                   tolerance=1e-10, max_iterations=1000):
+        rows, constants = self._to_matrix()
+        if initial_guess is not None:
+            initial_guess = [Decimal(x) for x in initial_guess]
+        result = iterative.solve(method, rows, constants, initial_guess, tolerance, max_iterations)
+        return result._replace(solution=Vector._from_decimals(tuple(result.solution), self.precision))
+
+    # The whole solution set, as a Parametrization (basepoint plus one
+    # direction vector per free variable), from a single RREF pass - a system
+    # w/ a unique solution just has no direction vectors.
+
+    @uses_precision
+    def compute_parametrization(self):
+        rows, constants = self._to_matrix()
+        pivots = _triangularize(rows, constants)
+        for i in range(len(pivots), len(rows)):
+            if not is_near_zero(constants[i]):
+                raise Exception(self.NO_SOLUTIONS_MSG)
+        _reduce_triangular_to_rref(rows, constants, pivots)
+
+        rank = len(pivots)
+        return Parametrization(rows[:rank], constants[:rank], pivots, self.dimension, self.precision)
+
+    # Least squares, for overdetermined systems (more equations than
+    # variables) that usually have no exact solution: the x that minimizes
+    # the sum of the squared residuals, found by QR factorization of the
+    # coefficient columns (see qr.py). If the system does have a solution,
+    # this is it. Systems whose columns are dependent have infinitely many
+    # least-squares solutions.
+
+    @uses_precision
+    def compute_least_squares_solution(self):
+        rows, constants = self._to_matrix()
+        columns = [[row[j] for row in rows] for j in range(self.dimension)]
+        factorization = QRFactorization(columns)
+        if factorization.rank < self.dimension:
+            raise Exception(self.INF_SOLUTIONS_MSG)
+        return Vector._from_decimals(tuple(factorization.solve(constants)), self.precision)
+
+    # Exact solving: instead of the Decimal elimination above, which rounds to
+    # the context precision and has to decide what's 'near' zero, these use
+    # fraction-free Bareiss elimination over integers (see bareiss.py), so the
+    # rank and the solution are exact and there's no tolerance involved.
+
+    def compute_exact_solution(self, cache=None):
+        if cache is not None:
+            return cache.solve(self, exact=True)
+
+        rows, constants = self._to_matrix()
+        matrix = bareiss.integer_matrix(rows, constants)
+        pivots = bareiss.echelon(matrix, self.dimension)
+
+        if not bareiss.is_consistent(matrix, pivots):
+            raise Exception(self.NO_SOLUTIONS_MSG)
+
+        if len(pivots) < self.dimension:
+            raise Exception(self.INF_SOLUTIONS_MSG)
+
+        return tuple(bareiss.back_substitute(matrix, pivots, self.dimension))
+
+    def exact_rank(self):
+        rows, constants = self._to_matrix()
+        matrix = bareiss.integer_matrix(rows, constants)
+        return len(bareiss.echelon(matrix, self.dimension))
+
+    def _to_matrix(self):
+        rows = [list(p.normal_vector.coordinates) for p in self.planes]
+        constants = [p.constant_term for p in self.planes]
+        return rows, constants
+
+    def _from_matrix(self, rows, constants):
+        # the rows come back as the same type the system holds - Plane,
+        # Line, or a general Hyperplane
+        row_type = type(self.planes[0])
+        return LinearSystem([row_type(Vector._from_decimals(tuple(row), self.precision), c,
+                                      precision=self.precision)
+                             for (row, c) in zip(rows, constants)], self.precision)
 
 
     def __len__(self):
@@ -67,6 +336,8 @@ class LinearSystem(object):
         try:
             assert x.dimension == self.dimension
             self.planes[i] = x
+            self._update_leading(i)
+            self._invalidate_factorization()
 
         except AssertionError:
             raise Exception(self.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
@@ -79,9 +350,94 @@ class LinearSystem(object):
         return ret
 
 
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+def _triangularize(rows, constants):
+    # forward elimination, in place: for each row we find the leftmost column
+    # that still has a nonzero coefficient at or below that row, swap the row
+    # holding it up into place if we have to, and then clear that column in
+    # every row below. Pivot rows aren't scaled, to match the course's
+    # triangular form. Returns the pivot column for each pivot row (the rows
+    # after those are all zeros).
+    return _forward_eliminate(rows, constants)[0]
+
+
+def _forward_eliminate(rows, constants, stop_if_inconsistent=False):
+    # _triangularize, which also returns the index of a row that's been
+    # reduced to 0 = k for nonzero k (or None). W/ stop_if_inconsistent it
+    # returns as soon as it finds one, leaving the rest of the elimination
+    # undone - only rows changed by the elimination are checked, so rows that
+    # started out as 0 = k are up to the caller.
+    num_equations = len(rows)
+    num_variables = len(rows[0]) if rows else 0
+    pivots = []
+    inconsistent_row = None
+
+    i = 0
+    for j in range(num_variables):
+        if i >= num_equations:
+            break
+
+        pivot_row = None
+        for k in range(i, num_equations):
+            if not is_near_zero(rows[k][j]):
+                pivot_row = k
+                break
+        if pivot_row is None:
+            continue
+
+        if pivot_row != i:
+            rows[i], rows[pivot_row] = rows[pivot_row], rows[i]
+            constants[i], constants[pivot_row] = constants[pivot_row], constants[i]
+
+        pivot = rows[i]
+        pivot_value = pivot[j]
+        for k in range(i+1, num_equations):
+            row = rows[k]
+            if is_near_zero(row[j]):
+                continue
+            alpha = -row[j] / pivot_value
+            row[j] = Decimal('0')
+            is_zero_row = True
+            for m in range(j+1, num_variables):
+                row[m] += alpha * pivot[m]
+                if is_zero_row and not is_near_zero(row[m]):
+                    is_zero_row = False
+            constants[k] += alpha * constants[i]
+
+            if is_zero_row and inconsistent_row is None and not is_near_zero(constants[k]):
+                inconsistent_row = k
+                if stop_if_inconsistent:
+                    return pivots, inconsistent_row
+
+        pivots.append(j)
+        i += 1
+
+    return pivots, inconsistent_row
+
+
+def _reduce_triangular_to_rref(rows, constants, pivots):
+    # backward pass, in place: working up from the last pivot row, scale each
+    # pivot to one and clear its column in the rows above
+    num_variables = len(rows[0]) if rows else 0
+
+    for i in reversed(range(len(pivots))):
+        j = pivots[i]
+        pivot = rows[i]
+
+        scale = Decimal('1') / pivot[j]
+        pivot[j] = Decimal('1')
+        for m in range(j+1, num_variables):
+            pivot[m] *= scale
+        constants[i] *= scale
+
+        for k in range(i):
+            row = rows[k]
+            if is_near_zero(row[j]):
+                continue
+            alpha = -row[j]
+            row[j] = Decimal('0')
+            for m in range(j+1, num_variables):
+                row[m] += alpha * pivot[m]
+            constants[k] += alpha * constants[i]
 
 
 
@@ -1,7 +1,11 @@
 import unittest
+from decimal import Decimal
+from fractions import Fraction
 
+import linsys
 from linsys import LinearSystem
 from plane import Plane
+from line import Line
 from vector import Vector
 
 # Checks that the normal vector and the constant term are equal. Works with both
@@ -40,6 +44,36 @@ class BasicOperationsTest(unittest.TestCase):
         self.assertTrue(s[0] == p1 and s[1] == p0 and
                         s[2] == p2 and s[3] == p3)
 
+    def test_leading_indices_follow_row_operations(self):
+        s = LinearSystem([Plane(Vector([0,1,1]), 1),
+                          Plane(Vector([1,-1,1]), 2),
+                          Plane(Vector([0,0,0]), 0)])
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [1, 0, -1])
+
+        s.swap_rows(0, 2)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [-1, 0, 1])
+
+        s.add_multiple_times_row_to_row(-1, 1, 2)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [-1, 0, 0])
+        s.add_multiple_times_row_to_row(1, 1, 0)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [0, 0, 0])
+
+        s.multiply_coefficient_and_row(0, 1)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [0, -1, 0])
+
+        s[1] = Plane(Vector([0,0,5]), 1)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [0, 2, 0])
+
+    def test_planes_list_is_copied(self):
+        planes = [Plane(Vector([0,1,1]), 1), Plane(Vector([1,-1,1]), 2)]
+        s = LinearSystem(planes)
+
+        planes[0] = Plane(Vector([0,0,1]), 1)
+        s.swap_rows(0, 1)
+        self.assertEqual(planes[1].constant_term, 2)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [0, 1])
+        self.assertEqual(s[1].normal_vector, Vector([0,1,1]))
+
     def test_can_multiply_coef_and_row(self):
         # like w/ the first and third tests, this one comes directly from the
         # course. note however that as this is defined it passes with a no-op
@@ -118,45 +152,339 @@ class BasicOperationsTest(unittest.TestCase):
         assertComponentsHaveSameValues(self, s[1], Plane(Vector(['10','11','10']), '12'))
         assertComponentsHaveSameValues(self, s[2], p2)
         assertComponentsHaveSameValues(self, s[3], p3)
+    def test_deduplicated_drops_coincident_rows(self):
+        p0 = Plane(Vector([1,1,1]), 1)
+        p1 = Plane(Vector([0,1,0]), 2)
+        p2 = Plane(Vector([-2,-2,-2]), -2)
+        p3 = Plane(Vector([0,3,0]), 6)
+        p4 = Plane(Vector([1,0,-2]), 2)
+
+        s = LinearSystem([p0,p1,p2,p3,p4]).deduplicated()
+
+        self.assertEqual(len(s), 3)
+        self.assertIs(s[0], p0)
+        self.assertIs(s[1], p1)
+        self.assertIs(s[2], p4)
+
+        # == would call this one coincident w/ p0, but it isn't the same equation
+        p5 = Plane(Vector([1,1,'1.000001']), 1)
+        self.assertTrue(p5 == p0)
+        self.assertEqual(len(LinearSystem([p0,p5]).deduplicated()), 2)
+
+        # and neither is one that only rounds to the same canonical form
+        p6 = Plane(Vector([1,1,1]), '1.0000000004')
+        self.assertEqual(p6.canonical_form(), p0.canonical_form())
+        s = LinearSystem([p0,p6])
+        self.assertEqual(s.classify(), LinearSystem.NO_SOLUTIONS_MSG)
+        self.assertEqual(len(s.deduplicated()), 2)
+        self.assertEqual(s.deduplicated().classify(), LinearSystem.NO_SOLUTIONS_MSG)
+
+
+class TriangularFormTest(unittest.TestCase):
+    # these are the course's test cases for compute_triangular_form, which
+    # were commented out here until the method existed
+
+    def test_already_triangular_system_is_unchanged(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['0','1','1']), constant_term='2')
+        s = LinearSystem([p1,p2])
+        t = s.compute_triangular_form()
+
+        assertComponentsHaveSameValues(self, t[0], p1)
+        assertComponentsHaveSameValues(self, t[1], p2)
+
+    def test_parallel_planes_leave_zero_row(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
+        s = LinearSystem([p1,p2])
+        t = s.compute_triangular_form()
+
+        self.assertTrue(t[0] == p1 and
+                        t[1] == Plane(constant_term='1'))
+
+    def test_redundant_rows(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['0','1','0']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','1','-1']), constant_term='3')
+        p4 = Plane(normal_vector=Vector(['1','0','-2']), constant_term='2')
+        s = LinearSystem([p1,p2,p3,p4])
+        t = s.compute_triangular_form()
+
+        self.assertTrue(t[0] == p1 and
+                        t[1] == p2 and
+                        t[2] == Plane(normal_vector=Vector(['0','0','-2']), constant_term='2') and
+                        t[3] == Plane())
+
+    def test_rows_are_swapped_to_find_pivots(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
+        s = LinearSystem([p1,p2,p3])
+        t = s.compute_triangular_form()
+
+        assertComponentsHaveSameValues(self, t[0], Plane(normal_vector=Vector(['1','-1','1']), constant_term='2'))
+        assertComponentsHaveSameValues(self, t[1], Plane(normal_vector=Vector(['0','1','1']), constant_term='1'))
+        assertComponentsHaveSameValues(self, t[2], Plane(normal_vector=Vector(['0','0','-9']), constant_term='-2'))
+
+    def test_original_system_is_not_modified(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        s = LinearSystem([p1,p2])
+        s.compute_triangular_form()
+
+        self.assertIs(s[0], p1)
+        self.assertIs(s[1], p2)
+
+
+class RrefTest(unittest.TestCase):
+
+    def test_rref(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['0','1','1']), constant_term='2')
+        r = LinearSystem([p1,p2]).compute_rref()
+
+        assertComponentsHaveSameValues(self, r[0], Plane(normal_vector=Vector(['1','0','0']), constant_term='-1'))
+        assertComponentsHaveSameValues(self, r[1], p2)
+
+    def test_rref_with_zero_row(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
+        r = LinearSystem([p1,p2]).compute_rref()
+
+        self.assertTrue(r[0] == p1 and
+                        r[1] == Plane(constant_term='1'))
+
+    def test_rref_with_redundant_rows(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['0','1','0']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','1','-1']), constant_term='3')
+        p4 = Plane(normal_vector=Vector(['1','0','-2']), constant_term='2')
+        r = LinearSystem([p1,p2,p3,p4]).compute_rref()
+
+        assertComponentsHaveSameValues(self, r[0], Plane(normal_vector=Vector(['1','0','0']), constant_term='0'))
+        assertComponentsHaveSameValues(self, r[1], p2)
+        assertComponentsHaveSameValues(self, r[2], Plane(normal_vector=Vector(['0','0','1']), constant_term='-1'))
+        self.assertTrue(r[3] == Plane())
+
+    def test_rref_unique_solution(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
+        r = LinearSystem([p1,p2,p3]).compute_rref()
+
+        self.assertTrue(r[0] == Plane(normal_vector=Vector(['1','0','0']), constant_term=Decimal(23)/Decimal(9)) and
+                        r[1] == Plane(normal_vector=Vector(['0','1','0']), constant_term=Decimal(7)/Decimal(9)) and
+                        r[2] == Plane(normal_vector=Vector(['0','0','1']), constant_term=Decimal(2)/Decimal(9)))
+
+
+class SolutionTest(unittest.TestCase):
+
+    def test_no_solutions(self):
+        p1 = Plane(normal_vector=Vector(['5.862','1.178','-10.366']), constant_term='-8.15')
+        p2 = Plane(normal_vector=Vector(['-2.931','-0.589','5.183']), constant_term='-4.075')
+
+        with self.assertRaises(Exception) as context:
+            LinearSystem([p1,p2]).compute_solution()
+
+        self.assertEqual(str(context.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+    def test_infinite_solutions(self):
+        p1 = Plane(normal_vector=Vector(['8.631','5.112','-1.816']), constant_term='-5.113')
+        p2 = Plane(normal_vector=Vector(['4.315','11.132','-5.27']), constant_term='-6.775')
+        p3 = Plane(normal_vector=Vector(['-2.158','3.01','-1.727']), constant_term='-0.831')
+
+        with self.assertRaises(Exception) as context:
+            LinearSystem([p1,p2,p3]).compute_solution()
+
+        self.assertEqual(str(context.exception), LinearSystem.INF_SOLUTIONS_MSG)
+
+    def test_unique_solution(self):
+        p1 = Plane(normal_vector=Vector(['5.262','2.739','-9.878']), constant_term='-3.441')
+        p2 = Plane(normal_vector=Vector(['5.111','6.358','7.638']), constant_term='-2.152')
+        p3 = Plane(normal_vector=Vector(['2.016','-9.924','-1.367']), constant_term='-9.278')
+
+        solution = LinearSystem([p1,p2,p3]).compute_solution()
+
+        self.assertAlmostEqual(solution[0], Decimal('-1.17720187578'))
+        self.assertAlmostEqual(solution[1], Decimal('0.707150558138'))
+        self.assertAlmostEqual(solution[2], Decimal('-0.0826635849023'))
+
+
+class ClassificationTest(unittest.TestCase):
+
+    def test_classify_and_rank_course_systems(self):
+        no_solutions = LinearSystem([
+            Plane(normal_vector=Vector(['5.862','1.178','-10.366']), constant_term='-8.15'),
+            Plane(normal_vector=Vector(['-2.931','-0.589','5.183']), constant_term='-4.075')])
+        inf_solutions = LinearSystem([
+            Plane(normal_vector=Vector(['8.631','5.112','-1.816']), constant_term='-5.113'),
+            Plane(normal_vector=Vector(['4.315','11.132','-5.27']), constant_term='-6.775'),
+            Plane(normal_vector=Vector(['-2.158','3.01','-1.727']), constant_term='-0.831')])
+        unique_solution = LinearSystem([
+            Plane(normal_vector=Vector(['5.262','2.739','-9.878']), constant_term='-3.441'),
+            Plane(normal_vector=Vector(['5.111','6.358','7.638']), constant_term='-2.152'),
+            Plane(normal_vector=Vector(['2.016','-9.924','-1.367']), constant_term='-9.278')])
+
+        self.assertEqual(no_solutions.classify(), LinearSystem.NO_SOLUTIONS_MSG)
+        self.assertEqual(inf_solutions.classify(), LinearSystem.INF_SOLUTIONS_MSG)
+        self.assertEqual(unique_solution.classify(), LinearSystem.UNIQUE_SOLUTION_MSG)
+        self.assertEqual([no_solutions.rank(), inf_solutions.rank(), unique_solution.rank()], [1, 2, 3])
+
+    def test_zero_row_is_inconsistent_without_elimination(self):
+        s = LinearSystem([Plane(normal_vector=Vector(['1','1','1']), constant_term='1'),
+                          Plane(constant_term='2')])
+        self.assertEqual(s.classify(), LinearSystem.NO_SOLUTIONS_MSG)
+        s[1] = Plane(constant_term='0')
+        self.assertEqual(s.classify(), LinearSystem.INF_SOLUTIONS_MSG)
+        self.assertEqual(s.rank(), 1)
+
+    def test_classification_stops_at_first_inconsistent_row(self):
+        rows = [[Decimal(1), Decimal(1)], [Decimal(2), Decimal(2)], [Decimal(0), Decimal(1)]]
+        constants = [Decimal(1), Decimal(3), Decimal(0)]
+        pivots, inconsistent_row = linsys._forward_eliminate(rows, constants, stop_if_inconsistent=True)
+
+        self.assertEqual(inconsistent_row, 1)
+        # the third row hasn't been touched
+        self.assertEqual(rows[2], [0, 1])
+
+    def test_overdetermined_systems(self):
+        lines = [Line(Vector(['1','0']), '1'), Line(Vector(['0','1']), '2'), Line(Vector(['1','1']), '3')]
+        self.assertEqual(LinearSystem(lines).classify(), LinearSystem.UNIQUE_SOLUTION_MSG)
+        lines[2] = Line(Vector(['1','1']), '4')
+        self.assertEqual(LinearSystem(lines).classify(), LinearSystem.NO_SOLUTIONS_MSG)
+
+
+class ExactSolutionTest(unittest.TestCase):
+
+    def test_exact_unique_solution(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
+        s = LinearSystem([p1,p2,p3])
+
+        self.assertEqual(s.compute_exact_solution(), (Fraction(23,9), Fraction(7,9), Fraction(2,9)))
+        self.assertEqual(s.exact_rank(), 3)
+
+    def test_exact_solution_of_decimal_coefficients(self):
+        p1 = Plane(normal_vector=Vector(['0.1','0.2','0']), constant_term='0.3')
+        p2 = Plane(normal_vector=Vector(['0','0.7','0']), constant_term='0.7')
+        p3 = Plane(normal_vector=Vector(['0','0','3']), constant_term='1')
+        s = LinearSystem([p1,p2,p3])
+
+        self.assertEqual(s.compute_exact_solution(), (Fraction(1), Fraction(1), Fraction(1,3)))
+
+    def test_exact_no_and_infinite_solutions(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['2','2','2']), constant_term='2')
+
+        with self.assertRaises(Exception) as context:
+            LinearSystem([p1,p2]).compute_exact_solution()
+        self.assertEqual(str(context.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+        with self.assertRaises(Exception) as context:
+            LinearSystem([p1,p3]).compute_exact_solution()
+        self.assertEqual(str(context.exception), LinearSystem.INF_SOLUTIONS_MSG)
+        self.assertEqual(LinearSystem([p1,p3]).exact_rank(), 1)
+
+    def test_tiny_coefficients_are_not_treated_as_zero(self):
+        # the Decimal path would call this 1e-12 coefficient zero
+        p1 = Plane(normal_vector=Vector(['1','0','0']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['0','1','0']), constant_term='1')
+        p3 = Plane(normal_vector=Vector(['0','0','1e-12']), constant_term='1e-12')
+
+        self.assertEqual(LinearSystem([p1,p2,p3]).compute_exact_solution(), (1, 1, 1))
+
+
+class FactorizationTest(unittest.TestCase):
+
+    def make_system(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
+        return LinearSystem([p1,p2,p3])
+
+    def test_solve_many_right_hand_sides(self):
+        s = self.make_system()
+
+        solutions = list(s.solve_many([['1','2','3'], ['2','1','-2']]))
+        for x, y in zip(solutions[0], ['23','7','2']):
+            self.assertAlmostEqual(x, Decimal(y)/9)
+        for x, y in zip(solutions[1], [1,1,1]):
+            self.assertAlmostEqual(x, y)
+
+    def test_factorization_is_reused_until_system_changes(self):
+        s = self.make_system()
+
+        f = s.factorize()
+        s.compute_solution()
+        s.solve_for(['1','1','1'])
+        self.assertIs(s.factorize(), f)
+
+        s.swap_rows(0, 1)
+        self.assertIsNot(s.factorize(), f)
+        f = s.factorize()
+
+        s[2] = Plane(normal_vector=Vector(['0','0','1']), constant_term='1')
+        self.assertIsNot(s.factorize(), f)
+        self.assertAlmostEqual(s.compute_solution()[2], 1)
+
+    def test_singular_systems_still_report_solution_type(self):
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['0','0','1']), constant_term='1')
+        s = LinearSystem([p1,p2,p3])
+
+        with self.assertRaises(Exception) as context:
+            s.compute_solution()
+        self.assertEqual(str(context.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+
+class IterativeSolutionTest(unittest.TestCase):
+
+    def test_iterative_solution_warm_start(self):
+        p1 = Plane(normal_vector=Vector(['4','1','0']), constant_term='6')
+        p2 = Plane(normal_vector=Vector(['1','5','2']), constant_term='17')
+        p3 = Plane(normal_vector=Vector(['0','2','6']), constant_term='22')
+        s = LinearSystem([p1,p2,p3])
+
+        result = s.compute_iterative_solution('jacobi')
+        self.assertTrue(result.converged)
+        self.assertTrue(isinstance(result.solution, Vector))
+        for x, y in zip(result.solution, [1,2,3]):
+            self.assertAlmostEqual(x, y)
+
+        s[2] = Plane(normal_vector=Vector(['0','2','6']), constant_term='22.06')
+        warm = s.compute_iterative_solution('conjugate_gradient', initial_guess=result.solution)
+        cold = s.compute_iterative_solution('conjugate_gradient')
+        self.assertTrue(warm.converged)
+        self.assertTrue(warm.residuals[0] < cold.residuals[0])
+        for x, y in zip(warm.solution, s.compute_solution()):
+            self.assertAlmostEqual(x, y)
+
+
+class LeastSquaresTest(unittest.TestCase):
+
+    def test_overdetermined_system(self):
+        # no point lies on all three lines; the least-squares point is (4/3, 7/3)
+        s = LinearSystem([Line(Vector(['1','0']), '1'),
+                          Line(Vector(['0','1']), '2'),
+                          Line(Vector(['1','1']), '4')])
+        solution = s.compute_least_squares_solution()
+        self.assertAlmostEqual(solution[0], Decimal(4)/3)
+        self.assertAlmostEqual(solution[1], Decimal(7)/3)
 
-# p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
-# p2 = Plane(normal_vector=Vector(['0','1','1']), constant_term='2')
-# s = LinearSystem([p1,p2])
-# t = s.compute_triangular_form()
-# if not (t[0] == p1 and
-#         t[1] == p2):
-#     print 'test case 1 failed'
-#
-# p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
-# p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
-# s = LinearSystem([p1,p2])
-# t = s.compute_triangular_form()
-# if not (t[0] == p1 and
-#         t[1] == Plane(constant_term='1')):
-#     print 'test case 2 failed'
-#
-# p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
-# p2 = Plane(normal_vector=Vector(['0','1','0']), constant_term='2')
-# p3 = Plane(normal_vector=Vector(['1','1','-1']), constant_term='3')
-# p4 = Plane(normal_vector=Vector(['1','0','-2']), constant_term='2')
-# s = LinearSystem([p1,p2,p3,p4])
-# t = s.compute_triangular_form()
-# if not (t[0] == p1 and
-#         t[1] == p2 and
-#         t[2] == Plane(normal_vector=Vector(['0','0','-2']), constant_term='2') and
-#         t[3] == Plane()):
-#     print 'test case 3 failed'
-#
-# p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
-# p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
-# p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
-# s = LinearSystem([p1,p2,p3])
-# t = s.compute_triangular_form()
-# if not (t[0] == Plane(normal_vector=Vector(['1','-1','1']), constant_term='2') and
-#         t[1] == Plane(normal_vector=Vector(['0','1','1']), constant_term='1') and
-#         t[2] == Plane(normal_vector=Vector(['0','0','-9']), constant_term='-2')):
-#     print 'test case 4 failed'
+    def test_consistent_and_dependent_systems(self):
+        p1 = Plane(normal_vector=Vector(['0','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','-1','1']), constant_term='2')
+        p3 = Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')
+        s = LinearSystem([p1,p2,p3])
+        for x, y in zip(s.compute_least_squares_solution(), s.compute_solution()):
+            self.assertAlmostEqual(x, y)
 
+        with self.assertRaises(Exception) as context:
+            LinearSystem([p1, p1.scaledBy(2)]).compute_least_squares_solution()
+        self.assertEqual(str(context.exception), LinearSystem.INF_SOLUTIONS_MSG)
 
 
 if __name__ == '__main__':
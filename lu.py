@@ -0,0 +1,74 @@
+# LU factorization w/ partial pivoting: PA = LU, where P is the row
+# permutation picked while pivoting. Factoring costs O(n^3) once; after that
+# each right-hand side is just a forward and a backward substitution, O(n^2).
+# The arithmetic is generic, so it works on Decimals, Fractions or floats -
+# whatever the rows passed in hold.
+class LUFactorization(object):
+
+    NOT_SQUARE_MSG = 'LU factorization needs as many equations as variables'
+    SINGULAR_MATRIX_MSG = 'The coefficient matrix is singular'
+
+    def __init__(self, rows, eps=1e-10):
+        n = len(rows)
+        if any(len(row) != n for row in rows):
+            raise Exception(self.NOT_SQUARE_MSG)
+
+        # L and U share one matrix: U on and above the diagonal, and the
+        # multipliers of the unit lower triangular L below it
+        lu = [list(row) for row in rows]
+        permutation = list(range(n))
+
+        for k in range(n):
+            p = max(range(k, n), key=lambda i: abs(lu[i][k]))
+            if abs(lu[p][k]) < eps:
+                raise Exception(self.SINGULAR_MATRIX_MSG)
+            if p != k:
+                lu[k], lu[p] = lu[p], lu[k]
+                permutation[k], permutation[p] = permutation[p], permutation[k]
+
+            pivot = lu[k]
+            pivot_value = pivot[k]
+            for i in range(k+1, n):
+                row = lu[i]
+                factor = row[k] / pivot_value
+                row[k] = factor
+                if factor:
+                    for j in range(k+1, n):
+                        row[j] -= factor * pivot[j]
+
+        self.lu = lu
+        self.permutation = permutation
+        self.dimension = n
+
+
+    def solve(self, constants):
+        lu = self.lu
+        n = self.dimension
+        if len(constants) != n:
+            raise Exception(self.NOT_SQUARE_MSG)
+
+        # forward substitution w/ the unit lower triangle: Ly = Pb
+        y = [constants[i] for i in self.permutation]
+        for i in range(n):
+            row = lu[i]
+            total = y[i]
+            for j in range(i):
+                total -= row[j] * y[j]
+            y[i] = total
+
+        # backward substitution w/ the upper triangle: Ux = y
+        x = y
+        for i in reversed(range(n)):
+            row = lu[i]
+            total = x[i]
+            for j in range(i+1, n):
+                total -= row[j] * x[j]
+            x[i] = total / row[i]
+
+        return x
+
+    def solve_many(self, constants_iterable):
+        # a generator, so right-hand sides can be streamed in and solutions
+        # streamed out; wrap it in list() to solve a batch
+        for constants in constants_iterable:
+            yield self.solve(constants)
@@ -0,0 +1,48 @@
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from lu import LUFactorization
+
+class FactorizationTest(unittest.TestCase):
+
+    def test_factors_reproduce_permuted_matrix(self):
+        rows = [[Fraction(x) for x in row] for row in [[0,1,1], [1,-1,1], [1,2,-5]]]
+        f = LUFactorization(rows)
+        n = 3
+
+        lower = [[f.lu[i][j] if j < i else (1 if i == j else 0) for j in range(n)] for i in range(n)]
+        upper = [[f.lu[i][j] if j >= i else 0 for j in range(n)] for i in range(n)]
+        product = [[sum(lower[i][k] * upper[k][j] for k in range(n)) for j in range(n)] for i in range(n)]
+
+        self.assertEqual(product, [rows[p] for p in f.permutation])
+
+    def test_singular_and_non_square_matrices_raise(self):
+        with self.assertRaises(Exception) as context:
+            LUFactorization([[1,2], [2,4]])
+        self.assertEqual(str(context.exception), LUFactorization.SINGULAR_MATRIX_MSG)
+
+        with self.assertRaises(Exception) as context:
+            LUFactorization([[1,2]])
+        self.assertEqual(str(context.exception), LUFactorization.NOT_SQUARE_MSG)
+
+
+class SolveTest(unittest.TestCase):
+
+    def test_solve_many_right_hand_sides(self):
+        f = LUFactorization([[Decimal(2), Decimal(1)], [Decimal(1), Decimal(3)]])
+
+        solutions = list(f.solve_many([[Decimal(3), Decimal(4)], [Decimal(5), Decimal(5)]]))
+        self.assertEqual(solutions, [[1, 1], [2, 1]])
+
+    def test_works_with_floats(self):
+        f = LUFactorization([[4.0, 3.0], [6.0, 3.0]])
+
+        x = f.solve([10.0, 12.0])
+        self.assertAlmostEqual(x[0], 1.0)
+        self.assertAlmostEqual(x[1], 2.0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
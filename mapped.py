@@ -0,0 +1,188 @@
+import mmap
+import struct
+import sys
+from array import array
+from decimal import Decimal
+
+from vector import Vector, FloatVector
+from vector_batch import VectorBatch
+from hyperplane import Hyperplane
+from linsys import LinearSystem
+
+
+# A compact binary format for collections of vectors or hyperplanes, laid out
+# so the file can be memory-mapped and used in place:
+#
+#   header        24 bytes: magic b'LAVF', format version (uint16), kind
+#                 (uint16, VECTORS or HYPERPLANES), count (uint64),
+#                 dimension (uint32), 4 bytes of padding
+#   coefficients  count * dimension little-endian float64s, row by row
+#   constants     count float64s (hyperplane files only)
+#
+# Opening a MappedCollection only reads the header; the rows are paged in by
+# the OS as they're touched. row vectors (and the whole collection as a
+# VectorBatch) are zero-copy views of the mapping. Hyperplanes and
+# LinearSystems hold Decimals, so those are built (copied) on request.
+
+MAGIC = b'LAVF'
+VERSION = 1
+VECTORS = 0
+HYPERPLANES = 1
+
+_HEADER = struct.Struct('<4sHHQI4x')
+
+
+def write_vectors(path, vectors):
+    return _write(path, VECTORS, ((v, None) for v in vectors))
+
+
+def write_hyperplanes(path, hyperplanes):
+    return _write(path, HYPERPLANES, ((h.normal_vector, h.constant_term) for h in hyperplanes))
+
+
+def _write(path, kind, rows):
+    # streams the rows out as it goes (only the constant terms are held back,
+    # since they come after all the coefficients), then fills in the header;
+    # returns the number of rows written
+    count = 0
+    dimension = None
+    constants = array('d')
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, 0, 0))
+        for coordinates, constant in rows:
+            coefficients = array('d', [float(x) for x in coordinates])
+            if dimension is None:
+                dimension = len(coefficients)
+            elif len(coefficients) != dimension:
+                raise Exception(VectorBatch.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+            f.write(_little_endian(coefficients))
+            if kind == HYPERPLANES:
+                constants.append(float(constant))
+            count += 1
+
+        f.write(_little_endian(constants))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, count, dimension or 0))
+
+    return count
+
+
+def _little_endian(values):
+    if sys.byteorder != 'little':
+        values = array('d', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class MappedCollection(object):
+
+    NOT_A_MAPPED_FILE_MSG = 'Not a mapped vector/hyperplane file'
+    NOT_HYPERPLANES_MSG = 'This file holds vectors, not hyperplanes'
+    EMPTY_RANGE_MSG = 'A linear system needs at least one hyperplane'
+
+    def __init__(self, path):
+        if sys.byteorder != 'little':
+            raise Exception('Mapped files can only be used in place on little-endian machines')
+
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # (an empty file can't be mapped)
+                raise Exception(self.NOT_A_MAPPED_FILE_MSG)
+
+        try:
+            magic, version, kind, count, dimension = _HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = None
+
+        # the header has to be ours, and the file long enough for the rows it
+        # says are there (a file of rows w/ no coefficients isn't valid either -
+        # there's no way to write one)
+        if (magic != MAGIC or version != VERSION or kind not in (VECTORS, HYPERPLANES) or
+                (count and not dimension) or
+                len(self._map) < _HEADER.size + 8 * count * dimension + (8 * count if kind == HYPERPLANES else 0)):
+            self._map.close()
+            raise Exception(self.NOT_A_MAPPED_FILE_MSG)
+
+        self.kind = kind
+        self.dimension = dimension
+        self._count = count
+
+        view = memoryview(self._map)
+        start = _HEADER.size
+        end = start + 8 * count * dimension
+        self.coefficients = view[start:end].cast('d')
+        if kind == HYPERPLANES:
+            self.constants = view[end:end + 8 * count].cast('d')
+        else:
+            self.constants = None
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __getitem__(self, index):
+        # a zero-copy FloatVector over row index (the normal vector, for a
+        # hyperplane file)
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('row index out of range')
+        d = self.dimension
+        return FloatVector._from_buffer(self.coefficients[index*d:(index+1)*d])
+
+
+    def batch(self):
+        # every row as one zero-copy VectorBatch (which, like any VectorBatch,
+        # can't be empty)
+        if not self._count:
+            raise ValueError('The batch must contain at least one nonempty vector')
+        return VectorBatch._from_buffer(self.coefficients, self.dimension)
+
+
+    def vector(self, index):
+        return Vector(self[index].coordinates)
+
+
+    def hyperplane(self, index):
+        if self.constants is None:
+            raise Exception(self.NOT_HYPERPLANES_MSG)
+        return Hyperplane(self.vector(index), Decimal(self.constants[index]))
+
+
+    def linear_system(self, start=0, stop=None):
+        stop = self._count if stop is None else stop
+        if self.constants is None:
+            raise Exception(self.NOT_HYPERPLANES_MSG)
+        if not len(range(start, stop)):
+            raise Exception(self.EMPTY_RANGE_MSG)
+        return LinearSystem([self.hyperplane(i) for i in range(start, stop)])
+
+
+    def close(self):
+        # views handed out (rows, batches) that are still around keep the
+        # mapping open - closing it then would pull the memory out from under
+        # them. In that case nothing retries by itself: call close() again
+        # once they're gone, or the memory is unmapped when they and this
+        # collection have all been garbage collected. closed says whether
+        # it's actually been closed.
+        self.coefficients.release()
+        if self.constants is not None:
+            self.constants.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+    @property
+    def closed(self):
+        return self._map.closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
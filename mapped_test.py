@@ -0,0 +1,133 @@
+import gc
+import os
+import tempfile
+import unittest
+
+import mapped
+from mapped import MappedCollection
+from vector import Vector, FloatVector
+from hyperplane import Hyperplane
+from plane import Plane
+
+class MappedCollectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_vectors_round_trip(self):
+        path = self.path('vectors.bin')
+        count = mapped.write_vectors(path, (Vector([i, i+0.5, -i]) for i in range(100)))
+
+        self.assertEqual(count, 100)
+        self.assertEqual(os.path.getsize(path), 24 + 100*3*8)
+
+        with MappedCollection(path) as c:
+            self.assertEqual(len(c), 100)
+            self.assertEqual(c.dimension, 3)
+            self.assertEqual(c[7], FloatVector([7, 7.5, -7]))
+            self.assertEqual(c[-1], FloatVector([99, 99.5, -99]))
+            self.assertEqual(c.vector(2), Vector([2, 2.5, -2]))
+            self.assertAlmostEqual(c.batch().magnitude()[1], FloatVector([1, 1.5, -1]).magnitude())
+
+            with self.assertRaises(IndexError):
+                c[100]
+            with self.assertRaises(Exception) as context:
+                c.hyperplane(0)
+            self.assertEqual(str(context.exception), MappedCollection.NOT_HYPERPLANES_MSG)
+
+    def test_rows_are_views_of_the_mapping(self):
+        path = self.path('vectors.bin')
+        mapped.write_vectors(path, [[1, 2], [3, 4]])
+
+        with MappedCollection(path) as c:
+            row = c[1]
+            self.assertTrue(isinstance(row.coordinates, memoryview))
+            self.assertTrue(row.coordinates.readonly)
+            self.assertEqual(row.dot(FloatVector([1, 1])), 7)
+            del row
+
+    def test_hyperplanes_and_linear_system(self):
+        path = self.path('planes.bin')
+        planes = [Plane(Vector(['0','1','1']), '1'),
+                  Plane(Vector(['1','-1','1']), '2'),
+                  Plane(Vector(['1','2','-5']), '3')]
+        mapped.write_hyperplanes(path, planes)
+
+        with MappedCollection(path) as c:
+            self.assertEqual(c.kind, mapped.HYPERPLANES)
+            self.assertTrue(isinstance(c.hyperplane(0), Hyperplane))
+            self.assertTrue(c.hyperplane(1) == planes[1])
+
+            solution = c.linear_system().compute_solution()
+            self.assertAlmostEqual(float(solution[2]), 2/9)
+
+            self.assertEqual(len(c.linear_system(1)), len(planes) - 1)
+            with self.assertRaises(Exception) as context:
+                c.linear_system(2, 2)
+            self.assertEqual(str(context.exception), MappedCollection.EMPTY_RANGE_MSG)
+
+    def test_other_files_are_rejected(self):
+        path = self.path('other.bin')
+        with open(path, 'wb') as f:
+            f.write(b'not a mapped file at all')
+
+        with self.assertRaises(Exception) as context:
+            MappedCollection(path)
+        self.assertEqual(str(context.exception), MappedCollection.NOT_A_MAPPED_FILE_MSG)
+
+    def test_close_with_views_outstanding(self):
+        path = self.path('vectors.bin')
+        mapped.write_vectors(path, [Vector([1,2]), Vector([3,4])])
+
+        c = MappedCollection(path)
+        row, batch = c[1], c.batch()
+        c.close()
+        self.assertFalse(c.closed)
+        self.assertEqual(row, FloatVector([3,4]))
+
+        del row, batch
+        gc.collect()
+        c.close()
+        self.assertTrue(c.closed)
+
+        with MappedCollection(path) as c:
+            self.assertFalse(c.closed)
+        self.assertTrue(c.closed)
+
+    def test_truncated_and_malformed_files_are_rejected(self):
+        path = self.path('planes.bin')
+        mapped.write_hyperplanes(path, [Plane(Vector([1,2,3]), 4), Plane(Vector([5,6,7]), 8)])
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        bad = [data[:-8],                                   # missing a constant term
+               data[:24 + 8*5],                             # missing coefficients
+               b'',
+               mapped._HEADER.pack(mapped.MAGIC, mapped.VERSION, mapped.VECTORS, 3, 0),
+               mapped._HEADER.pack(mapped.MAGIC, mapped.VERSION, 7, 0, 3)]
+        for contents in bad:
+            with open(path, 'wb') as f:
+                f.write(contents)
+            with self.assertRaises(Exception) as context:
+                MappedCollection(path)
+            self.assertEqual(str(context.exception), MappedCollection.NOT_A_MAPPED_FILE_MSG)
+
+    def test_empty_collection(self):
+        path = self.path('empty.bin')
+        self.assertEqual(mapped.write_vectors(path, []), 0)
+
+        with MappedCollection(path) as c:
+            self.assertEqual((len(c), c.dimension), (0, 0))
+            with self.assertRaises(ValueError):
+                c.batch()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+from vector import Vector
+from qr import QRFactorization
+from hyperplane import is_near_zero
+from precision import uses_precision
+
+
+# The solution set of a consistent system, as basepoint + t_1 d_1 + ... +
+# t_k d_k: one direction vector d per free variable (a variable whose column
+# has no pivot in the RREF). Everything comes from the RREF rows, kept as
+# they are - the basepoint sets each pivot variable to its row's constant and
+# the free variables to zero, and direction vector d for free variable f
+# has a one at f and minus the RREF coefficients of f at the pivot
+# variables. The direction vectors aren't stored, just built on demand by
+# direction_vectors().
+#
+# Membership and distance only need the RREF rows, not the direction vectors:
+# a point is in the set if it satisfies every pivot row, and its distance to
+# the set is the length of the part of (point - basepoint) that lies in the
+# row space, since the row space is orthogonal to every direction vector.
+# The orthonormal basis of the row space for that is computed (by QR) the
+# first time it's needed.
+class Parametrization(object):
+
+    POINT_MUST_BE_IN_SAME_DIM_MSG = 'The point should live in the same dimension as the solution set'
+
+    def __init__(self, rows, constants, pivots, dimension, precision=None):
+        # rows/constants are the nonzero rows of the RREF and pivots their
+        # pivot columns
+        self.rows = rows
+        self.constants = constants
+        self.pivots = pivots
+        self.dimension = dimension
+        self.precision = precision
+
+        pivot_set = set(pivots)
+        self.free_variables = [j for j in range(dimension) if j not in pivot_set]
+
+        basepoint = [Decimal('0')] * dimension
+        for c, j in zip(constants, pivots):
+            basepoint[j] = c
+        self.basepoint = Vector._from_decimals(tuple(basepoint), precision)
+
+        self._row_space = None
+
+
+    def __len__(self):
+        # the number of direction vectors (free parameters)
+        return len(self.free_variables)
+
+
+    def direction_vectors(self):
+        for f in self.free_variables:
+            d = [Decimal('0')] * self.dimension
+            d[f] = Decimal('1')
+            for row, j in zip(self.rows, self.pivots):
+                d[j] = row[f].copy_negate()
+            yield Vector._from_decimals(tuple(d), self.precision)
+
+
+    @uses_precision
+    def __contains__(self, point):
+        x = self._coordinates(point)
+        for row, c in zip(self.rows, self.constants):
+            if not is_near_zero(sum([a*b for (a, b) in zip(row, x)]) - c):
+                return False
+        return True
+
+
+    @uses_precision
+    def distance_to(self, point):
+        x = self._coordinates(point)
+        offset = [a - b for (a, b) in zip(x, self.basepoint.coordinates)]
+        if self._row_space is None:
+            self._row_space = QRFactorization(self.rows).q
+        return sum([sum([a*b for (a, b) in zip(q, offset)]) ** 2 for q in self._row_space],
+                   Decimal('0')).sqrt()
+
+
+    def _coordinates(self, point):
+        coordinates = point.coordinates if hasattr(point, 'coordinates') else [Decimal(x) for x in point]
+        if len(coordinates) != self.dimension:
+            raise Exception(self.POINT_MUST_BE_IN_SAME_DIM_MSG)
+        return coordinates
+
+
+    def __str__(self):
+        directions = list(self.direction_vectors())
+        output = ''
+        for i in range(self.dimension):
+            terms = [str(round(self.basepoint[i], 3))]
+            terms += ['{} t_{}'.format(round(d[i], 3), k+1) for (k, d) in enumerate(directions)
+                      if not is_near_zero(d[i])]
+            output += 'x_{} = {}\n'.format(i+1, ' + '.join(terms))
+        return output
@@ -0,0 +1,79 @@
+import unittest
+from decimal import Decimal
+
+from linsys import LinearSystem
+from parametrization import Parametrization
+from plane import Plane
+from vector import Vector
+
+
+class ParametrizationTest(unittest.TestCase):
+    # the two- and one-parameter systems come from the course's
+    # parametrization quiz
+
+    def test_line_of_solutions(self):
+        s = LinearSystem([Plane(Vector(['0.786','0.786','0.588']), '-0.714'),
+                          Plane(Vector(['-0.131','-0.131','0.244']), '0.319')])
+        p = s.compute_parametrization()
+
+        self.assertEqual(len(p), 1)
+        self.assertEqual(p.free_variables, [1])
+        for x, y in zip(p.basepoint, ['-1.346', '0', '0.585']):
+            self.assertAlmostEqual(x, Decimal(y), places=3)
+        [d] = list(p.direction_vectors())
+        for x, y in zip(d, [-1, 1, 0]):
+            self.assertAlmostEqual(x, y)
+
+    def test_plane_of_solutions(self):
+        s = LinearSystem([Plane(Vector(['8.631','5.112','-1.816']), '-5.113'),
+                          Plane(Vector(['4.315','11.132','-5.27']), '-6.775'),
+                          Plane(Vector(['-2.158','3.01','-1.727']), '-0.831')])
+        p = s.compute_parametrization()
+
+        self.assertEqual(len(p), 1)
+        for d in p.direction_vectors():
+            for plane in s:
+                self.assertTrue(plane.normal_vector.orthogonalTo(d))
+
+    def test_direction_vectors_are_lazy(self):
+        s = LinearSystem([Plane(Vector(['1','1','1']), '1')])
+        p = s.compute_parametrization()
+        directions = p.direction_vectors()
+
+        self.assertEqual(next(directions), Vector(['-1', '1', '0']))
+        self.assertEqual(next(directions), Vector(['-1', '0', '1']))
+        with self.assertRaises(StopIteration):
+            next(directions)
+
+    def test_membership_and_distance(self):
+        # the plane x + y + z = 3
+        p = LinearSystem([Plane(Vector(['1','1','1']), '3')]).compute_parametrization()
+
+        self.assertTrue(Vector(['1','1','1']) in p)
+        self.assertTrue([3, 0, 0] in p)
+        self.assertFalse([1, 1, 2] in p)
+
+        self.assertAlmostEqual(p.distance_to([1, 1, 1]), 0)
+        self.assertAlmostEqual(p.distance_to([0, 0, 0]), Decimal(3).sqrt())
+        self.assertAlmostEqual(p.distance_to(Vector(['2','2','2'])), Decimal(3).sqrt())
+
+        with self.assertRaises(Exception) as cm:
+            p.distance_to([1, 1])
+        self.assertEqual(str(cm.exception), Parametrization.POINT_MUST_BE_IN_SAME_DIM_MSG)
+
+    def test_unique_and_no_solutions(self):
+        p1 = Plane(Vector(['0','1','1']), '1')
+        p2 = Plane(Vector(['1','-1','1']), '2')
+        p3 = Plane(Vector(['1','2','-5']), '3')
+        p = LinearSystem([p1,p2,p3]).compute_parametrization()
+        self.assertEqual(len(p), 0)
+        self.assertEqual(list(p.direction_vectors()), [])
+        self.assertTrue(p.basepoint in p)
+
+        with self.assertRaises(Exception) as cm:
+            LinearSystem([p1, Plane(Vector(['0','1','1']), '2')]).compute_parametrization()
+        self.assertEqual(str(cm.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+
+if __name__ == '__main__':
+    unittest.main()
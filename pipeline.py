@@ -0,0 +1,182 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from vector import Vector
+from hyperplane import Hyperplane
+from linsys import LinearSystem
+from precision import precision_context, DEFAULT_PRECISION
+
+
+# A streaming solver: systems are read lazily from JSONL or CSV, solved, and
+# written out one result at a time, so memory use doesn't depend on the size
+# of the input. Each stage is a generator, so they can also be used (and
+# combined differently) from code:
+#
+#   with open('systems.jsonl') as f:
+#       for line in format_results(solve_systems(read_systems(f))):
+#           ...
+#
+# or from the command line:
+#
+#   python -m pipeline systems.jsonl -o solutions.jsonl
+#
+# Input formats. JSONL: one system per line, as {"id": ..., "equations":
+# [[a_1, ..., a_n, k], ...]}, where each equation lists its coefficients
+# followed by its constant term (numbers may also be given as strings; the id
+# is optional and defaults to the line number). CSV: one equation per row, as
+# id,a_1,...,a_n,k; consecutive rows w/ the same id make up one system.
+#
+# Output is JSONL: {"id": ..., "solution": ["x_1", ..., "x_n"]} (as strings,
+# so no precision is lost), or {"id": ..., "error": "..."} for systems w/o a
+# unique solution or that couldn't be parsed.
+
+SystemResult = namedtuple('SystemResult', ['id', 'solution', 'error', 'latency'])
+Summary = namedtuple('Summary', ['count', 'errors', 'elapsed', 'throughput', 'mean_latency', 'max_latency'])
+
+
+def system_from_equations(equations):
+    planes = [Hyperplane(Vector([Decimal(x) for x in equation[:-1]]), Decimal(equation[-1]))
+              for equation in equations]
+    return LinearSystem(planes)
+
+
+def read_systems(lines, format='jsonl'):
+    # yields (id, LinearSystem) - or (id, error message) for input that
+    # couldn't be parsed, so one bad record doesn't end the run
+    if format == 'jsonl':
+        return _read_jsonl(lines)
+    elif format == 'csv':
+        return _read_csv(lines)
+    raise ValueError('Unknown input format: {}'.format(format))
+
+
+def _read_jsonl(lines):
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        system_id = line_number
+        try:
+            record = json.loads(line, parse_float=Decimal)
+            system_id = record.get('id', line_number)
+            yield system_id, system_from_equations(record['equations'])
+        except Exception as e:
+            yield system_id, 'Could not parse system: {}'.format(e)
+
+
+def _read_csv(lines):
+    current_id = None
+    equations = []
+    for row in csv.reader(lines):
+        if not row or row[0].startswith('#'):
+            continue
+        if row[0] != current_id and equations:
+            yield _parsed(current_id, equations)
+            equations = []
+        current_id = row[0]
+        equations.append(row[1:])
+    if equations:
+        yield _parsed(current_id, equations)
+
+
+def _parsed(system_id, equations):
+    try:
+        return system_id, system_from_equations(equations)
+    except Exception as e:
+        return system_id, 'Could not parse system: {}'.format(e)
+
+
+def solve_systems(systems, exact=False):
+    # yields a SystemResult per (id, system), timing each solve
+    for system_id, system in systems:
+        start = time.perf_counter()
+        if isinstance(system, str):
+            solution, error = None, system
+        else:
+            try:
+                if exact:
+                    solution = system.compute_exact_solution()
+                else:
+                    solution = system.compute_solution()
+                error = None
+            except Exception as e:
+                solution, error = None, str(e)
+        yield SystemResult(system_id, solution, error, time.perf_counter() - start)
+
+
+def format_results(results):
+    # yields one JSON line per result
+    for result in results:
+        if result.error is None:
+            record = {'id': result.id, 'solution': [str(x) for x in result.solution]}
+        else:
+            record = {'id': result.id, 'error': result.error}
+        yield json.dumps(record) + '\n'
+
+
+def run(input_file, output_file, format='jsonl', exact=False):
+    # runs the whole pipeline, writing each result as soon as it's ready, and
+    # returns a Summary; only running totals are kept, so memory stays
+    # constant however many systems there are
+    count = errors = 0
+    total_latency = max_latency = 0.0
+    start = time.perf_counter()
+
+    for result in solve_systems(read_systems(input_file, format), exact=exact):
+        output_file.writelines(format_results([result]))
+        count += 1
+        if result.error is not None:
+            errors += 1
+        total_latency += result.latency
+        max_latency = max(max_latency, result.latency)
+
+    elapsed = time.perf_counter() - start
+    return Summary(count, errors, elapsed,
+                   count / elapsed if elapsed else 0.0,
+                   total_latency / count if count else 0.0,
+                   max_latency)
+
+
+def format_summary(summary):
+    return ('{} systems ({} without a unique solution) in {:.3f}s: {:.1f} systems/s, '
+            'latency mean {:.3f}ms, max {:.3f}ms'.format(
+                summary.count, summary.errors, summary.elapsed, summary.throughput,
+                summary.mean_latency * 1000, summary.max_latency * 1000))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pipeline',
+                                     description='Solve a stream of linear systems.')
+    parser.add_argument('input', help="JSONL or CSV file of systems, or '-' for stdin")
+    parser.add_argument('-o', '--output', default='-', help="where to write results (default: stdout)")
+    parser.add_argument('-f', '--format', choices=['jsonl', 'csv'],
+                        help='input format (default: from the file extension, else jsonl)')
+    parser.add_argument('--exact', action='store_true',
+                        help='solve exactly w/ fraction-free elimination')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help='significant digits for Decimal solves (default {})'.format(DEFAULT_PRECISION))
+    args = parser.parse_args(argv)
+
+    format = args.format or ('csv' if args.input.endswith('.csv') else 'jsonl')
+
+    input_file = sys.stdin if args.input == '-' else open(args.input, newline='')
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        with precision_context(args.precision):
+            summary = run(input_file, output_file, format=format, exact=args.exact)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+    print(format_summary(summary), file=sys.stderr)
+    return summary
+
+
+if __name__ == '__main__':
+    main()
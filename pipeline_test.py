@@ -0,0 +1,92 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+
+import pipeline
+from linsys import LinearSystem
+
+JSONL_INPUT = '''{"id": "unique", "equations": [[0, 1, 1, 1], [1, -1, 1, 2], [1, 2, -5, 3]]}
+{"id": "none", "equations": [[1, 1, 1], [1, 1, 2]]}
+
+{"equations": [["0.5", "0", "1"], ["0", "0.25", "1"]]}
+not json
+'''
+
+CSV_INPUT = '''a,1,0,2
+a,0,1,3
+b,1,1,1
+b,2,2,2
+'''
+
+class ReadSystemsTest(unittest.TestCase):
+
+    def test_read_jsonl(self):
+        systems = list(pipeline.read_systems(io.StringIO(JSONL_INPUT)))
+
+        self.assertEqual([system_id for (system_id, s) in systems], ['unique', 'none', 4, 5])
+        self.assertEqual(systems[0][1].dimension, 3)
+        self.assertEqual(systems[2][1][0].normal_vector[0], Decimal('0.5'))
+        self.assertTrue(systems[3][1].startswith('Could not parse system'))
+
+    def test_read_csv_groups_consecutive_rows(self):
+        systems = list(pipeline.read_systems(io.StringIO(CSV_INPUT), format='csv'))
+
+        self.assertEqual([(system_id, len(s)) for (system_id, s) in systems], [('a', 2), ('b', 2)])
+
+    def test_reading_is_lazy(self):
+        def lines():
+            yield '{"equations": [[1, 1]]}\n'
+            raise AssertionError('read too far')
+
+        system_id, system = next(pipeline.read_systems(lines()))
+        self.assertEqual(system_id, 1)
+
+
+class RunTest(unittest.TestCase):
+
+    def test_results_are_written_in_order(self):
+        output = io.StringIO()
+        summary = pipeline.run(io.StringIO(JSONL_INPUT), output)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r['id'] for r in records], ['unique', 'none', 4, 5])
+        self.assertAlmostEqual(Decimal(records[0]['solution'][0]), Decimal(23)/9)
+        self.assertEqual(records[1]['error'], LinearSystem.NO_SOLUTIONS_MSG)
+        self.assertEqual(records[2]['solution'], ['2', '4'])
+
+        self.assertEqual(summary.count, 4)
+        self.assertEqual(summary.errors, 2)
+        self.assertTrue(summary.max_latency >= summary.mean_latency)
+        self.assertTrue('4 systems' in pipeline.format_summary(summary))
+
+    def test_exact(self):
+        output = io.StringIO()
+        pipeline.run(io.StringIO(CSV_INPUT), output, format='csv', exact=True)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(records[0]['solution'], ['2', '3'])
+        self.assertEqual(records[1]['error'], LinearSystem.INF_SOLUTIONS_MSG)
+
+    def test_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'systems.csv')
+            with open(path, 'w') as f:
+                f.write(CSV_INPUT)
+
+            completed = subprocess.run([sys.executable, '-m', 'pipeline', path],
+                                       capture_output=True, text=True,
+                                       cwd=os.path.dirname(os.path.abspath(pipeline.__file__)))
+
+        self.assertEqual(completed.returncode, 0)
+        self.assertEqual(len(completed.stdout.splitlines()), 2)
+        self.assertTrue('systems/s' in completed.stderr)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,132 +1,12 @@
-from decimal import Decimal, getcontext
-
 from vector import Vector
+from hyperplane import Hyperplane
 
-getcontext().prec = 30
-
-
-class Plane(object):
-
-    NO_NONZERO_ELTS_FOUND_MSG = 'No nonzero elements found'
-
-    def __init__(self, normal_vector=None, constant_term=None):
-        self.dimension = 3
-
-        if not normal_vector:
-            all_zeros = ['0']*self.dimension
-            normal_vector = Vector(all_zeros)
-        self.normal_vector = normal_vector
-
-        if not constant_term:
-            constant_term = Decimal('0')
-        self.constant_term = Decimal(constant_term)
-
-        self.set_basepoint()
-
-
-    def set_basepoint(self):
-        try:
-            n = self.normal_vector
-            c = self.constant_term
-            basepoint_coords = ['0']*self.dimension
-
-            initial_index = Plane.first_nonzero_index(n)
-            initial_coefficient = n[initial_index]
-
-            basepoint_coords[initial_index] = c/initial_coefficient
-            self.basepoint = Vector(basepoint_coords)
-
-        except Exception as e:
-            if str(e) == Plane.NO_NONZERO_ELTS_FOUND_MSG:
-                self.basepoint = None
-            else:
-                raise e
-
-
-    def __str__(self):
-
-        num_decimal_places = 3
-
-        def write_coefficient(coefficient, is_initial_term=False):
-            coefficient = round(coefficient, num_decimal_places)
-            if coefficient % 1 == 0:
-                coefficient = int(coefficient)
-
-            output = ''
-
-            if coefficient < 0:
-                output += '-'
-            if coefficient > 0 and not is_initial_term:
-                output += '+'
-
-            if not is_initial_term:
-                output += ' '
-
-            if abs(coefficient) != 1:
-                output += '{}'.format(abs(coefficient))
-
-            return output
-
-        n = self.normal_vector
-
-        try:
-            initial_index = Plane.first_nonzero_index(n)
-            terms = [write_coefficient(n[i], is_initial_term=(i==initial_index)) + 'x_{}'.format(i+1)
-                     for i in range(self.dimension) if round(n[i], num_decimal_places) != 0]
-            output = ' '.join(terms)
-
-        except Exception as e:
-            if str(e) == self.NO_NONZERO_ELTS_FOUND_MSG:
-                output = '0'
-            else:
-                raise e
-
-        constant = round(self.constant_term, num_decimal_places)
-        if constant % 1 == 0:
-            constant = int(constant)
-        output += ' = {}'.format(constant)
-
-        return output
-
-    def parallelTo(self, p):
-        return self.normal_vector.parallelTo(p.normal_vector)
-
-    def coincidentTo(self, p):
-        # TODO if applicable to plans (?) - include logic to handle when normal vector is zero - 1:40 in 'coding functions for lines - solution'
-
-        # first, coincident planes - equal planes - have to be parallel
-        if not self.parallelTo(p):
-            return False
-
-        v_joining_planes = self.basepoint - p.basepoint
-
-        return (v_joining_planes.orthogonalTo(self.normal_vector.normalized()))
-
-    def __eq__(self, l):
-        return self.coincidentTo(l)
-
-    def scaledBy(self, coefficient):
-        new_normal_vector = self.normal_vector * coefficient
-        new_constant_term = self.constant_term * coefficient
-        return Plane(new_normal_vector, new_constant_term)
-
-    def add(self, plane):
-        new_normal_vector = self.normal_vector + plane.normal_vector
-        new_constant_term = self.constant_term + plane.constant_term
-        return Plane(new_normal_vector, new_constant_term)
-
-
-    @staticmethod
-    def first_nonzero_index(iterable):
-        for k, item in enumerate(iterable):
-            if not MyDecimal(item).is_near_zero():
-                return k
-        raise Exception(Plane.NO_NONZERO_ELTS_FOUND_MSG)
 
+# Plane is a hyperplane in 3 dimensions; everything it does is inherited from
+# Hyperplane.
+class Plane(Hyperplane):
 
-class MyDecimal(Decimal):
-    def is_near_zero(self, eps=1e-10):
-        return abs(self) < eps
+    DIMENSION = 3
 
 
 if __name__ == '__main__':
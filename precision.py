@@ -0,0 +1,71 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import getcontext, localcontext
+
+
+# Decimal precision, per object and per call instead of process-wide.
+#
+# Vector, Hyperplane (Line, Plane), LinearSystem and SparseLinearSystem each
+# take an optional precision (number of significant digits). Their methods
+# are wrapped w/ uses_precision, which runs the method inside a local decimal
+# context set to that precision - decimal contexts are per thread, so
+# different precisions can be used at the same time on different threads.
+# (Vector's elementwise arithmetic isn't wrapped, since switching precision
+# would cost more than the arithmetic does; it just uses the current decimal
+# context.)
+#
+# An object w/o its own precision uses the precision of whatever it's being
+# called from: a LinearSystem w/ precision 50 does all the Vector and Plane
+# math inside its solve at 50 digits. Called from outside any such method,
+# they use DEFAULT_PRECISION. A precision can also be set for a block of
+# code w/ precision_context:
+#
+#   with precision_context(12):
+#       solution = system.compute_solution()
+
+DEFAULT_PRECISION = 30
+
+_active_precision = ContextVar('active_precision', default=None)
+
+
+def current_precision():
+    active = _active_precision.get()
+    return DEFAULT_PRECISION if active is None else active
+
+
+@contextmanager
+def precision_context(precision):
+    token = _active_precision.set(precision)
+    try:
+        with localcontext() as context:
+            context.prec = precision
+            yield context
+    finally:
+        _active_precision.reset(token)
+
+
+def uses_precision(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        precision = self.precision
+        active = _active_precision.get()
+        if precision is None:
+            if active is not None:
+                return method(self, *args, **kwargs)
+            precision = DEFAULT_PRECISION
+        elif precision == active:
+            return method(self, *args, **kwargs)
+
+        if getcontext().prec != precision:
+            with precision_context(precision):
+                return method(self, *args, **kwargs)
+
+        # decimal's context is already at this precision, so there's no need
+        # for a new one - nested calls just need to know which precision it is
+        token = _active_precision.set(precision)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _active_precision.reset(token)
+    return wrapper
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from decimal import Decimal, getcontext, localcontext
+
+from precision import precision_context, current_precision, DEFAULT_PRECISION
+from vector import Vector
+from line import Line
+from plane import Plane
+from linsys import LinearSystem
+
+def digits(x):
+    return len(x.as_tuple().digits)
+
+
+class DefaultPrecisionTest(unittest.TestCase):
+
+    def test_importing_does_not_change_global_precision(self):
+        self.assertEqual(getcontext().prec, 28)
+
+    def test_default_precision(self):
+        self.assertEqual(current_precision(), DEFAULT_PRECISION)
+        self.assertEqual(digits(Vector([2]).normalized()[0] / 3), 28)
+        self.assertEqual(digits(Vector([1,1]).magnitude()), DEFAULT_PRECISION)
+
+
+class InstancePrecisionTest(unittest.TestCase):
+
+    def test_vector_precision(self):
+        v = Vector([1,1], precision=10)
+
+        self.assertEqual(digits(v.magnitude()), 10)
+        self.assertEqual((v * 3).precision, 10)
+        self.assertEqual(digits(Vector([1,1], precision=50).magnitude()), 50)
+
+    def test_line_and_plane_precision(self):
+        l1 = Line(Vector([1,2]), 1, precision=8)
+        l2 = Line(Vector([3,-1]), 1, precision=8)
+        x, y = l1.intersectionWith(l2)
+
+        self.assertEqual(digits(x), 8)
+        self.assertEqual(Plane(Vector([3,1,1]), 1, precision=8).scaledBy(2).precision, 8)
+
+    def test_linear_system_precision_applies_to_its_planes(self):
+        planes = [Plane(Vector(['3','1','0']), '1'),
+                  Plane(Vector(['0','3','1']), '1'),
+                  Plane(Vector(['1','0','3']), '1')]
+
+        low = LinearSystem(planes, precision=6).compute_solution()
+        high = LinearSystem(planes, precision=40).compute_solution()
+
+        self.assertEqual(digits(low[0]), 6)
+        self.assertEqual(digits(high[0]), 40)
+        self.assertAlmostEqual(low[0], high[0], places=5)
+
+    def test_precision_context(self):
+        with precision_context(12):
+            self.assertEqual(current_precision(), 12)
+            self.assertEqual(digits(Vector([1,1]).magnitude()), 12)
+        self.assertEqual(current_precision(), DEFAULT_PRECISION)
+
+    def test_decimal_context_already_at_precision(self):
+        with localcontext() as context:
+            context.prec = 12
+            v = Vector([1,1], precision=12)
+            self.assertEqual(digits(v.magnitude()), 12)
+            self.assertEqual(digits(Vector([3]).normalized()[0] / 7), 12)
+            # elementwise arithmetic is done at the current decimal context's
+            self.assertEqual(str((Vector(['1.00000000000001']) * 3)[0]), '3.00000000000')
+            self.assertEqual(getcontext().prec, 12)
+        self.assertEqual(current_precision(), DEFAULT_PRECISION)
+
+    def test_cached_values_are_per_precision(self):
+        v = Vector([1,1])
+        with precision_context(5):
+            self.assertEqual(v.magnitude(), Decimal('1.4142'))
+            self.assertEqual(digits(v.normalized()[0]), 5)
+        self.assertEqual(digits(v.magnitude()), DEFAULT_PRECISION)
+        self.assertEqual(digits(v.normalized()[0]), DEFAULT_PRECISION)
+        with precision_context(5):
+            self.assertEqual(v.magnitude(), Decimal('1.4142'))
+
+
+class ThreadTest(unittest.TestCase):
+
+    def test_precisions_do_not_interfere_across_threads(self):
+        results = {}
+        barrier = threading.Barrier(2)
+
+        def solve(precision):
+            planes = [Plane(Vector(['3','1','0']), '1'),
+                      Plane(Vector(['0','3','1']), '1'),
+                      Plane(Vector(['1','0','3']), '1')]
+            s = LinearSystem(planes, precision=precision)
+            barrier.wait()
+            results[precision] = [digits(s.compute_solution()[0]) for _ in range(50)]
+
+        threads = [threading.Thread(target=solve, args=(p,)) for p in (7, 45)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(set(results[7]), {7})
+        self.assertEqual(set(results[45]), {45})
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import math
+from array import array
+from decimal import Decimal
+
+from vector import Vector, FloatVector
+from vector_batch import VectorBatch
+from precision import precision_context, current_precision
+
+
+# QR factorization by modified Gram-Schmidt: for vectors a_1..a_k, finds
+# orthonormal q's and an upper triangular R w/ a_j = sum_i R[i][j] q_i.
+#
+# Orthogonalizing a set of vectors one pair at a time w/
+# Vector.componentOrthogonalTo renormalizes the same basis vector over and
+# over and builds several intermediate Vectors per pair. Here every vector is
+# normalized once, as soon as it's finished, and then removed from all the
+# vectors still to come in a single pass over plain lists - the 'modified'
+# ordering, which is also much less sensitive to rounding than classical
+# Gram-Schmidt.
+#
+# A vector that's (nearly) a combination of the ones before it leaves almost
+# nothing once they're removed - less than eps times its original length.
+# It's skipped: it gets no q, and its R diagonal is zero. So q holds an
+# orthonormal basis of the span, rank is its size, and columns lists which of
+# the input vectors the basis came from.
+#
+# Like lu.py, the arithmetic is generic (Decimals or floats - square roots are
+# taken w/ Decimal.sqrt or math.sqrt to match).
+class QRFactorization(object):
+
+    RANK_DEFICIENT_MSG = 'The vectors are linearly dependent'
+    WRONG_LENGTH_MSG = 'Right-hand side must have one entry per vector coordinate'
+
+    def __init__(self, vectors, eps=1e-10):
+        remaining = [list(v.coordinates if hasattr(v, 'coordinates') else v) for v in vectors]
+        k = len(remaining)
+        lengths = [_sqrt(_dot(v, v)) for v in remaining]
+
+        r = [[0] * k for _ in range(k)]
+        q = []
+        columns = []
+
+        for j in range(k):
+            v = remaining[j]
+            norm = _sqrt(_dot(v, v))
+            if norm == 0 or norm < type(norm)(eps) * lengths[j]:
+                continue
+
+            v = [x / norm for x in v]
+            r[j][j] = norm
+            q.append(v)
+            columns.append(j)
+
+            for l in range(j+1, k):
+                w = remaining[l]
+                c = _dot(v, w)
+                r[j][l] = c
+                if c:
+                    remaining[l] = [a - c*b for (a, b) in zip(w, v)]
+
+        self.q = q
+        self.r = r
+        self.columns = columns
+        self.rank = len(q)
+        self.size = k
+
+
+    def solve(self, constants):
+        # the least-squares solution x of sum_j x_j a_j = constants - exact if
+        # constants is in the span of the vectors, otherwise the x whose
+        # combination is closest to it. Only defined when the vectors are
+        # independent.
+        if self.rank < self.size:
+            raise Exception(self.RANK_DEFICIENT_MSG)
+        if self.q and len(constants) != len(self.q[0]):
+            raise Exception(self.WRONG_LENGTH_MSG)
+
+        # R x = Q^T b, by backward substitution
+        r = self.r
+        x = [_dot(q, constants) for q in self.q]
+        for i in reversed(range(self.size)):
+            row = r[i]
+            total = x[i]
+            for j in range(i+1, self.size):
+                total -= row[j] * x[j]
+            x[i] = total / row[i]
+        return x
+
+
+def orthonormal_basis(vectors, eps=1e-10):
+    # an orthonormal basis for the span of vectors, in the same form they
+    # came in: a VectorBatch for a VectorBatch, otherwise a list of Vectors
+    # (or FloatVectors)
+    if isinstance(vectors, VectorBatch):
+        factorization = QRFactorization([row.tolist() for row in vectors.rows()], eps)
+        buffer = array('d')
+        for q in factorization.q:
+            buffer.extend(q)
+        return VectorBatch._from_buffer(buffer, vectors.dimension)
+
+    vectors = list(vectors)
+    if not vectors:
+        return []
+    if isinstance(vectors[0], FloatVector):
+        return [FloatVector(q) for q in QRFactorization(vectors, eps).q]
+
+    precision = vectors[0].precision
+    with precision_context(precision if precision is not None else current_precision()):
+        factorization = QRFactorization(vectors, eps)
+    return [Vector._from_decimals(tuple(q), precision) for q in factorization.q]
+
+
+def _dot(u, v):
+    total = 0
+    for a, b in zip(u, v):
+        total += a * b
+    return total
+
+
+def _sqrt(x):
+    return x.sqrt() if isinstance(x, Decimal) else math.sqrt(x)
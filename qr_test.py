@@ -0,0 +1,74 @@
+import unittest
+
+import qr
+from qr import QRFactorization
+from vector import Vector, FloatVector
+from vector_batch import VectorBatch
+
+
+class QRFactorizationTest(unittest.TestCase):
+
+    def test_q_is_orthonormal_and_qr_gives_back_the_vectors(self):
+        vectors = [[1.0, 1.0, 0.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0]]
+        f = QRFactorization(vectors)
+
+        self.assertEqual(f.rank, 3)
+        for i, qi in enumerate(f.q):
+            for j, qj in enumerate(f.q):
+                self.assertAlmostEqual(sum(a*b for a, b in zip(qi, qj)), 1.0 if i == j else 0.0)
+
+        for j, v in enumerate(vectors):
+            rebuilt = [sum(f.r[i][j] * f.q[i][d] for i in range(j+1)) for d in range(3)]
+            for x, y in zip(rebuilt, v):
+                self.assertAlmostEqual(x, y)
+
+    def test_dependent_vectors_are_skipped(self):
+        f = QRFactorization([[1, 2, 3], [2, 4, 6], [0, 1, 0]])
+        self.assertEqual(f.rank, 2)
+        self.assertEqual(f.columns, [0, 2])
+        self.assertEqual(f.r[1][1], 0)
+
+        with self.assertRaises(Exception) as cm:
+            f.solve([1, 1, 1])
+        self.assertEqual(str(cm.exception), QRFactorization.RANK_DEFICIENT_MSG)
+
+    def test_least_squares(self):
+        # fitting y = a + bx to (0, 1), (1, 3), (2, 4): a = 7/6, b = 3/2
+        f = QRFactorization([[1.0, 1.0, 1.0], [0.0, 1.0, 2.0]])
+        a, b = f.solve([1.0, 3.0, 4.0])
+        self.assertAlmostEqual(a, 7/6)
+        self.assertAlmostEqual(b, 1.5)
+
+
+class OrthonormalBasisTest(unittest.TestCase):
+
+    def test_matches_pairwise_gram_schmidt(self):
+        v1, v2 = Vector(['3', '1']), Vector(['2', '2'])
+        basis = qr.orthonormal_basis([v1, v2])
+
+        self.assertTrue(isinstance(basis[0], Vector))
+        expected = [v1.normalized(), v2.componentOrthogonalTo(v1).normalized()]
+        for q, e in zip(basis, expected):
+            for x, y in zip(q.coordinates, e.coordinates):
+                self.assertAlmostEqual(x, y)
+
+    def test_keeps_precision(self):
+        basis = qr.orthonormal_basis([Vector(['1', '2'], precision=50)])
+        self.assertEqual(basis[0].precision, 50)
+        # 2/sqrt(5), to 50 digits rather than the default 30
+        self.assertEqual(len(basis[0][1].as_tuple().digits), 50)
+
+    def test_float_vectors_and_batches(self):
+        vectors = [[1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [2.0, 1.0, 0.0], [0.0, 0.0, 3.0]]
+
+        basis = qr.orthonormal_basis([FloatVector(v) for v in vectors])
+        self.assertEqual(basis, [FloatVector([1, 0, 0]), FloatVector([0, 1, 0]), FloatVector([0, 0, 1])])
+
+        batch = qr.orthonormal_basis(VectorBatch(vectors))
+        self.assertTrue(isinstance(batch, VectorBatch))
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch[2], FloatVector([0, 0, 1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
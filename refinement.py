@@ -0,0 +1,74 @@
+import math
+from collections import namedtuple
+from decimal import Decimal
+
+from lu import LUFactorization
+
+
+# Mixed-precision iterative refinement: the O(n^3) work - factoring - is done
+# once, in floats, and only the O(n^2) residuals are done in Decimal. From
+# the float solution x, each step computes the residual r = b - Ax in
+# Decimal, against the original coefficients, solves A d = r w/ the float
+# factorization, and corrects x += d. Each step gains roughly as many digits
+# as the float solve gets right, so for a reasonably well-conditioned system
+# a few steps reach full Decimal accuracy.
+#
+# residual is max |b_i - (Ax)_i| relative to the largest of the |b_i| and
+# the |(Ax)_i| terms, so the tolerance doesn't depend on the scale of the
+# system. refine returns None if it can't get there: the float matrix is
+# singular, the residual stops shrinking (the system is too ill-conditioned
+# for floats), or max_iterations runs out.
+
+RefinementResult = namedtuple('RefinementResult', ['solution', 'path', 'iterations', 'residual'])
+
+REFINED = 'refined'
+DECIMAL = 'decimal'
+
+
+def refine(rows, constants, tolerance, max_iterations=10):
+    # rows/constants are Decimals; returns (solution, iterations, residual)
+    # or None
+    try:
+        factorization = LUFactorization([[float(a) for a in row] for row in rows])
+        x = _to_decimals(factorization.solve([float(c) for c in constants]))
+    except Exception as e:
+        if str(e) in (LUFactorization.SINGULAR_MATRIX_MSG, LUFactorization.NOT_SQUARE_MSG):
+            return None
+        raise e
+    if x is None:
+        return None
+
+    previous = None
+    for iteration in range(max_iterations + 1):
+        r, residual = _residual(rows, constants, x)
+        if residual <= tolerance:
+            return x, iteration, residual
+        if iteration == max_iterations or (previous is not None and residual > previous / 2):
+            return None
+        previous = residual
+
+        correction = _to_decimals(factorization.solve([float(value) for value in r]))
+        if correction is None:
+            return None
+        x = [a + d for (a, d) in zip(x, correction)]
+
+
+def _residual(rows, constants, x):
+    r = []
+    scale = Decimal('0')
+    for row, c in zip(rows, constants):
+        total = c
+        for a, value in zip(row, x):
+            term = a * value
+            total -= term
+            scale = max(scale, abs(term))
+        scale = max(scale, abs(c))
+        r.append(total)
+    largest = max(abs(value) for value in r)
+    return r, (largest / scale if scale else largest)
+
+
+def _to_decimals(values):
+    if not all(math.isfinite(v) for v in values):
+        return None
+    return [Decimal(v) for v in values]
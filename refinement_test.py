@@ -0,0 +1,64 @@
+import unittest
+from decimal import Decimal
+
+import refinement
+from linsys import LinearSystem
+from hyperplane import Hyperplane
+from plane import Plane
+from vector import Vector
+from precision import precision_context
+
+def hilbert_system(n):
+    return LinearSystem([Hyperplane(Vector([Decimal(1) / (i + j + 1) for j in range(n)]), 1)
+                         for i in range(n)])
+
+
+class RefinementTest(unittest.TestCase):
+
+    def test_refined_solution_matches_decimal_solution(self):
+        s = LinearSystem([Plane(normal_vector=Vector(['0','1','1']), constant_term='1'),
+                          Plane(normal_vector=Vector(['1','-1','1']), constant_term='2'),
+                          Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')])
+        result = s.compute_refined_solution()
+
+        self.assertEqual(result.path, refinement.REFINED)
+        self.assertTrue(result.residual <= Decimal('1e-25'))
+        for x, y in zip(result.solution, [23, 7, 2]):
+            self.assertTrue(abs(x - Decimal(y) / 9) < Decimal('1e-25'))
+
+    def test_more_digits_take_more_iterations(self):
+        s = hilbert_system(5)
+        with precision_context(30):
+            short = s.compute_refined_solution()
+        with precision_context(60):
+            long = s.compute_refined_solution()
+
+        self.assertEqual((short.path, long.path), (refinement.REFINED, refinement.REFINED))
+        self.assertTrue(long.iterations > short.iterations)
+        self.assertTrue(long.residual <= Decimal('1e-55'))
+
+    def test_falls_back_to_decimal_elimination(self):
+        # far too ill-conditioned for float64
+        result = hilbert_system(14).compute_refined_solution()
+        self.assertEqual(result.path, refinement.DECIMAL)
+        self.assertEqual((result.iterations, result.residual), (None, None))
+
+        # not square
+        p = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        q = Plane(normal_vector=Vector(['1','-1','1']), constant_term='1')
+        with self.assertRaises(Exception) as cm:
+            LinearSystem([p, q]).compute_refined_solution()
+        self.assertEqual(str(cm.exception), LinearSystem.INF_SOLUTIONS_MSG)
+
+        # singular
+        with self.assertRaises(Exception) as cm:
+            LinearSystem([p, p.scaledBy(2), q]).compute_refined_solution()
+        self.assertEqual(str(cm.exception), LinearSystem.INF_SOLUTIONS_MSG)
+
+    def test_iteration_limit(self):
+        self.assertIsNone(refinement.refine(hilbert_system(5)._to_matrix()[0], [Decimal(1)] * 5,
+                                            Decimal('1e-40'), max_iterations=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
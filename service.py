@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+
+from vector import Vector
+from line import Line
+from pipeline import system_from_equations
+from precision import precision_context, DEFAULT_PRECISION
+
+
+# A local solve server, so a process that needs solves can hand them to one
+# long-running, already warmed-up server instead of importing the library
+# and solving everything itself, one request at a time:
+#
+#   python -m service --port 8765                 (or --socket /tmp/solve.sock)
+#
+# and from asyncio code:
+#
+#   client = await SolveClient.connect(port=8765)
+#   solution = await client.solve([[1, 1, 3], [1, -1, 1]])    # ['2', '1']
+#
+# The protocol is JSON lines in both directions. A request is {"id": ...,
+# "op": ..., ...} and its response {"id": ..., "result": ...} or {"id": ...,
+# "error": "..."}; responses can come back in any order, so one connection
+# can have many requests outstanding. The ops are:
+#
+#   solve      {"equations": [[a_1, ..., a_n, k], ...], "exact": false}
+#              -> the solution, as strings (see pipeline.py for the format)
+#   intersect  {"lines": [[a, b, k], [a, b, k]]} -> the intersection point
+#   vector     {"method": "dot", "vectors": [[...], [...]]} -> calls the
+#              Vector method on the first vector w/ the others as arguments
+#   stats      -> the service's ServiceStats, as an object
+#
+# solve, intersect and vector also take an optional "precision". Numbers can
+# be given as JSON numbers or strings; results are strings, so no precision
+# is lost. The usual LinearSystem/Line messages (NO_SOLUTIONS_MSG, etc.) come
+# back as errors.
+#
+# Requests arriving close together are coalesced: the first waits up to
+# batch_delay seconds for others, and up to batch_size of them are handed to
+# a worker together, which pays the cost of getting work to a worker process
+# (pickling, IPC) once per batch instead of once per request. The workers
+# are a process pool (processes defaults to the number of CPUs; processes=1
+# uses a single thread in this process instead), and each worker has at most
+# one batch at a time, so while they're all busy new requests queue up and
+# get batched together. The event loop itself never does any solving.
+
+ServiceStats = namedtuple('ServiceStats', ['requests', 'errors', 'batches', 'mean_batch_size',
+                                           'queue_depth', 'in_flight', 'mean_latency', 'max_latency'])
+
+VECTOR_METHODS = ['magnitude', 'normalized', 'dot', 'angleBetween', 'parallelTo', 'orthogonalTo',
+                  'isZero', 'projectedOnTo', 'componentOrthogonalTo', 'cross',
+                  'cross_parallelogram_area', 'cross_triangle_area']
+
+
+class SolveService(object):
+
+    UNKNOWN_OP_MSG = 'Unknown operation'
+    NOT_RUNNING_MSG = 'The service is not running'
+
+    def __init__(self, processes=None, batch_size=32, batch_delay=0.002):
+        self.processes = processes
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+
+        self._server = None
+        self._executor = None
+        self._queue = None
+        self._batcher = None
+        self._workers = None
+        self._dispatches = set()
+        self._connections = {}
+
+        self._requests = 0
+        self._errors = 0
+        self._batches = 0
+        self._in_flight = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        # listens on a Unix socket if path is given, else on host:port (port
+        # 0 picks a free one); returns the address actually listened on
+        if self.processes == 1:
+            self._executor = ThreadPoolExecutor(1)
+            workers = 1
+        else:
+            self._executor = ProcessPoolExecutor(self.processes)
+            workers = self.processes or os.cpu_count() or 1
+        self._workers = asyncio.Semaphore(workers)
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        if self._server is None:
+            return
+        self._server.close()
+        # closing each connection ends its handler (which sees EOF); wait for
+        # them, so none are left to be cancelled when the loop shuts down
+        handlers = list(self._connections.values())
+        for writer in list(self._connections):
+            writer.close()
+        if handlers:
+            await asyncio.gather(*handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+        self._executor.shutdown()
+        self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+
+    async def submit(self, request):
+        # queues one request (a dict, as it'd come over the wire) and
+        # returns its response, w/o the id
+        if self._queue is None:
+            raise Exception(self.NOT_RUNNING_MSG)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((request, future, time.perf_counter()))
+        return await future
+
+    def stats(self):
+        count = self._requests
+        return ServiceStats(count, self._errors, self._batches,
+                            count / self._batches if self._batches else 0.0,
+                            self._queue.qsize() if self._queue else 0, self._in_flight,
+                            self._total_latency / count if count else 0.0, self._max_latency)
+
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._workers.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_delay
+            while len(batch) < self.batch_size:
+                try:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                    else:
+                        batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        self._batches += 1
+        self._in_flight += len(batch)
+        try:
+            responses = await loop.run_in_executor(self._executor, handle_batch,
+                                                   [request for (request, _, _) in batch])
+        except Exception as e:
+            responses = [{'error': str(e)}] * len(batch)
+        finally:
+            self._in_flight -= len(batch)
+            self._workers.release()
+
+        now = time.perf_counter()
+        for (request, future, start), response in zip(batch, responses):
+            latency = now - start
+            self._requests += 1
+            if 'error' in response:
+                self._errors += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+            if not future.done():
+                future.set_result(response)
+
+
+    async def _handle_connection(self, reader, writer):
+        pending = set()
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _respond(self, line, writer):
+        request_id = None
+        try:
+            request = json.loads(line, parse_float=Decimal)
+            if not isinstance(request, dict):
+                raise ValueError('requests must be JSON objects')
+            request_id = request.get('id')
+            if request.get('op') == 'stats':
+                response = {'result': self.stats()._asdict()}
+            else:
+                response = await self.submit(request)
+        except ValueError as e:
+            response = {'error': 'Could not parse request: {}'.format(e)}
+
+        response = dict(response, id=request_id)
+        writer.write((json.dumps(response) + '\n').encode())
+        await writer.drain()
+
+
+# Runs in the workers: one response per request, in order.
+
+def handle_batch(requests):
+    return [handle_request(request) for request in requests]
+
+
+def handle_request(request):
+    try:
+        with precision_context(request.get('precision') or DEFAULT_PRECISION):
+            return {'result': _perform(request)}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _perform(request):
+    op = request.get('op')
+
+    if op == 'solve':
+        system = system_from_equations(request['equations'])
+        if request.get('exact'):
+            return [str(x) for x in system.compute_exact_solution()]
+        return [str(x) for x in system.compute_solution()]
+
+    if op == 'intersect':
+        line1, line2 = [Line(Vector(equation[:-1]), Decimal(equation[-1])) for equation in request['lines']]
+        intersection = line1.intersectionWith(line2)
+        if intersection is None:
+            raise Exception(Line.NO_INTERSECTIONS_NOT_COINCIDENT)
+        if isinstance(intersection, Line):
+            raise Exception(Line.INFINITE_INTERSECTIONS_COINCIDENT)
+        return [str(x) for x in intersection]
+
+    if op == 'vector':
+        method = request['method']
+        if method not in VECTOR_METHODS:
+            raise Exception(SolveService.UNKNOWN_OP_MSG)
+        vectors = [Vector(v) for v in request['vectors']]
+        return _encode(getattr(vectors[0], method)(*vectors[1:]))
+
+    raise Exception(SolveService.UNKNOWN_OP_MSG)
+
+
+def _encode(value):
+    if isinstance(value, Vector):
+        return [str(x) for x in value.coordinates]
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class SolveClient(object):
+
+    # talks to a SolveService; several requests can be awaited at once over
+    # the one connection, e.g. w/ asyncio.gather
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+        self._pending = {}
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=None, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        # returns the result, or raises Exception w/ the error message
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        record = dict(fields, id=request_id, op=op)
+        self._writer.write((json.dumps(record, default=str) + '\n').encode())
+        await self._writer.drain()
+
+        response = await future
+        if 'error' in response:
+            raise Exception(response['error'])
+        return response['result']
+
+    async def solve(self, equations, exact=False, precision=None):
+        return await self.request('solve', equations=equations, exact=exact, precision=precision)
+
+    async def intersect(self, line1, line2, precision=None):
+        return await self.request('intersect', lines=[line1, line2], precision=precision)
+
+    async def vector(self, method, *vectors, precision=None):
+        return await self.request('vector', method=method, vectors=list(vectors), precision=precision)
+
+    async def stats(self):
+        return ServiceStats(**await self.request('stats'))
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection to the solve service closed'))
+            self._pending.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m service',
+                                     description='Serve linear system, line and vector requests locally.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default 8765)')
+    parser.add_argument('--socket', help='listen on this Unix socket instead of TCP')
+    parser.add_argument('--processes', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('--batch-size', type=int, default=32, help='most requests per batch (default 32)')
+    parser.add_argument('--batch-delay', type=float, default=0.002,
+                        help='seconds to wait for a batch to fill (default 0.002)')
+    args = parser.parse_args(argv)
+
+    async def serve():
+        service = SolveService(args.processes, args.batch_size, args.batch_delay)
+        address = await service.start(args.host, args.port, args.socket)
+        print('Listening on {}'.format(address))
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
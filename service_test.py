@@ -0,0 +1,100 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import service
+from service import SolveService, SolveClient
+from linsys import LinearSystem
+from line import Line
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = SolveService(processes=1, batch_delay=0.01)
+        host, port = await self.service.start()
+        self.client = await SolveClient.connect(host, port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.service.close()
+
+    async def test_solve(self):
+        solution = await self.client.solve([['0', '1', '1', '1'], ['1', '-1', '1', '2'], ['1', '2', '-5', '3']])
+        for x, y in zip(solution, [23, 7, 2]):
+            self.assertAlmostEqual(Decimal(x), Decimal(y) / 9)
+
+        self.assertEqual(await self.client.solve([[1, 1, 3], [1, -1, 1]], exact=True), ['2', '1'])
+
+        with self.assertRaises(Exception) as cm:
+            await self.client.solve([[1, 1, 1], [2, 2, 3]])
+        self.assertEqual(str(cm.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+    async def test_intersect_and_vector_ops(self):
+        self.assertEqual(await self.client.intersect([1, 1, 3], [1, -1, 1]), ['2', '1'])
+        with self.assertRaises(Exception) as cm:
+            await self.client.intersect([1, 1, 3], [2, 2, 6])
+        self.assertEqual(str(cm.exception), Line.INFINITE_INTERSECTIONS_COINCIDENT)
+
+        self.assertEqual(await self.client.vector('dot', [1, 2, 3], [4, 5, 6]), '32')
+        self.assertEqual(await self.client.vector('magnitude', [3, 4]), '5')
+        self.assertEqual(await self.client.vector('cross', [1, 0, 0], [0, 1, 0]), ['0', '0', '1'])
+        self.assertTrue(await self.client.vector('orthogonalTo', [1, 0], [0, 2]))
+
+        with self.assertRaises(Exception) as cm:
+            await self.client.vector('__class__', [1, 0])
+        self.assertEqual(str(cm.exception), SolveService.UNKNOWN_OP_MSG)
+
+    async def test_concurrent_requests_are_coalesced(self):
+        equations = [[[i, 1, i + 1], [1, -1, 0]] for i in range(1, 21)]
+        solutions = await asyncio.gather(*[self.client.solve(e, exact=True) for e in equations])
+
+        self.assertEqual(solutions, [['1', '1']] * 20)
+        stats = await self.client.stats()
+        self.assertEqual(stats.requests, 20)
+        self.assertTrue(stats.batches < 20)
+        self.assertTrue(stats.mean_batch_size > 1)
+        self.assertEqual(stats.queue_depth, 0)
+        self.assertTrue(stats.max_latency >= stats.mean_latency > 0)
+
+    async def test_bad_requests(self):
+        with self.assertRaises(Exception) as cm:
+            await self.client.request('invert')
+        self.assertEqual(str(cm.exception), SolveService.UNKNOWN_OP_MSG)
+
+        reader, writer = await asyncio.open_connection(*self.service._server.sockets[0].getsockname())
+        writer.write(b'not json\n')
+        self.assertTrue(b'Could not parse request' in await reader.readline())
+        writer.close()
+
+        self.assertEqual((await self.client.stats()).errors, 1)
+
+
+class ProcessPoolServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_unix_socket_and_worker_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solve.sock')
+            solve_service = SolveService(processes=2)
+            await solve_service.start(path=path)
+            client = await SolveClient.connect(path=path)
+            try:
+                solution = await client.solve([[1, 1, 3], [1, -1, 1]], precision=50)
+                self.assertEqual([Decimal(x) for x in solution], [2, 1])
+            finally:
+                await client.close()
+                await solve_service.close()
+
+    def test_handle_batch_keeps_going_past_errors(self):
+        responses = service.handle_batch([{'op': 'solve', 'equations': [[1, 2]]},
+                                          {'op': 'solve', 'equations': [['x', 2]]},
+                                          {'op': 'vector', 'method': 'magnitude', 'vectors': [[0, 5]]}])
+        self.assertEqual(responses[0], {'result': ['2']})
+        self.assertTrue('error' in responses[1])
+        self.assertEqual(responses[2], {'result': '5'})
+
+
+if __name__ == '__main__':
+    unittest.main()
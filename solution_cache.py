@@ -0,0 +1,129 @@
+import hashlib
+import shelve
+import sys
+from collections import OrderedDict
+from decimal import Decimal
+from fractions import Fraction
+
+from vector import Vector
+from precision import current_precision
+
+
+# An opt-in cache of LinearSystem solutions:
+#
+#   cache = SolutionCache(max_entries=10000, max_bytes=50*1024*1024)
+#   solution = system.compute_solution(cache=cache)     # or cache.solve(system)
+#
+# The key is a fingerprint of the system's solution set, not of how it's
+# written down: each equation is converted exactly to Fractions and divided
+# by its first nonzero coefficient, which is the same however the equation
+# is scaled, and taking the set of those ignores both the order of the
+# equations and duplicates - none of which change the solutions. Nothing is
+# rounded, so systems that differ at all (however slightly) get different
+# entries. Solves at different precisions, and exact solves, are cached
+# separately. Failures are cached too: a system w/ no or infinitely many
+# solutions raises the same exception each time.
+#
+# Entries are kept in least-recently-used order, and the least recently used
+# are evicted whenever there are more than max_entries of them or their
+# (estimated) size passes max_bytes. hits, misses and evictions count what
+# happened. With a path, entries are also written to a shelve database
+# there, which outlives the process: a miss in memory is looked up on disk
+# (counted in disk_hits) before solving. The disk tier isn't bounded and
+# isn't evicted from.
+class SolutionCache(object):
+
+    def __init__(self, max_entries=1024, max_bytes=16*1024*1024, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+
+        self._entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+        self._disk = shelve.open(path) if path is not None else None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+
+    def solve(self, system, exact=False):
+        # what system.compute_solution() (or compute_exact_solution(), w/
+        # exact) would return or raise, from the cache if it's there
+        precision = system.precision if system.precision is not None else current_precision()
+        key = fingerprint(system, None if exact else precision)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        elif self._disk is not None and key in self._disk:
+            entry = self._disk[key]
+            self._store(key, entry)
+            self.hits += 1
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            try:
+                if exact:
+                    solution = system.compute_exact_solution()
+                    entry = ('solution', tuple([str(x) for x in solution]))
+                else:
+                    solution = system.compute_solution()
+                    entry = ('solution', tuple([str(x) for x in solution.coordinates]))
+            except Exception as e:
+                entry = ('error', str(e))
+            self._store(key, entry)
+            if self._disk is not None:
+                self._disk[key] = entry
+
+        kind, value = entry
+        if kind == 'error':
+            raise Exception(value)
+        if exact:
+            return tuple([Fraction(x) for x in value])
+        return Vector._from_decimals(tuple([Decimal(x) for x in value]), system.precision)
+
+    def _store(self, key, entry):
+        self._entries[key] = entry
+        self.bytes += _entry_size(key, entry)
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            old_key, old_entry = self._entries.popitem(last=False)
+            self.bytes -= _entry_size(old_key, old_entry)
+            self.evictions += 1
+
+
+def fingerprint(system, precision=None):
+    # a hex digest that's the same for systems w/ exactly the same planes, in
+    # any order, scaled by any (nonzero) constants, and w/ or w/o duplicates;
+    # precision, if given, is part of it
+    forms = set(p.exact_canonical_form() for p in system.planes)
+    text = repr((system.dimension, precision, sorted(forms)))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _entry_size(key, entry):
+    kind, value = entry
+    size = sys.getsizeof(key) + sys.getsizeof(entry) + sys.getsizeof(value)
+    if kind == 'solution':
+        size += sum(sys.getsizeof(x) for x in value)
+    return size
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+import solution_cache
+from solution_cache import SolutionCache
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+def make_planes():
+    return [Plane(normal_vector=Vector(['0','1','1']), constant_term='1'),
+            Plane(normal_vector=Vector(['1','-1','1']), constant_term='2'),
+            Plane(normal_vector=Vector(['1','2','-5']), constant_term='3')]
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_order_scale_and_duplicate_invariant(self):
+        p1, p2, p3 = make_planes()
+        key = solution_cache.fingerprint(LinearSystem([p1, p2, p3]))
+
+        self.assertEqual(solution_cache.fingerprint(LinearSystem([p3, p1, p2])), key)
+        self.assertEqual(solution_cache.fingerprint(LinearSystem([p1.scaledBy(-3), p2, p3.scaledBy(Decimal('0.5'))])), key)
+        self.assertEqual(solution_cache.fingerprint(LinearSystem([p1, p2, p3, p2.scaledBy(2)])), key)
+
+        self.assertNotEqual(solution_cache.fingerprint(LinearSystem([p1, p2])), key)
+        self.assertNotEqual(solution_cache.fingerprint(LinearSystem([p1, p2, p3]), 50), key)
+
+    def test_near_identical_systems_do_not_collide(self):
+        def system(coefficient, constant):
+            return LinearSystem([Plane(normal_vector=Vector(['1','0','0']), constant_term='1'),
+                                 Plane(normal_vector=Vector(['1',coefficient,'0']), constant_term=constant),
+                                 Plane(normal_vector=Vector(['0','0','1']), constant_term='1')])
+
+        a = system('2e-10', '1.0000000002')
+        b = system('2e-10', '1.0000000004')
+        self.assertNotEqual(solution_cache.fingerprint(a), solution_cache.fingerprint(b))
+
+        cache = SolutionCache()
+        self.assertAlmostEqual(cache.solve(a)[1], 1)
+        self.assertAlmostEqual(cache.solve(b)[1], 2)
+        self.assertEqual(cache.misses, 2)
+
+        c = LinearSystem([Plane(normal_vector=Vector(['1','1','0']), constant_term='1000.0000000001'),
+                          Plane(normal_vector=Vector(['1','-1','0']), constant_term='0'),
+                          Plane(normal_vector=Vector(['0','0','1']), constant_term='0')])
+        d = LinearSystem([Plane(normal_vector=Vector(['1','1','0']), constant_term='1000.0000000004'),
+                          Plane(normal_vector=Vector(['1','-1','0']), constant_term='0'),
+                          Plane(normal_vector=Vector(['0','0','1']), constant_term='0')])
+        self.assertEqual(cache.solve(d)[0], Decimal('500.0000000002'))
+        self.assertEqual(cache.solve(c)[0], Decimal('500.00000000005'))
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = SolutionCache()
+        p1, p2, p3 = make_planes()
+
+        first = LinearSystem([p1, p2, p3]).compute_solution(cache=cache)
+        second = LinearSystem([p2.scaledBy(4), p3, p1]).compute_solution(cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(first[0], Decimal(23) / 9)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+        self.assertEqual(LinearSystem([p1, p2, p3]).compute_exact_solution(cache=cache),
+                         (Fraction(23, 9), Fraction(7, 9), Fraction(2, 9)))
+        self.assertEqual(cache.misses, 2)
+
+    def test_failures_are_cached(self):
+        cache = SolutionCache()
+        p1 = Plane(normal_vector=Vector(['1','1','1']), constant_term='1')
+        p2 = Plane(normal_vector=Vector(['1','1','1']), constant_term='2')
+
+        for _ in range(2):
+            with self.assertRaises(Exception) as cm:
+                cache.solve(LinearSystem([p1, p2]))
+            self.assertEqual(str(cm.exception), LinearSystem.NO_SOLUTIONS_MSG)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction_by_count_and_size(self):
+        systems = [LinearSystem([Plane(normal_vector=Vector(['1','0','0']), constant_term=i),
+                                 Plane(normal_vector=Vector(['0','1','0']), constant_term='1'),
+                                 Plane(normal_vector=Vector(['0','0','1']), constant_term='1')])
+                   for i in range(4)]
+
+        cache = SolutionCache(max_entries=2)
+        cache.solve(systems[0])
+        cache.solve(systems[1])
+        cache.solve(systems[0])
+        cache.solve(systems[2])
+        self.assertEqual((len(cache), cache.evictions), (2, 1))
+
+        # systems[1] was least recently used, so it's the one that went
+        cache.solve(systems[0])
+        self.assertEqual(cache.hits, 2)
+        cache.solve(systems[1])
+        self.assertEqual(cache.misses, 4)
+
+        cache = SolutionCache(max_bytes=1)
+        cache.solve(systems[0])
+        self.assertEqual((len(cache), cache.bytes, cache.evictions), (0, 0, 1))
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'solutions')
+            with SolutionCache(path=path) as cache:
+                solution = cache.solve(LinearSystem(make_planes()))
+
+            with SolutionCache(path=path) as cache:
+                self.assertEqual(cache.solve(LinearSystem(make_planes()[::-1])), solution)
+                self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (1, 1, 0))
+                self.assertEqual(len(cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
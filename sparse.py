@@ -0,0 +1,162 @@
+import heapq
+from decimal import Decimal
+
+from vector import Vector
+import iterative
+from linsys import LinearSystem
+from hyperplane import is_near_zero
+from precision import uses_precision
+
+
+# SparseLinearSystem stores each equation as a dict of its nonzero
+# coefficients ({column index: coefficient}), so memory scales with the number
+# of nonzeros instead of equations * variables. Elimination picks its pivots w/
+# a fill-reducing ordering: the column w/ the fewest remaining nonzeros
+# (minimum degree), and within it the shortest row whose coefficient is large
+# enough to be a stable pivot (Markowitz w/ threshold pivoting). Eliminating
+# sparse columns first keeps the rows from filling in. precision works as it
+# does for LinearSystem.
+class SparseLinearSystem(object):
+
+    PIVOT_THRESHOLD = Decimal('0.1')
+
+    def __init__(self, rows, constants, dimension, precision=None):
+        self.rows = [{j: Decimal(x) for (j, x) in row.items() if not is_near_zero(Decimal(x))}
+                     for row in rows]
+        self.constants = [Decimal(c) for c in constants]
+        self.dimension = dimension
+        self.precision = precision
+
+        for row in self.rows:
+            if any(j < 0 or j >= dimension for j in row):
+                raise Exception(LinearSystem.ALL_PLANES_MUST_BE_IN_SAME_DIM_MSG)
+
+    @classmethod
+    def from_linear_system(cls, system):
+        rows = [{j: x for (j, x) in enumerate(p.normal_vector.coordinates) if x != 0}
+                for p in system.planes]
+        constants = [p.constant_term for p in system.planes]
+        return cls(rows, constants, system.dimension, system.precision)
+
+
+    def __len__(self):
+        return len(self.rows)
+
+
+    def nonzeros(self):
+        return sum(len(row) for row in self.rows)
+
+
+    def indices_of_first_nonzero_terms_in_each_row(self):
+        return [min(row) if row else -1 for row in self.rows]
+
+
+    @uses_precision
+    def compute_solution(self):
+        rows = [dict(row) for row in self.rows]
+        constants = list(self.constants)
+        pivots, free_columns = _eliminate(rows, constants, self.dimension)
+
+        # every row that never became a pivot row has had all its
+        # coefficients eliminated, so it reads 0 = k
+        pivot_rows = set(r for (r, c) in pivots)
+        for i in range(len(rows)):
+            if i not in pivot_rows and not is_near_zero(constants[i]):
+                raise Exception(LinearSystem.NO_SOLUTIONS_MSG)
+
+        if free_columns:
+            raise Exception(LinearSystem.INF_SOLUTIONS_MSG)
+
+        # each pivot row only refers to columns that were eliminated after it,
+        # so back-substituting in reverse pivot order always has their values
+        solution = [Decimal('0')] * self.dimension
+        for r, c in reversed(pivots):
+            row = rows[r]
+            total = constants[r]
+            for j, x in row.items():
+                if j != c:
+                    total -= x * solution[j]
+            solution[c] = total / row[c]
+
+        return Vector._from_decimals(tuple(solution), self.precision)
+
+
+    # as LinearSystem.compute_iterative_solution - each sweep only touches
+    # the nonzeros, which is where iterative solving pays off most
+    @uses_precision
+    def compute_iterative_solution(self, method='gauss_seidel', initial_guess=None,
+                                   tolerance=1e-10, max_iterations=1000):
+        if initial_guess is not None:
+            initial_guess = [Decimal(x) for x in initial_guess]
+        result = iterative.solve(method, self.rows, self.constants, initial_guess, tolerance, max_iterations)
+        return result._replace(solution=Vector._from_decimals(tuple(result.solution), self.precision))
+
+
+def _eliminate(rows, constants, dimension):
+    # in-place sparse elimination; returns the (row, column) pivots in the
+    # order they were chosen, and the columns that never got a pivot
+    column_rows = [set() for _ in range(dimension)]
+    for i, row in enumerate(rows):
+        for j in row:
+            column_rows[j].add(i)
+
+    # heap of (number of rows, column); entries go stale as counts change, so
+    # we push a new one on every change and skip stale ones when popping
+    heap = [(len(column_rows[j]), j) for j in range(dimension)]
+    heapq.heapify(heap)
+    active_columns = [True] * dimension
+
+    pivots = []
+    free_columns = []
+
+    while heap:
+        count, c = heapq.heappop(heap)
+        if not active_columns[c] or count != len(column_rows[c]):
+            continue
+        active_columns[c] = False
+
+        if count == 0:
+            free_columns.append(c)
+            continue
+
+        candidates = column_rows[c]
+        largest = max(abs(rows[i][c]) for i in candidates)
+        limit = SparseLinearSystem.PIVOT_THRESHOLD * largest
+        r = min((i for i in candidates if abs(rows[i][c]) >= limit),
+                key=lambda i: (len(rows[i]), i))
+
+        pivot = rows[r]
+        pivot_value = pivot[c]
+        touched = set(pivot)
+
+        for i in candidates:
+            if i == r:
+                continue
+            row = rows[i]
+            factor = row.pop(c) / pivot_value
+            for j, x in pivot.items():
+                if j == c:
+                    continue
+                value = row.get(j, 0) - factor * x
+                if is_near_zero(value):
+                    if j in row:
+                        del row[j]
+                        column_rows[j].discard(i)
+                else:
+                    if j not in row:
+                        column_rows[j].add(i)
+                    row[j] = value
+            constants[i] -= factor * constants[r]
+
+        # the pivot row and column are done; take them out of the counts
+        for j in pivot:
+            column_rows[j].discard(r)
+        column_rows[c] = set()
+
+        for j in touched:
+            if active_columns[j]:
+                heapq.heappush(heap, (len(column_rows[j]), j))
+
+        pivots.append((r, c))
+
+    return pivots, free_columns
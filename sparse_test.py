@@ -0,0 +1,98 @@
+import unittest
+from decimal import Decimal
+
+import sparse
+from sparse import SparseLinearSystem
+from linsys import LinearSystem
+from plane import Plane
+from vector import Vector
+
+class StorageTest(unittest.TestCase):
+
+    def test_only_nonzeros_are_stored(self):
+        s = SparseLinearSystem([{0: 1, 2: 0}, {1: '2.5'}], [1, 2], 3)
+
+        self.assertEqual(s.rows, [{0: 1}, {1: Decimal('2.5')}])
+        self.assertEqual(s.nonzeros(), 2)
+        self.assertEqual(s.indices_of_first_nonzero_terms_in_each_row(), [0, 1])
+
+    def test_from_linear_system(self):
+        p1 = Plane(Vector([0,1,0]), 2)
+        p2 = Plane(Vector([1,0,-2]), 2)
+        s = SparseLinearSystem.from_linear_system(LinearSystem([p1,p2]))
+
+        self.assertEqual(s.rows, [{1: 1}, {0: 1, 2: -2}])
+        self.assertEqual(s.constants, [2, 2])
+
+
+class SolutionTest(unittest.TestCase):
+
+    def test_matches_dense_solution(self):
+        p1 = Plane(Vector(['5.262','2.739','-9.878']), '-3.441')
+        p2 = Plane(Vector(['5.111','6.358','7.638']), '-2.152')
+        p3 = Plane(Vector(['2.016','-9.924','-1.367']), '-9.278')
+        dense = LinearSystem([p1,p2,p3])
+
+        solution = SparseLinearSystem.from_linear_system(dense).compute_solution()
+        for x, y in zip(solution, dense.compute_solution()):
+            self.assertAlmostEqual(x, y)
+
+    def test_no_and_infinite_solutions(self):
+        with self.assertRaises(Exception) as context:
+            SparseLinearSystem([{0: 1, 1: 1}, {0: 2, 1: 2}], [1, 3], 2).compute_solution()
+        self.assertEqual(str(context.exception), LinearSystem.NO_SOLUTIONS_MSG)
+
+        with self.assertRaises(Exception) as context:
+            SparseLinearSystem([{0: 1, 1: 1}, {0: 2, 1: 2}], [1, 2], 2).compute_solution()
+        self.assertEqual(str(context.exception), LinearSystem.INF_SOLUTIONS_MSG)
+
+        with self.assertRaises(Exception) as context:
+            SparseLinearSystem([{0: 1}], [1], 2).compute_solution()
+        self.assertEqual(str(context.exception), LinearSystem.INF_SOLUTIONS_MSG)
+
+    def test_large_tridiagonal_system(self):
+        # -x_{i-1} + 2x_i - x_{i+1} = 0 w/ x_0 = x_{n-1} = 1 has the solution
+        # x_i = 1 everywhere
+        n = 500
+        rows = [{0: 1}] + [{i-1: -1, i: 2, i+1: -1} for i in range(1, n-1)] + [{n-1: 1}]
+        constants = [1] + [0]*(n-2) + [1]
+
+        solution = SparseLinearSystem(rows, constants, n).compute_solution()
+        for x in solution:
+            self.assertAlmostEqual(x, 1)
+
+    def test_iterative_solution(self):
+        n = 200
+        rows = [{j: (4 if j == i else -1) for j in (i-1, i, i+1) if 0 <= j < n} for i in range(n)]
+        constants = [sum(row.values()) for row in rows]
+        result = SparseLinearSystem(rows, constants, n).compute_iterative_solution('conjugate_gradient')
+
+        self.assertTrue(result.converged)
+        for x in result.solution:
+            self.assertAlmostEqual(x, 1)
+
+
+
+class OrderingTest(unittest.TestCase):
+
+    def test_arrowhead_matrix_is_eliminated_without_fill(self):
+        # a dense first row and column; eliminating column 0 first would fill
+        # in the whole matrix, so minimum degree should leave it for last
+        n = 50
+        rows = [{j: 1 for j in range(n)}] + [{0: 1, i: 4} for i in range(1, n)]
+        constants = [n] + [5]*(n-1)
+        s = SparseLinearSystem(rows, constants, n)
+
+        work = [dict(row) for row in s.rows]
+        pivots, free_columns = sparse._eliminate(work, list(s.constants), n)
+
+        self.assertEqual(free_columns, [])
+        self.assertTrue(0 in [c for (r, c) in pivots[-2:]])
+        self.assertTrue(sum(len(row) for row in work) <= s.nonzeros())
+        for x in s.compute_solution():
+            self.assertAlmostEqual(x, 1)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,32 @@
 import math
-from decimal import Decimal, DivisionUndefined
-
+import operator
+from array import array
+from decimal import Decimal, DivisionUndefined, getcontext
+
+from precision import uses_precision
+
+# Vector is an immutable value type: the coordinates can't change after
+# construction, which lets us compute derived values like the magnitude and
+# the normalized vector once, the first time they're asked for, and reuse them
+# afterwards (at the same precision - each is stored along w/ the precision
+# it was computed at, and recomputed if it's asked for at another one).
+# __slots__ keeps each instance small (no per-instance __dict__).
+# precision is the number of significant digits to do its math w/ - None
+# means use the precision of the caller (see precision.py). Vectors computed
+# from this one have the same precision. The elementwise arithmetic (+, -, *,
+# dot, cross) is cheap and called a lot, so it doesn't switch precision
+# itself: it's done at whatever precision decimal's context is at, which
+# inside any of the other methods - or Line, Plane and LinearSystem's - is
+# the right one.
 class Vector(object):
-    def __init__(self, coordinates):
+
+    __slots__ = ('coordinates', 'dimension', 'precision', '_magnitude', '_normalized')
+
+    def __init__(self, coordinates, precision=None):
         try:
             if not coordinates:
                 raise ValueError
-            self.coordinates = tuple([Decimal(x) for x in coordinates])
-            self.dimension = len(coordinates)
+            coordinates = tuple([Decimal(x) for x in coordinates])
 
         except ValueError:
             raise ValueError('The coordinates must be nonempty')
@@ -15,6 +34,36 @@ class Vector(object):
         except TypeError:
             raise TypeError('The coordinates must be an iterable')
 
+        Vector._initialize(self, coordinates, precision)
+
+    # trusted constructor used internally for the results of arithmetic, where
+    # we know we already have a tuple of Decimals and don't need to convert
+    # each one again
+    @classmethod
+    def _from_decimals(cls, coordinates, precision=None):
+        v = object.__new__(cls)
+        Vector._initialize(v, coordinates, precision)
+        return v
+
+    def _initialize(self, coordinates, precision):
+        set_attribute = object.__setattr__
+        set_attribute(self, 'coordinates', coordinates)
+        set_attribute(self, 'dimension', len(coordinates))
+        set_attribute(self, 'precision', precision)
+        set_attribute(self, '_magnitude', None)
+        set_attribute(self, '_normalized', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Vector is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('Vector is immutable')
+
+    # the default pickling for slotted classes restores state w/ setattr,
+    # which we don't allow, so rebuild from the coordinates instead
+    def __reduce__(self):
+        return (Vector, (self.coordinates, self.precision))
+
 
     def __str__(self):
         return 'Vector: {}'.format(self.coordinates)
@@ -23,20 +72,26 @@ class Vector(object):
     def __eq__(self, v):
         return self.coordinates == v.coordinates
 
+    # since vectors are immutable, they can be hashed (and so used in sets and
+    # as dict keys) consistently with __eq__
+    def __hash__(self):
+        return hash(self.coordinates)
+
 
     def __add__(self, v):
         # when applied to tuples, + concatenates, so we need to
         # zip the two tuples together and add the results
-        return Vector([x+y for (x,y) in zip(self.coordinates, v.coordinates)])
+        return Vector._from_decimals(tuple([x+y for (x,y) in zip(self.coordinates, v.coordinates)]), self.precision)
 
     def __sub__(self, v):
-        return Vector([x-y for (x,y) in zip(self.coordinates, v.coordinates)])
+        return Vector._from_decimals(tuple([x-y for (x,y) in zip(self.coordinates, v.coordinates)]), self.precision)
         # would it be better to define a unary negative and then implement this as
         # self + (-(v))? reduces duplication...
 
     # support vector * scalar (for ex, v*3)
     def __mul__(self, scalar):
-        return Vector([Decimal(scalar)*x for x in self.coordinates])
+        scalar = Decimal(scalar)
+        return Vector._from_decimals(tuple([scalar*x for x in self.coordinates]), self.precision)
 
     # we overload __rmul__ to support scalar * vector operations (for ex, 3*v)
     def __rmul__(self, scalar):
@@ -46,27 +101,42 @@ class Vector(object):
     def __getitem__(self, index):
         return self.coordinates[index]
 
+    @uses_precision
     def magnitude(self):
         # magnitude is the sqrt of each component squared (this is the normal formula
         # for distance, but since the second component is the origin, we subtract
         # zero)
-        return (sum([x**2 for x in self.coordinates])).sqrt()
-
+        precision = getcontext().prec
+        cached = self._magnitude
+        if cached is not None and cached[0] == precision:
+            return cached[1]
+        magnitude = (sum([x*x for x in self.coordinates])).sqrt()
+        object.__setattr__(self, '_magnitude', (precision, magnitude))
+        return magnitude
+
+    @uses_precision
     def normalized(self):
         # the normalization of a vector is another vector w/ the same direction and
         # magnitude of one - to get this we multiply the vector in question by
         # one over the magnitude of the vector - i.e., we scale it larger/smaller
         # so that its length is one (remember that scaling doesn't change the
         # direction)
+        precision = getcontext().prec
+        cached = self._normalized
+        if cached is not None and cached[0] == precision:
+            return cached[1]
         try:
-            return (Decimal('1.0')/self.magnitude()) * self
+            normalized = (Decimal('1.0')/self.magnitude()) * self
         except ZeroDivisionError:
             raise Exception('Cannot normalize the zero vector')
+        object.__setattr__(self, '_normalized', (precision, normalized))
+        return normalized
 
     def dot(self, v):
         # the dot product is the sum of the corresponding components multiplied together
         return sum([(x*y) for (x,y) in zip(self.coordinates, v.coordinates)])
 
+    @uses_precision
     def angleBetween(self, v, degrees=False):
         if (not(self.isZero()) and not(v.isZero())):
             radians_between = math.acos((self.dot(v)) / (self.magnitude() * v.magnitude()))
@@ -75,28 +145,36 @@ class Vector(object):
 
         return radians_between if not degrees else math.degrees(radians_between)
 
+    @uses_precision
     def parallelTo(self, v):
         # the class-defined definition of parallel is where two vectors are scalar
         # multiples of each other - I implement by seeing if the angle between
         # the two vector is either 0 or 180 degrees
-        return (self.isZero() or v.isZero() or
-                math.isclose(self.angleBetween(v), 0, abs_tol=1e-05) or
-                math.isclose(self.angleBetween(v), math.pi, rel_tol=1e-05))
+        if self.isZero() or v.isZero():
+            return True
+        angle = self.angleBetween(v)
+        return (math.isclose(angle, 0, abs_tol=1e-05) or
+                math.isclose(angle, math.pi, rel_tol=1e-05))
 
+    @uses_precision
     def orthogonalTo(self, v, tolerance=1e-10):
         # can't just do self.dot(v) == 0 due to FP rounding issues
         return abs(self.dot(v)) < tolerance
         # TODO update to use math.isclose?
 
+    @uses_precision
     def isZero(self, tolerance=1e-10):
         return self.magnitude() < tolerance
         # TODO update to use math.isclose?
 
+    @uses_precision
     def projectedOnTo(self, b):
-        magnitude_of_projection = self.dot(b.normalized())
-        return magnitude_of_projection * b.normalized()
+        b_normalized = b.normalized()
+        magnitude_of_projection = self.dot(b_normalized)
+        return magnitude_of_projection * b_normalized
         # his impl catches attempts to to normalize the zero vector and raises an exception
 
+    @uses_precision
     def componentOrthogonalTo(self, b):
         # since v = v parallel + v orthogonal, then
         # v orthogonal = v - v parallel, which we use here:
@@ -107,15 +185,17 @@ class Vector(object):
         x1, y1, z1 = self.coordinates
         x2, y2, z2 = v.coordinates
 
-        return Vector([
+        return Vector._from_decimals((
             (y1*z2 - y2*z1),
             (-(x1*z2 - x2*z1)),
             (x1*y2 - x2*y1)
-        ])
+        ), self.precision)
 
+    @uses_precision
     def cross_parallelogram_area(self, v):
         return (self.cross(v).magnitude())
 
+    @uses_precision
     def cross_triangle_area(self, v):
         return Decimal('0.5') * self.cross_parallelogram_area(v)
 
@@ -126,6 +206,125 @@ class Vector(object):
 
 
 
+# FloatVector has the same API as Vector, but stores its coordinates in a
+# contiguous float64 buffer (an array('d')) and does its math with hardware
+# floats instead of Decimal. It's much faster, so use it when you don't need
+# exact decimal arithmetic. Convert back and forth by passing the coordinates
+# of one to the constructor of the other.
+class FloatVector(object):
+
+    __slots__ = ('coordinates', 'dimension')
+
+    def __init__(self, coordinates):
+        try:
+            if not coordinates:
+                raise ValueError
+            self.coordinates = array('d', [float(x) for x in coordinates])
+            self.dimension = len(self.coordinates)
+
+        except ValueError:
+            raise ValueError('The coordinates must be nonempty')
+
+        except TypeError:
+            raise TypeError('The coordinates must be an iterable')
+
+    # builds a FloatVector directly around an existing float64 buffer (an
+    # array('d') or a memoryview cast to 'd'), w/o copying or converting - only
+    # for use when we know the buffer already holds floats
+    @classmethod
+    def _from_buffer(cls, buffer):
+        v = cls.__new__(cls)
+        v.coordinates = buffer
+        v.dimension = len(buffer)
+        return v
+
+
+    def __str__(self):
+        return 'FloatVector: {}'.format(tuple(self.coordinates))
+
+
+    def __eq__(self, v):
+        return tuple(self.coordinates) == tuple(v.coordinates)
+
+
+    def __add__(self, v):
+        return FloatVector._from_buffer(array('d', map(operator.add, self.coordinates, v.coordinates)))
+
+    def __sub__(self, v):
+        return FloatVector._from_buffer(array('d', map(operator.sub, self.coordinates, v.coordinates)))
+
+    def __mul__(self, scalar):
+        scalar = float(scalar)
+        return FloatVector._from_buffer(array('d', [scalar*x for x in self.coordinates]))
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def __getitem__(self, index):
+        return self.coordinates[index]
+
+    def magnitude(self):
+        # hypot does the sum of squares and sqrt in one C call, and avoids
+        # overflow/underflow on the intermediate squares
+        return math.hypot(*self.coordinates)
+
+    def normalized(self):
+        magnitude = self.magnitude()
+        if magnitude == 0:
+            raise Exception('Cannot normalize the zero vector')
+        return (1.0/magnitude) * self
+
+    def dot(self, v):
+        return sum(map(operator.mul, self.coordinates, v.coordinates))
+
+    def angleBetween(self, v, degrees=False):
+        if (not(self.isZero()) and not(v.isZero())):
+            # with floats the cosine can come out a hair outside [-1, 1] for
+            # (anti)parallel vectors, which acos won't accept, so clamp it
+            cosine = self.dot(v) / (self.magnitude() * v.magnitude())
+            radians_between = math.acos(max(-1.0, min(1.0, cosine)))
+        else:
+            raise Exception('Cannot calculate the angle between using a zero vector')
+
+        return radians_between if not degrees else math.degrees(radians_between)
+
+    def parallelTo(self, v):
+        if self.isZero() or v.isZero():
+            return True
+        angle = self.angleBetween(v)
+        return (math.isclose(angle, 0, abs_tol=1e-05) or
+                math.isclose(angle, math.pi, rel_tol=1e-05))
+
+    def orthogonalTo(self, v, tolerance=1e-10):
+        return abs(self.dot(v)) < tolerance
+
+    def isZero(self, tolerance=1e-10):
+        return self.magnitude() < tolerance
+
+    def projectedOnTo(self, b):
+        b_normalized = b.normalized()
+        return self.dot(b_normalized) * b_normalized
+
+    def componentOrthogonalTo(self, b):
+        return self - self.projectedOnTo(b)
+
+    def cross(self, v):
+        x1, y1, z1 = self.coordinates
+        x2, y2, z2 = v.coordinates
+
+        return FloatVector._from_buffer(array('d', [
+            (y1*z2 - y2*z1),
+            (-(x1*z2 - x2*z1)),
+            (x1*y2 - x2*y1)
+        ]))
+
+    def cross_parallelogram_area(self, v):
+        return (self.cross(v).magnitude())
+
+    def cross_triangle_area(self, v):
+        return 0.5 * self.cross_parallelogram_area(v)
+
+
 if __name__ == '__main__':
     # here we're using the implemented functions to output the results of the
     # questions asked by the course
@@ -0,0 +1,145 @@
+import math
+import operator
+from array import array
+
+from vector import FloatVector
+
+
+# VectorBatch holds N vectors of the same dimension in one contiguous float64
+# buffer (row i lives at buffer[i*dimension:(i+1)*dimension]). The methods
+# mirror Vector's, but work over every row in one call - either pairwise
+# against another batch of the same length, or against a single vector that's
+# broadcast to every row. dotMatrix/angleMatrix compute the full N x M table
+# between two batches.
+class VectorBatch(object):
+
+    ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG = 'All vectors in the batch should live in the same dimension'
+    BATCHES_MUST_BE_SAME_LENGTH_MSG = 'Pairwise operations need batches of the same length'
+
+    __slots__ = ('buffer', 'dimension', '_rows')
+
+    def __init__(self, vectors):
+        buffer = array('d')
+        dimension = None
+        for v in vectors:
+            coordinates = v.coordinates if hasattr(v, 'coordinates') else v
+            row = [float(x) for x in coordinates]
+            if dimension is None:
+                dimension = len(row)
+            elif len(row) != dimension:
+                raise Exception(self.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG)
+            buffer.extend(row)
+
+        if not dimension:
+            raise ValueError('The batch must contain at least one nonempty vector')
+
+        self.buffer = buffer
+        self.dimension = dimension
+        self._rows = None
+
+    # wraps an existing float64 buffer (array('d') or memoryview cast to 'd')
+    # holding len(buffer)/dimension rows, w/o copying it
+    @classmethod
+    def _from_buffer(cls, buffer, dimension):
+        b = cls.__new__(cls)
+        b.buffer = buffer
+        b.dimension = dimension
+        b._rows = None
+        return b
+
+
+    def rows(self):
+        # zero-copy views of each row, built once and reused by every op
+        if self._rows is None:
+            view = memoryview(self.buffer)
+            d = self.dimension
+            self._rows = [view[i:i+d] for i in range(0, len(view), d)]
+        return self._rows
+
+
+    def __len__(self):
+        return len(self.buffer) // self.dimension
+
+
+    def __getitem__(self, index):
+        return FloatVector._from_buffer(self.rows()[index])
+
+
+    def __str__(self):
+        return 'VectorBatch: {} vectors of dimension {}'.format(len(self), self.dimension)
+
+
+    def _paired_rows(self, other):
+        # returns the rows of other lined up against our rows; a single vector
+        # is repeated for every row
+        if isinstance(other, VectorBatch):
+            if len(other) != len(self):
+                raise Exception(self.BATCHES_MUST_BE_SAME_LENGTH_MSG)
+            return other.rows()
+        coordinates = other.coordinates if hasattr(other, 'coordinates') else other
+        row = array('d', [float(x) for x in coordinates])
+        return [row] * len(self)
+
+    def dot(self, other):
+        return array('d', [sum(map(operator.mul, a, b))
+                           for (a, b) in zip(self.rows(), self._paired_rows(other))])
+
+    def magnitude(self):
+        return array('d', [math.hypot(*a) for a in self.rows()])
+
+    def normalized(self):
+        buffer = array('d')
+        for a, magnitude in zip(self.rows(), self.magnitude()):
+            if magnitude == 0:
+                raise Exception('Cannot normalize the zero vector')
+            scale = 1.0/magnitude
+            buffer.extend([scale*x for x in a])
+        return VectorBatch._from_buffer(buffer, self.dimension)
+
+    def isZero(self, tolerance=1e-10):
+        return [magnitude < tolerance for magnitude in self.magnitude()]
+
+    def angleBetween(self, other, degrees=False):
+        other_rows = self._paired_rows(other)
+        other_magnitudes = [math.hypot(*b) for b in other_rows]
+        return array('d', [_angle(sum(map(operator.mul, a, b)), ma, mb, degrees)
+                           for (a, b, ma, mb) in zip(self.rows(), other_rows,
+                                                     self.magnitude(), other_magnitudes)])
+
+    def parallelTo(self, other):
+        other_rows = self._paired_rows(other)
+        other_magnitudes = [math.hypot(*b) for b in other_rows]
+        return [_parallel(sum(map(operator.mul, a, b)), ma, mb)
+                for (a, b, ma, mb) in zip(self.rows(), other_rows,
+                                          self.magnitude(), other_magnitudes)]
+
+    def orthogonalTo(self, other, tolerance=1e-10):
+        return [abs(d) < tolerance for d in self.dot(other)]
+
+    def dotMatrix(self, other):
+        # row i holds our row i dotted with every row of other
+        other_rows = other.rows()
+        return [array('d', [sum(map(operator.mul, a, b)) for b in other_rows])
+                for a in self.rows()]
+
+    def angleMatrix(self, other, degrees=False):
+        other_magnitudes = other.magnitude()
+        return [array('d', [_angle(d, ma, mb, degrees) for (d, mb) in zip(dots, other_magnitudes)])
+                for (dots, ma) in zip(self.dotMatrix(other), self.magnitude())]
+
+
+def _angle(dot, magnitude1, magnitude2, degrees):
+    if magnitude1 < 1e-10 or magnitude2 < 1e-10:
+        raise Exception('Cannot calculate the angle between using a zero vector')
+    radians_between = math.acos(max(-1.0, min(1.0, dot / (magnitude1 * magnitude2))))
+    return radians_between if not degrees else math.degrees(radians_between)
+
+
+def _parallel(dot, magnitude1, magnitude2):
+    # same definition as Vector.parallelTo - zero vectors are parallel to
+    # everything, otherwise the angle has to be 0 or 180 degrees
+    if magnitude1 < 1e-10 or magnitude2 < 1e-10:
+        return True
+    angle = _angle(dot, magnitude1, magnitude2, False)
+    return (math.isclose(angle, 0, abs_tol=1e-05) or
+            math.isclose(angle, math.pi, rel_tol=1e-05))
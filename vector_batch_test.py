@@ -0,0 +1,90 @@
+import math
+import unittest
+
+from vector import Vector
+from vector_batch import VectorBatch
+
+class ConstructionTest(unittest.TestCase):
+
+    def test_rows_share_one_buffer(self):
+        b = VectorBatch([Vector([1,2,3]), [4,5,6]])
+
+        self.assertEqual(len(b), 2)
+        self.assertEqual(b.dimension, 3)
+        self.assertEqual(list(b.buffer), [1,2,3,4,5,6])
+        self.assertEqual(list(b[1]), [4,5,6])
+
+    def test_mixed_dimensions_raise(self):
+        with self.assertRaises(Exception) as context:
+            VectorBatch([[1,2], [1,2,3]])
+
+        self.assertTrue(VectorBatch.ALL_VECTORS_MUST_BE_IN_SAME_DIM_MSG in str(context.exception))
+
+
+class RowwiseOperationsTest(unittest.TestCase):
+
+    def test_dot_and_magnitude(self):
+        b1 = VectorBatch([[1,2,-1], [0,0,0]])
+        b2 = VectorBatch([[3,1,0], [1,1,1]])
+
+        self.assertEqual(list(b1.dot(b2)), [5, 0])
+        self.assertEqual(list(b1.dot(Vector([1,1,1]))), [2, 0])
+        self.assertAlmostEqual(VectorBatch([[4,4]]).magnitude()[0], 5.656854249492380)
+
+    def test_pairwise_needs_same_length(self):
+        with self.assertRaises(Exception) as context:
+            VectorBatch([[1,2]]).dot(VectorBatch([[1,2], [3,4]]))
+
+        self.assertTrue(VectorBatch.BATCHES_MUST_BE_SAME_LENGTH_MSG in str(context.exception))
+
+    def test_normalized(self):
+        n = VectorBatch([[4,4], [0,5]]).normalized()
+
+        self.assertAlmostEqual(n[0][0], 0.7071067811865475)
+        self.assertEqual(list(n[1]), [0, 1])
+
+        with self.assertRaises(Exception) as context:
+            VectorBatch([[1,1], [0,0]]).normalized()
+
+        self.assertTrue('Cannot normalize the zero vector' in str(context.exception))
+
+    def test_angles_match_vector(self):
+        v1 = Vector([1,2,-1])
+        v2 = Vector([3,1,0])
+        b = VectorBatch([v1, v2])
+
+        angles = b.angleBetween(VectorBatch([v2, v1]))
+        self.assertAlmostEqual(angles[0], v1.angleBetween(v2))
+        self.assertAlmostEqual(angles[1], v2.angleBetween(v1))
+        self.assertAlmostEqual(b.angleBetween(v2, degrees=True)[0], 49.797034113430236)
+
+    def test_parallel_and_orthogonal(self):
+        b = VectorBatch([[1,1], [-1,-1], [0,0], [1,0]])
+
+        self.assertEqual(b.parallelTo(Vector([2,2])), [True, True, True, False])
+        self.assertEqual(b.orthogonalTo(Vector([-1,1])), [True, True, True, False])
+
+
+class MatrixOperationsTest(unittest.TestCase):
+
+    def test_dot_matrix(self):
+        b1 = VectorBatch([[1,0], [0,1], [1,1]])
+        b2 = VectorBatch([[2,3], [-1,1]])
+
+        m = b1.dotMatrix(b2)
+        self.assertEqual([list(row) for row in m], [[2,-1], [3,1], [5,0]])
+
+    def test_angle_matrix(self):
+        b1 = VectorBatch([[1,0], [0,1]])
+        b2 = VectorBatch([[1,0], [0,1], [-1,0]])
+
+        m = b1.angleMatrix(b2)
+        self.assertAlmostEqual(m[0][0], 0)
+        self.assertAlmostEqual(m[0][1], math.pi/2)
+        self.assertAlmostEqual(m[0][2], math.pi)
+        self.assertAlmostEqual(b1.angleMatrix(b2, degrees=True)[1][0], 90)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from vector import Vector
+from vector import Vector, FloatVector
 from decimal import Decimal
 
 class AdditionTest(unittest.TestCase):
@@ -226,5 +227,90 @@ class IteratorTest(unittest.TestCase):
         self.assertEqual(as_list, [3,4])
 
 
+class ImmutabilityTest(unittest.TestCase):
+
+    def test_vectors_cannot_be_modified(self):
+        v = Vector([1,2])
+
+        with self.assertRaises(AttributeError):
+            v.coordinates = (Decimal(3), Decimal(4))
+        with self.assertRaises(AttributeError):
+            v.extra = 1
+
+    def test_derived_values_are_cached(self):
+        v = Vector([3,4])
+
+        self.assertIs(v.magnitude(), v.magnitude())
+        self.assertIs(v.normalized(), v.normalized())
+        self.assertEqual(v.magnitude(), 5)
+
+    def test_equal_vectors_hash_equal(self):
+        self.assertEqual(hash(Vector([1,2])), hash(Vector(['1','2'])))
+        self.assertEqual(len({Vector([1,2]), Vector([1,2]), Vector([2,1])}), 2)
+
+    def test_vectors_can_be_pickled(self):
+        v = Vector([1.5,2])
+
+        self.assertEqual(pickle.loads(pickle.dumps(v)), v)
+
+
+class FloatVectorTest(unittest.TestCase):
+
+    def test_arithmetic(self):
+        v1 = FloatVector([1,2])
+        v2 = FloatVector([3,4])
+
+        self.assertEqual(FloatVector([4,6]), v1+v2)
+        self.assertEqual(FloatVector([-2,-2]), v1-v2)
+        self.assertEqual(FloatVector([3,6]), v1*3)
+        self.assertEqual(FloatVector([3,6]), 3*v1)
+
+    def test_coordinates_are_a_float64_buffer(self):
+        v = FloatVector(['1.5', Decimal('2'), 3])
+
+        self.assertEqual(v.coordinates.typecode, 'd')
+        self.assertEqual(list(v), [1.5, 2.0, 3.0])
+        self.assertEqual(v.dimension, 3)
+
+    def test_magnitude_and_normalization(self):
+        v = FloatVector([4,4])
+
+        self.assertAlmostEqual(v.magnitude(), 5.656854249492380)
+        self.assertAlmostEqual(v.normalized()[0], 0.7071067811865475)
+        self.assertAlmostEqual(v.normalized().magnitude(), 1.0)
+
+        with self.assertRaises(Exception) as context:
+            FloatVector([0,0]).normalized()
+
+        self.assertTrue('Cannot normalize the zero vector' in str(context.exception))
+
+    def test_matches_decimal_vector(self):
+        v = Vector([3.009,-6.172,3.692,-2.51])
+        b = Vector([6.404,-9.144,2.759,8.718])
+        fv = FloatVector(v.coordinates)
+        fb = FloatVector(b.coordinates)
+
+        self.assertAlmostEqual(fv.dot(fb), float(v.dot(b)))
+        self.assertAlmostEqual(fv.angleBetween(fb), v.angleBetween(b))
+        for x, y in zip(fv.componentOrthogonalTo(fb), v.componentOrthogonalTo(b)):
+            self.assertAlmostEqual(x, float(y))
+
+    def test_parallel_and_orthogonal(self):
+        v1 = FloatVector([1,1])
+
+        self.assertTrue(v1.parallelTo(FloatVector([-1,-1])))
+        self.assertTrue(v1.parallelTo(FloatVector([0,0])))
+        self.assertFalse(v1.parallelTo(FloatVector([1,0])))
+        self.assertTrue(v1.orthogonalTo(FloatVector([-1,1])))
+        self.assertTrue(FloatVector([-2.328,-7.284,-1.214]).orthogonalTo(FloatVector([-1.821,1.072,-2.94])))
+
+    def test_cross_product(self):
+        v1 = FloatVector([5,3,-2])
+        v2 = FloatVector([-1,0,3])
+
+        self.assertEqual(v1.cross(v2), FloatVector([9,-13,3]))
+        self.assertAlmostEqual(v1.cross_triangle_area(v2), 8.046738469715541)
+
+
 if __name__ == '__main__':
     unittest.main()